@@ -0,0 +1,123 @@
+"""
+Two-tier response cache for chat models.
+
+Tier 1 (exact)   : key = normalized prompt text + model and its parameters (llm_string).
+Tier 2 (semantic): the prompt is embedded and a stored response is returned when a previous
+                   prompt for the same model/parameters is within `threshold` cosine similarity.
+
+Both tiers are LRU bounded (max_entries) and entries expire after `ttl` seconds.
+It is a LangChain BaseCache, so it plugs into any chat model without touching the chain:
+
+    llm_cache = SemanticCache(embed_model, threshold=0.95)
+    chat_model = ChatGoogleGenerativeAI(model=MODEL, cache=llm_cache)   # one model
+    set_llm_cache(llm_cache)                                           # or every model
+"""
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from langchain_core.caches import BaseCache
+
+
+def prompt_text(prompt):
+    # Chat models pass the messages serialized as JSON; turn them into "role: content" lines.
+    try:
+        messages = json.loads(prompt)
+        lines = [f"{m['kwargs'].get('type', 'human')}: {m['kwargs'].get('content', '')}" for m in messages]
+        text = "\n".join(lines)
+    except (ValueError, TypeError, KeyError):
+        text = prompt
+    # Collapse whitespace so formatting differences hit the same entry.
+    return re.sub(r"\s+", " ", str(text)).strip()
+
+
+class SemanticCache(BaseCache):
+
+    def __init__(self, embeddings=None, threshold=0.95, ttl=3600, max_entries=1000):
+        self.embeddings = embeddings  # None -> exact tier only
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        # (llm_string, text) -> (expires_at, vector, value), oldest first
+        self.entries = OrderedDict()
+        # vectors computed on a miss, reused by the update() that follows it
+        self.pending = {}
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    def _expired(self, entry):
+        return entry[0] < time.time()
+
+    def _embed(self, text):
+        vector = np.asarray(self.embeddings.embed_query(text), dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1.0)
+
+    def lookup(self, prompt, llm_string):
+        text = prompt_text(prompt)
+        key = (llm_string, text)
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and not self._expired(entry):
+                self.entries.move_to_end(key)
+                self.exact_hits += 1
+                return entry[2]
+            if entry:
+                del self.entries[key]
+
+        if self.embeddings is None:
+            with self.lock:
+                self.misses += 1
+            return None
+
+        vector = self._embed(text)
+        with self.lock:
+            # Semantic tier: only compare with prompts sent to the same model with the same parameters.
+            keys = [k for k, e in self.entries.items() if k[0] == llm_string and not self._expired(e)]
+            if keys:
+                scores = np.stack([self.entries[k][1] for k in keys]) @ vector
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    self.entries.move_to_end(keys[best])
+                    self.semantic_hits += 1
+                    return self.entries[keys[best]][2]
+            self.misses += 1
+            if len(self.pending) >= self.max_entries:
+                self.pending.clear()
+            self.pending[key] = vector
+        return None
+
+    def update(self, prompt, llm_string, return_val):
+        text = prompt_text(prompt)
+        with self.lock:
+            vector = self.pending.pop((llm_string, text), None)
+        if vector is None and self.embeddings is not None:
+            vector = self._embed(text)
+        with self.lock:
+            self.entries[(llm_string, text)] = (time.time() + self.ttl, vector, return_val)
+            self.entries.move_to_end((llm_string, text))
+            # drop expired entries first, then the least recently used ones
+            for key in [k for k, e in self.entries.items() if self._expired(e)]:
+                del self.entries[key]
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self, **kwargs):
+        with self.lock:
+            self.entries.clear()
+            self.pending.clear()
+
+    def stats(self):
+        total = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": (self.exact_hits + self.semantic_hits) / total if total else 0.0,
+            "entries": len(self.entries),
+        }
@@ -0,0 +1,71 @@
+# Demo of SemanticCache with a fake chat model and a local bag-of-words embedder (no API key needed).
+import re
+import time
+import zlib
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import PromptTemplate
+
+from semantic_cache import SemanticCache
+
+
+# Fake chat model that counts how often it is really called.
+class CountingChatModel(FakeListChatModel):
+    calls: int = 0
+
+    def _call(self, *args, **kwargs):
+        self.calls += 1
+        return super()._call(*args, **kwargs)
+
+
+# Hashes words into a fixed size vector, so prompts sharing most words are close in cosine distance.
+class BagOfWordsEmbeddings(Embeddings):
+
+    def __init__(self, size=256):
+        self.size = size
+
+    def embed_query(self, text):
+        vector = np.zeros(self.size, dtype=np.float32)
+        for word in re.findall(r"\w+", text.lower()):
+            vector[zlib.crc32(word.encode()) % self.size] += 1
+        return vector.tolist()
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+
+llm_cache = SemanticCache(BagOfWordsEmbeddings(), threshold=0.9, ttl=2, max_entries=100)
+chat_model = CountingChatModel(responses=["Cricket is played with a bat and ball."], cache=llm_cache)
+
+prompt = PromptTemplate(template="Generate five interesting facts about {topic}.", input_variables=["topic"])
+chain = prompt | chat_model | StrOutputParser()
+
+print(chain.invoke({"topic": "cricket"}))
+assert chat_model.calls == 1
+
+# exact tier: same prompt
+chain.invoke({"topic": "cricket"})
+# exact tier after normalization: only whitespace differs
+(PromptTemplate.from_template("Generate  five interesting facts about\n{topic}.") | chat_model).invoke({"topic": "cricket"})
+# semantic tier: nearly the same question
+(PromptTemplate.from_template("Generate five interesting facts about {topic}!") | chat_model).invoke({"topic": "the cricket"})
+assert chat_model.calls == 1, "cache hits must not call the model"
+
+# different question -> miss
+chain.invoke({"topic": "black holes"})
+assert chat_model.calls == 2
+
+# different parameters (another model config) never share entries
+other_model = CountingChatModel(responses=["Other answer"], cache=llm_cache, sleep=0.0)
+(prompt | other_model).invoke({"topic": "cricket"})
+assert other_model.calls == 1
+
+# TTL: entries expire after 2 seconds
+time.sleep(2.1)
+chain.invoke({"topic": "cricket"})
+assert chat_model.calls == 3
+
+print(llm_cache.stats())
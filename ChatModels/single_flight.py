@@ -0,0 +1,175 @@
+"""
+Single-flight request coalescing for chat models and chains.
+
+When several Streamlit sessions press "Summrize" for the same paper/style/length at the same moment,
+each one starts its own identical model call. SingleFlight lets the first caller (the leader) make the
+upstream call; identical calls that arrive while it is in flight wait for it and get the same
+result, or the same exception.
+
+    flight = SingleFlight()
+    result = flight.do(key, lambda: chain.invoke(inputs))                 # threads
+    result = await flight.ado(key, lambda: chain.ainvoke(inputs))         # asyncio
+    for chunk in flight.stream(key, lambda: chat_model.stream(prompt)):   # streams are shared too
+        ...
+
+coalesce(runnable) wraps a chat model or chain so invoke/ainvoke/stream are coalesced on the input:
+
+    chat_model = coalesce(ChatGoogleGenerativeAI(model=MODEL))
+
+Only calls that overlap in time are shared; once the call finishes the next one goes upstream again
+(put a cache in front for that). Callbacks of the waiting calls are not run, only the leader's.
+"""
+import asyncio
+import threading
+import weakref
+
+from langchain_core.load import dumps
+from langchain_core.runnables import Runnable
+
+
+class _Call:
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _Stream:
+    # chunks produced by one upstream stream, replayed to every caller
+
+    def __init__(self):
+        self.chunks = []
+        self.finished = False
+        self.error = None
+        self.condition = threading.Condition()
+
+
+class SingleFlight:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.streams = {}
+        self.loop_tasks = weakref.WeakKeyDictionary()  # event loop -> {key: task}
+        self.upstream_calls = 0
+        self.shared_calls = 0
+
+    def do(self, key, fn):
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+                self.upstream_calls += 1
+            else:
+                self.shared_calls += 1
+
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as error:
+                call.error = error
+            finally:
+                with self.lock:
+                    del self.calls[key]
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    async def ado(self, key, fn):
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            tasks = self.loop_tasks.setdefault(loop, {})
+            task = tasks.get(key)
+            if task is None:
+                task = tasks[key] = loop.create_task(fn())
+                task.add_done_callback(lambda _: tasks.pop(key, None))
+                self.upstream_calls += 1
+            else:
+                self.shared_calls += 1
+        # shield: one caller being cancelled must not cancel the call the others are waiting for
+        return await asyncio.shield(task)
+
+    def stream(self, key, fn):
+        with self.lock:
+            stream = self.streams.get(key)
+            if stream is None:
+                stream = self.streams[key] = _Stream()
+                self.upstream_calls += 1
+                # the upstream stream is drained on its own thread, so a caller that stops reading
+                # early doesn't stall the others
+                threading.Thread(target=self._produce, args=(key, stream, fn), daemon=True).start()
+            else:
+                self.shared_calls += 1
+        return self._replay(stream)
+
+    def _produce(self, key, stream, fn):
+        try:
+            for chunk in fn():
+                with stream.condition:
+                    stream.chunks.append(chunk)
+                    stream.condition.notify_all()
+        except BaseException as error:
+            stream.error = error
+        finally:
+            with self.lock:
+                del self.streams[key]
+            with stream.condition:
+                stream.finished = True
+                stream.condition.notify_all()
+
+    def _replay(self, stream):
+        position = 0
+        while True:
+            with stream.condition:
+                stream.condition.wait_for(lambda: len(stream.chunks) > position or stream.finished)
+                chunks = stream.chunks[position:]
+                finished = stream.finished
+            yield from chunks
+            position += len(chunks)
+            if finished and position == len(stream.chunks):
+                break
+        if stream.error is not None:
+            raise stream.error
+
+    def stats(self):
+        return {"upstream_calls": self.upstream_calls, "shared_calls": self.shared_calls}
+
+
+def request_key(input, kwargs):
+    # LangChain serialization covers prompt values, messages and plain dicts/strings
+    return dumps([input, kwargs], sort_keys=True)
+
+
+class Coalesced(Runnable):
+
+    def __init__(self, runnable, flight=None):
+        self.runnable = runnable
+        self.flight = flight or SingleFlight()
+        self.name = f"Coalesced{runnable.get_name()}"
+
+    @property
+    def InputType(self):
+        return self.runnable.InputType
+
+    @property
+    def OutputType(self):
+        return self.runnable.OutputType
+
+    def invoke(self, input, config=None, **kwargs):
+        return self.flight.do(request_key(input, kwargs), lambda: self.runnable.invoke(input, config, **kwargs))
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        return await self.flight.ado(request_key(input, kwargs), lambda: self.runnable.ainvoke(input, config, **kwargs))
+
+    def stream(self, input, config=None, **kwargs):
+        return self.flight.stream(request_key(input, kwargs), lambda: self.runnable.stream(input, config, **kwargs))
+
+
+def coalesce(runnable, flight=None):
+    return Coalesced(runnable, flight)
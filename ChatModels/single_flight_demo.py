@@ -0,0 +1,111 @@
+# Shows that N concurrent identical calls reach the model once with SingleFlight / coalesce,
+# for invoke (threads), ainvoke (asyncio), stream and errors.
+import asyncio
+import threading
+import time
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.prompts import PromptTemplate
+
+from single_flight import SingleFlight, coalesce
+
+N = 20
+LATENCY = 0.3
+
+
+# Fake chat model that counts how many requests reach it.
+class CountingChatModel(BaseChatModel):
+    calls: int = 0
+    fail: bool = False
+
+    @property
+    def _llm_type(self):
+        return "counting-fake"
+
+    def _answer(self, messages):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("rate limited")
+        return f"Summary of: {messages[-1].content[:40]}"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(LATENCY)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._answer(messages)))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(LATENCY)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._answer(messages)))])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        for word in self._answer(messages).split(" "):
+            time.sleep(LATENCY / 5)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word + " "))
+
+
+def run_threads(fn):
+    results = [None] * N
+    barrier = threading.Barrier(N)
+
+    def worker(i):
+        barrier.wait()
+        try:
+            results[i] = fn()
+        except Exception as error:
+            results[i] = error
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(N)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+template = PromptTemplate.from_template('Please summarize the research paper titled "{paper_input}" ({style_input}, {length_input})')
+inputs = {'paper_input': 'Attention Is All You Need', 'style_input': 'Technical', 'length_input': 'Short (1-2 paragraphs)'}
+
+# 1. sync: N threads invoke the same chain at the same moment
+chat_model = CountingChatModel()
+chain = coalesce(template | chat_model | StrOutputParser())
+start = time.perf_counter()
+results = run_threads(lambda: chain.invoke(inputs))
+assert chat_model.calls == 1 and len(set(results)) == 1
+print(f"invoke : {N} concurrent calls -> {chat_model.calls} model call in {time.perf_counter() - start:.2f} s, {chain.flight.stats()}")
+
+# different inputs are not merged
+other = dict(inputs, length_input='Long (detailed explanation)')
+run_threads(lambda: chain.invoke(other))
+assert chat_model.calls == 2
+
+# 2. async: N coroutines ainvoke a coalesced chat model
+chat_model = CountingChatModel()
+coalesced_model = coalesce(chat_model)
+prompt = template.invoke(inputs)
+
+
+async def many():
+    return await asyncio.gather(*(coalesced_model.ainvoke(prompt) for _ in range(N)))
+
+start = time.perf_counter()
+results = asyncio.run(many())
+assert chat_model.calls == 1 and len({r.content for r in results}) == 1
+print(f"ainvoke: {N} concurrent calls -> {chat_model.calls} model call in {time.perf_counter() - start:.2f} s")
+
+# 3. stream: every caller gets the full token stream from one upstream stream
+chat_model = CountingChatModel()
+flight = SingleFlight()
+key = prompt.to_string()
+start = time.perf_counter()
+results = run_threads(lambda: "".join(chunk.content for chunk in flight.stream(key, lambda: chat_model.stream(prompt))))
+assert chat_model.calls == 1 and len(set(results)) == 1
+print(f"stream : {N} concurrent streams -> {chat_model.calls} model call in {time.perf_counter() - start:.2f} s, text {results[0]!r}")
+
+# 4. errors: all waiters get the leader's exception
+chat_model = CountingChatModel(fail=True)
+chain = coalesce(template | chat_model | StrOutputParser())
+results = run_threads(lambda: chain.invoke(inputs))
+assert chat_model.calls == 1 and all(isinstance(r, RuntimeError) for r in results)
+print(f"errors : {N} concurrent calls -> {chat_model.calls} model call, all {N} callers got {results[0]!r}")
@@ -0,0 +1,137 @@
+"""
+Token streaming helpers.
+
+StreamMetrics wraps any stream of chunks (chain.stream / chain.astream / chat_model.stream),
+passes every chunk through unchanged and records time-to-first-token and tokens per second.
+A streamed chunk can hold many tokens (Gemini sends a few dozen at a time), so the tokens are:
+
+    - the output_tokens of the chunks' usage_metadata when the model reports it; LangChain chat
+      models report per-chunk counts that add up (AIMessageChunk + AIMessageChunk sums them), pass
+      cumulative_usage=True for a model whose every chunk carries the running total
+    - otherwise count_tokens(text) for each chunk when a counting function is given
+    - otherwise nothing: the summary reports chunks and chunks/s instead
+
+    metrics = StreamMetrics()
+    st.write_stream(metrics.wrap(chain.stream(inputs)))
+    st.caption(metrics.summary())
+
+cached_stream streams from a chat model but still uses its response cache (chat_model.stream
+skips the cache that chat_model.invoke uses).
+"""
+import time
+
+from langchain_core.load import dumps
+from langchain_core.outputs import ChatGeneration
+
+
+class StreamMetrics:
+
+    def __init__(self, count_tokens=None, cumulative_usage=False):
+        self.count_tokens = count_tokens
+        self.cumulative_usage = cumulative_usage
+        self.start = None
+        self.first_token = None
+        self.end = None
+        self.chunks = 0
+        self.chars = 0
+        self.usage_tokens = None  # output tokens from usage_metadata, None until a chunk reports some
+        self.counted_tokens = 0   # output tokens from count_tokens
+        self.first_chunk = 0      # tokens (or 1 chunk) that arrived with the first chunk
+
+    def _record(self, chunk):
+        usage = getattr(chunk, "usage_metadata", None)
+        if usage and usage.get("output_tokens") is not None:
+            if self.cumulative_usage:
+                self.usage_tokens = max(self.usage_tokens or 0, usage["output_tokens"])
+            else:
+                self.usage_tokens = (self.usage_tokens or 0) + usage["output_tokens"]
+        text = chunk if isinstance(chunk, str) else getattr(chunk, "content", "")
+        if not text:
+            return
+        self.chunks += 1
+        if isinstance(text, str):
+            self.chars += len(text)
+            if self.count_tokens is not None:
+                self.counted_tokens += self.count_tokens(text)
+        if self.first_token is None:
+            self.first_token = time.perf_counter()
+            self.first_chunk = self.count
+
+    @property
+    def unit(self):
+        if self.usage_tokens is not None or self.count_tokens is not None:
+            return "tokens"
+        return "chunks"
+
+    @property
+    def count(self):
+        # streamed tokens, or chunks when there is no way to count tokens
+        if self.usage_tokens is not None:
+            return self.usage_tokens
+        if self.count_tokens is not None:
+            return self.counted_tokens
+        return self.chunks
+
+    @property
+    def tokens(self):
+        return self.count if self.unit == "tokens" else None
+
+    def wrap(self, chunks):
+        self.start = time.perf_counter()
+        for chunk in chunks:
+            self._record(chunk)
+            yield chunk
+        self.end = time.perf_counter()
+
+    async def awrap(self, chunks):
+        self.start = time.perf_counter()
+        async for chunk in chunks:
+            self._record(chunk)
+            yield chunk
+        self.end = time.perf_counter()
+
+    @property
+    def time_to_first_token(self):
+        return self.first_token - self.start if self.first_token else None
+
+    @property
+    def per_sec(self):
+        # generation speed after the first chunk arrived, in tokens (or chunks) per second
+        if self.chunks < 2 or not self.end or self.end == self.first_token:
+            return None
+        return (self.count - self.first_chunk) / (self.end - self.first_token)
+
+    @property
+    def tokens_per_sec(self):
+        return self.per_sec if self.unit == "tokens" else None
+
+    def summary(self):
+        ttft = self.time_to_first_token
+        rate = self.per_sec
+        return (f"time to first token: {ttft:.2f} s" if ttft is not None else "no tokens") + (
+            f" | {rate:.1f} {self.unit}/s | {self.count} {self.unit}" if rate is not None else ""
+        )
+
+
+def cached_stream(chat_model, prompt):
+    # Same cache key as chat_model.invoke uses, so invoke and stream share entries.
+    messages = prompt.to_messages() if hasattr(prompt, "to_messages") else prompt
+    cache = chat_model.cache if chat_model.cache not in (None, True, False) else None
+    if cache is None:
+        for chunk in chat_model.stream(messages):
+            yield chunk.content
+        return
+
+    key = dumps(messages)
+    llm_string = chat_model._get_llm_string()
+    cached = cache.lookup(key, llm_string)
+    if cached:
+        yield cached[0].text
+        return
+
+    message = None
+    for chunk in chat_model.stream(messages):
+        message = chunk if message is None else message + chunk
+        yield chunk.content
+    if message is not None:
+        cache.update(key, llm_string, [ChatGeneration(message=message)])
@@ -0,0 +1,83 @@
+# Streaming vs invoke with a fake streaming chat model: time-to-first-token and tokens/sec.
+# The fake model reports no token usage, so its speed is in chunks/s (one character per chunk).
+import asyncio
+import time
+
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.messages import AIMessageChunk
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import PromptTemplate
+
+from semantic_cache import SemanticCache
+from streaming import StreamMetrics, cached_stream
+
+answer = "Attention Is All You Need introduced the Transformer architecture. " * 4
+
+
+# FakeListChatModel streams the answer one character at a time, sleeping `sleep` per chunk.
+# invoke takes just as long here, like a real model generating the whole answer.
+class SlowFakeChatModel(FakeListChatModel):
+
+    def _call(self, *args, **kwargs):
+        time.sleep(self.sleep * len(self.responses[self.i]))
+        return super()._call(*args, **kwargs)
+
+
+chat_model = SlowFakeChatModel(responses=[answer], sleep=0.005)
+template = PromptTemplate.from_template("Please summarize the research paper titled {paper_input}")
+chain = template | chat_model | StrOutputParser()
+inputs = {"paper_input": "Attention Is All You Need"}
+
+# invoke: nothing to show until the whole answer is generated
+start = time.perf_counter()
+chain.invoke(inputs)
+print(f"invoke      : first output after {time.perf_counter() - start:.2f} s")
+
+# stream: first token arrives after one chunk
+metrics = StreamMetrics()
+text = "".join(metrics.wrap(chain.stream(inputs)))
+assert text == answer
+assert metrics.time_to_first_token < 0.1
+assert metrics.unit == "chunks" and metrics.tokens is None
+print(f"stream      : {metrics.summary()}")
+
+
+# A Gemini-like stream: many tokens per chunk, each chunk reporting its output tokens in usage_metadata.
+# The rate is in tokens/s from the reported usage, not in chunks/s.
+def usage_stream(cumulative=False):
+    words = answer.split(" ")
+    total = 0
+    for first in range(0, len(words), 8):
+        time.sleep(0.02)
+        total += 12
+        tokens = total if cumulative else 12
+        yield AIMessageChunk(content=" ".join(words[first:first + 8]) + " ",
+                             usage_metadata={"input_tokens": 0, "output_tokens": tokens, "total_tokens": tokens})
+
+
+metrics = StreamMetrics()
+chunks = list(metrics.wrap(usage_stream()))
+assert metrics.unit == "tokens" and metrics.tokens == 12 * len(chunks)
+print(f"usage       : {metrics.summary()} in {metrics.chunks} chunks")
+
+# a model whose every chunk reports the running total
+metrics = StreamMetrics(cumulative_usage=True)
+chunks = list(metrics.wrap(usage_stream(cumulative=True)))
+assert metrics.tokens == 12 * len(chunks)
+
+async def main():
+    metrics = StreamMetrics()
+    text = "".join([chunk async for chunk in metrics.awrap(chain.astream(inputs))])
+    assert text == answer
+    print(f"astream     : {metrics.summary()}")
+
+asyncio.run(main())
+
+# cached_stream: the first call streams and fills the cache, the second is answered from it at once
+cached_model = SlowFakeChatModel(responses=[answer], sleep=0.005, cache=SemanticCache())
+for label in ["first call ", "second call"]:
+    metrics = StreamMetrics()
+    text = "".join(metrics.wrap(cached_stream(cached_model, template.invoke(inputs))))
+    assert text == answer
+    print(f"{label} : {metrics.summary()}")
+print(cached_model.cache.stats())
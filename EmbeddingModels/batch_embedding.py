@@ -0,0 +1,105 @@
+"""
+Batched, concurrent embedding of large document lists.
+
+BatchEmbeddings wraps any LangChain embedding model. embed_documents splits the texts into
+provider sized batches, sends them concurrently with asyncio (bounded by max_concurrency and a
+token bucket rate limit), retries failed batches with exponential backoff and returns the
+vectors in the original order.
+
+    embeddings = BatchEmbeddings(OpenAIEmbeddings(model="text-embedding-3-small"), batch_size=100, max_concurrency=8)
+    vectors = embeddings.embed_documents(chunks)
+"""
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.embeddings import Embeddings
+
+
+class TokenBucket:
+    # Allows `rate` requests per second on average with bursts of up to `capacity` requests.
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class BatchEmbeddings(Embeddings):
+
+    def __init__(self, embeddings, batch_size=100, max_concurrency=4, requests_per_second=None,
+                 max_retries=3, backoff=0.5):
+        self.embeddings = embeddings
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    def __getattr__(self, name):
+        # Expose model / dimensions / task_type of the wrapped model (used by CachedEmbeddings keys).
+        if name == "embeddings":
+            raise AttributeError(name)
+        return getattr(self.embeddings, name)
+
+    async def _embed_batch(self, batch, semaphore, bucket):
+        for attempt in range(self.max_retries + 1):
+            async with semaphore:
+                if bucket:
+                    await bucket.acquire()
+                try:
+                    return await self.embeddings.aembed_documents(batch)
+                except Exception:
+                    if attempt == self.max_retries:
+                        raise
+            # Exponential backoff with jitter, outside the semaphore so other batches keep going.
+            await asyncio.sleep(self.backoff * (2 ** attempt) * (0.5 + random.random()))
+
+    async def aembed_documents(self, texts):
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        bucket = TokenBucket(self.requests_per_second) if self.requests_per_second else None
+
+        starts = range(0, len(texts), self.batch_size)
+        tasks = [
+            asyncio.create_task(self._embed_batch(texts[start:start + self.batch_size], semaphore, bucket))
+            for start in starts
+        ]
+        try:
+            results = await asyncio.gather(*tasks)
+        except Exception:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        # gather keeps task order, so flattening gives the vectors back in input order.
+        return [vector for batch in results for vector in batch]
+
+    def embed_documents(self, texts):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.aembed_documents(texts))
+        # called from inside an event loop (a notebook, Streamlit, an async chain): asyncio.run can't
+        # start a second loop in this thread, so the batches run on their own loop in a worker thread
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, self.aembed_documents(texts)).result()
+
+    def embed_query(self, text):
+        return self.embeddings.embed_query(text)
+
+    async def aembed_query(self, text):
+        return await self.embeddings.aembed_query(text)
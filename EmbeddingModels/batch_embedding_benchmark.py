@@ -0,0 +1,68 @@
+# Throughput benchmark for BatchEmbeddings (docs/sec vs concurrency) against a local stub embedding server.
+import json
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from langchain_core.embeddings import Embeddings
+
+from batch_embedding import BatchEmbeddings
+
+DIM = 64
+REQUEST_LATENCY = 0.05  # seconds per request, like a remote API round trip
+
+
+# Stub server: POST {"input": [...]} -> {"data": [[...], ...]}
+class StubHandler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(REQUEST_LATENCY)
+        vectors = [[float(len(text) % 7)] * DIM for text in body["input"]]
+        payload = json.dumps({"data": vectors}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+# Minimal client for the stub server.
+class StubServerEmbeddings(Embeddings):
+
+    def __init__(self, url):
+        self.url = url
+        self.model = "stub-embedding"
+
+    def embed_documents(self, texts):
+        request = urllib.request.Request(
+            self.url, data=json.dumps({"input": texts}).encode(), headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read())["data"]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+url = f"http://127.0.0.1:{server.server_address[1]}/embed"
+
+documents = [f"Chunk {i}: " + "lorem ipsum " * (i % 20) for i in range(5000)]
+
+print(f"{'concurrency':>12} {'seconds':>10} {'docs/sec':>10}")
+for concurrency in [1, 2, 4, 8, 16, 32]:
+    embeddings = BatchEmbeddings(StubServerEmbeddings(url), batch_size=100, max_concurrency=concurrency)
+    start = time.perf_counter()
+    vectors = embeddings.embed_documents(documents)
+    elapsed = time.perf_counter() - start
+    assert len(vectors) == len(documents)
+    assert all(vector[0] == float(len(doc) % 7) for doc, vector in zip(documents, vectors))
+    print(f"{concurrency:>12} {elapsed:>10.3f} {len(documents) / elapsed:>10.0f}")
+
+server.shutdown()
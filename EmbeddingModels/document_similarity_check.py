@@ -1,7 +1,7 @@
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from dotenv import load_dotenv
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np 
+from embedding_cache import CachedEmbeddings
+from similarity_search import VectorIndex
 
 load_dotenv()
 
@@ -16,19 +16,19 @@ document = [
 
 query = "Tell me about virat kohli."
 
-# first create embeddings model 
-embeddings = GoogleGenerativeAIEmbeddings(model = "models/text-embedding-004")
+# first create embeddings model (cached, so re-runs don't call the API again)
+embeddings = CachedEmbeddings(GoogleGenerativeAIEmbeddings(model = "models/text-embedding-004"))
 
 # Generate document and query embeddings 
 doc_embed = embeddings.embed_documents(document)
 
 query_embed = embeddings.embed_query(query)
 
-# cosine similarity always recive 2D List.
-scores = cosine_similarity([query_embed],doc_embed)
+# Build the index once (normalized float32 matrix), then each query is one matrix product + top-k.
+index = VectorIndex(doc_embed)
 
-# It sort embedding score and assign index
-idx , score = sorted(list(enumerate(scores)),key=lambda x:x[1])[-1]
+idx , scores = index.search(query_embed, k=1)
+idx , score = idx[0], scores[0]
 
 print(query)
 print(document[idx])
@@ -1,13 +1,14 @@
 # Downloading and using a local hugging face embedding model
 from langchain_huggingface import HuggingFaceEmbeddings 
 from dotenv import load_dotenv
+from embedding_cache import CachedEmbeddings
 
 load_dotenv() 
 
 # Load environment variables from .env file
-embedding = HuggingFaceEmbeddings(
+embedding = CachedEmbeddings(HuggingFaceEmbeddings(
     model_name = "sentence-transformers/all-MiniLM-L6-v2"
-)
+))
 # Sample text to embed
 text = "Paris is the capital of France."
 
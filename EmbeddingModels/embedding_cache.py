@@ -0,0 +1,156 @@
+"""
+Persistent embedding cache.
+
+Wrap any LangChain embedding model (GoogleGenerativeAIEmbeddings, OpenAIEmbeddings,
+HuggingFaceEmbeddings ...) with CachedEmbeddings and the same text is only embedded once.
+Vectors are stored in a local SQLite file keyed by (model name, dimensions, task_type, text hash),
+and the least recently used rows are evicted when the cache grows beyond max_entries.
+
+    embeddings = CachedEmbeddings(GoogleGenerativeAIEmbeddings(model="models/text-embedding-004"))
+    doc_embed = embeddings.embed_documents(document)   # same call as before
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+from array import array
+
+from langchain_core.embeddings import Embeddings
+
+# SQLite limits the number of "?" in one statement, so lookups are done in slices.
+SQL_BATCH = 500
+
+
+def model_name(embeddings):
+    # Google / OpenAI use `model`, HuggingFace uses `model_name`
+    return getattr(embeddings, "model", None) or getattr(embeddings, "model_name", None) or type(embeddings).__name__
+
+
+class CachedEmbeddings(Embeddings):
+
+    def __init__(self, embeddings, db_path="embedding_cache.sqlite3", max_entries=100_000):
+        self.embeddings = embeddings
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        # Everything that changes the vector for the same text is part of the key.
+        self.namespace = "|".join(str(part) for part in (
+            model_name(embeddings),
+            getattr(embeddings, "dimensions", None),
+            getattr(embeddings, "task_type", None),
+        ))
+
+        self._connect()
+
+    def _connect(self):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)")
+        self.conn.commit()
+
+    def __getstate__(self):
+        # pickled for worker processes: the connection is opened again on the same file
+        state = self.__dict__.copy()
+        del state["lock"], state["conn"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._connect()
+
+    def _key(self, kind, text):
+        # kind keeps document and query vectors apart (Gemini embeds them with different task types)
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{self.namespace}|{kind}|{digest}"
+
+    def _lookup(self, keys):
+        found = {}
+        for start in range(0, len(keys), SQL_BATCH):
+            part = keys[start:start + SQL_BATCH]
+            placeholders = ",".join("?" * len(part))
+            rows = self.conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", part
+            ).fetchall()
+            for key, blob in rows:
+                found[key] = array("f", blob).tolist()
+        return found
+
+    def _touch(self, keys):
+        now = time.time()
+        self.conn.executemany("UPDATE embeddings SET last_used = ? WHERE key = ?", [(now, key) for key in keys])
+
+    def _store(self, items):
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+            [(key, array("f", vector).tobytes(), now) for key, vector in items],
+        )
+        self._evict()
+
+    def _evict(self):
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        extra = count - self.max_entries
+        if extra > 0:
+            self.conn.execute(
+                "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                (extra,),
+            )
+
+    def _embed(self, kind, texts, embed_fn):
+        keys = [self._key(kind, text) for text in texts]
+
+        with self.lock:
+            found = self._lookup(list(set(keys)))
+
+        # Only unique texts that are not in the cache go to the model.
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+
+        miss_count = sum(1 for key in keys if key in missing)
+        with self.lock:
+            self.hits += len(keys) - miss_count
+            self.misses += miss_count
+
+        if missing:
+            vectors = embed_fn(list(missing.values()))
+            new_items = list(zip(missing.keys(), vectors))
+            found.update(new_items)
+
+        with self.lock:
+            self._touch([key for key in found if key not in missing])
+            if missing:
+                self._store(new_items)
+            self.conn.commit()
+
+        return [found[key] for key in keys]
+
+    def embed_documents(self, texts):
+        return self._embed("document", texts, self.embeddings.embed_documents)
+
+    def embed_query(self, text):
+        return self._embed("query", [text], lambda texts: [self.embeddings.embed_query(texts[0])])[0]
+
+    def stats(self):
+        total = self.hits + self.misses
+        (entries,) = self.conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": entries,
+        }
+
+    def clear(self):
+        with self.lock:
+            self.conn.execute("DELETE FROM embeddings")
+            self.conn.commit()
+        self.hits = 0
+        self.misses = 0
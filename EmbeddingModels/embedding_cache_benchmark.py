@@ -0,0 +1,46 @@
+# Benchmark for CachedEmbeddings: cold run vs warm run with a local fake embedder (no API key needed).
+import os
+import tempfile
+import time
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from embedding_cache import CachedEmbeddings
+
+
+# Fake embedder that sleeps a little per text to behave like a remote API.
+class SlowFakeEmbeddings(DeterministicFakeEmbedding):
+    model: str = "fake-embedding"
+    latency: float = 0.001
+
+    def embed_documents(self, texts):
+        time.sleep(self.latency * len(texts))
+        return super().embed_documents(texts)
+
+    def embed_query(self, text):
+        time.sleep(self.latency)
+        return super().embed_query(text)
+
+
+documents = [f"Document number {i} about cricket, anime and space exploration." for i in range(2000)]
+
+with tempfile.TemporaryDirectory() as tmp:
+    embeddings = CachedEmbeddings(
+        SlowFakeEmbeddings(size=768),
+        db_path=os.path.join(tmp, "embedding_cache.sqlite3"),
+    )
+
+    start = time.perf_counter()
+    cold = embeddings.embed_documents(documents)
+    cold_time = time.perf_counter() - start
+    print("Cold run :", round(cold_time, 3), "sec", embeddings.stats())
+
+    start = time.perf_counter()
+    warm = embeddings.embed_documents(documents)
+    warm_time = time.perf_counter() - start
+    print("Warm run :", round(warm_time, 3), "sec", embeddings.stats())
+
+    print("Speedup  :", round(cold_time / warm_time, 1), "x")
+    print("Same vectors :", all(abs(a - b) < 1e-6 for x, y in zip(cold, warm) for a, b in zip(x, y)))
+
+    embeddings.conn.close()
@@ -1,14 +1,22 @@
 
 from langchain_openai import OpenAIEmbeddings
 from dotenv import load_dotenv
+from embedding_cache import CachedEmbeddings
+from batch_embedding import BatchEmbeddings
 
 load_dotenv()
 
-# Initialize OpenAI embeddings
-embeddings = OpenAIEmbeddings(
-    model="text-embedding-3-small",
-    dimensions=32
-)
+# Initialize OpenAI embeddings (cached, so re-runs don't call the API again)
+# BatchEmbeddings sends new texts in concurrent batches of 100, max 5 requests per second.
+embeddings = CachedEmbeddings(BatchEmbeddings(
+    OpenAIEmbeddings(
+        model="text-embedding-3-small",
+        dimensions=32
+    ),
+    batch_size=100,
+    max_concurrency=4,
+    requests_per_second=5
+))
 # Sample documents to embed
 documents = [
     "Paris is the capital of France.",
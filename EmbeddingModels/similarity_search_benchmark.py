@@ -0,0 +1,62 @@
+# Benchmark: old sklearn cosine_similarity + sorted() path vs VectorIndex (float32 / float16 / int8).
+import sys
+import time
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+from similarity_search import VectorIndex
+
+DIM = 128
+K = 5
+QUERIES = 10
+SIZES = [1_000, 100_000, 1_000_000]
+
+# pass sizes on the command line to override, e.g. python similarity_search_benchmark.py 1000 100000
+if len(sys.argv) > 1:
+    SIZES = [int(size) for size in sys.argv[1:]]
+
+
+def old_search(query, doc_embed, k):
+    # what document_similarity_check.py did, fixed to sort the individual scores
+    scores = cosine_similarity([query], doc_embed)[0]
+    return sorted(enumerate(scores), key=lambda x: x[1])[-k:][::-1]
+
+
+def timed(fn, repeat=QUERIES):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+rng = np.random.default_rng(0)
+
+print(f"{'vectors':>10} {'method':>20} {'ms/query':>10} {'memory MB':>10} {'recall@k':>9}")
+for size in SIZES:
+    doc_embed = rng.standard_normal((size, DIM), dtype=np.float32)
+    query = rng.standard_normal(DIM, dtype=np.float32)
+
+    old_ms, old_result = timed(lambda: old_search(query, doc_embed, K), repeat=3 if size >= 1_000_000 else QUERIES)
+    expected = {idx for idx, _ in old_result}
+    print(f"{size:>10} {'sklearn+sorted':>20} {old_ms:>10.2f} {doc_embed.nbytes / 1e6:>10.1f} {1.0:>9.2f}")
+
+    for dtype in ["float32", "float16", "int8"]:
+        index = VectorIndex(doc_embed, dtype=dtype)
+        ms, (idx, _) = timed(lambda: index.search(query, k=K))
+        recall = len(expected & set(idx.tolist())) / K
+        print(f"{size:>10} {'VectorIndex ' + dtype:>20} {ms:>10.2f} {index.nbytes / 1e6:>10.1f} {recall:>9.2f}")
+
+    # batched queries amortize the pass over the matrix
+    index = VectorIndex(doc_embed)
+    batch = rng.standard_normal((QUERIES, DIM), dtype=np.float32)
+    ms, _ = timed(lambda: index.search(batch, k=K), repeat=1)
+    print(f"{size:>10} {'batch of ' + str(QUERIES):>20} {ms / QUERIES:>10.2f} {index.nbytes / 1e6:>10.1f} {'-':>9}")
+
+    del doc_embed, index
+
+# k <= 0 asks for nothing
+small = VectorIndex(rng.standard_normal((10, DIM), dtype=np.float32))
+for k in (0, -1):
+    idx, scores = small.search(rng.standard_normal(DIM, dtype=np.float32), k=k)
+    assert idx.shape == scores.shape == (0,)
@@ -0,0 +1,144 @@
+"""
+Append-only, memory-mapped vector file for very large embedding collections.
+
+Layout for an index called "chunks":
+
+    chunks.vec        64 byte header (magic, version, dim, count) + float32 rows (pre-normalized)
+    chunks.meta.jsonl one JSON line per row: {"id": ..., "metadata": {...}}
+    chunks.offsets    uint64 byte offset of every line in chunks.meta.jsonl
+
+Opening only reads the header, and search() maps the body one block at a time with np.memmap,
+so a multi-GB index opens in milliseconds and is searched with bounded memory.
+
+    store = VectorFile.create("chunks", dim=768)
+    store.append(embeddings.embed_documents(texts), ids=ids, metadatas=metadatas)
+    for row, score in zip(*store.search(query_embed, k=3)):
+        print(score, store.get(row))
+"""
+import json
+import os
+import struct
+
+import numpy as np
+
+from similarity_search import normalize, top_k
+
+MAGIC = b"LCVEC\x00"
+VERSION = 1
+HEADER_SIZE = 64
+HEADER_FORMAT = "<6sHIQ"  # magic, version, dim, count
+BLOCK_SIZE = 65536
+
+
+class VectorFile:
+
+    def __init__(self, path):
+        self.path = path
+        self.vec_path = path + ".vec"
+        self.meta_path = path + ".meta.jsonl"
+        self.offsets_path = path + ".offsets"
+
+        with open(self.vec_path, "rb") as f:
+            magic, version, self.dim, self.count = struct.unpack(
+                HEADER_FORMAT, f.read(struct.calcsize(HEADER_FORMAT))
+            )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.vec_path} is not a vector file (version {VERSION})")
+
+    @classmethod
+    def create(cls, path, dim):
+        header = struct.pack(HEADER_FORMAT, MAGIC, VERSION, dim, 0).ljust(HEADER_SIZE, b"\x00")
+        with open(path + ".vec", "wb") as f:
+            f.write(header)
+        open(path + ".meta.jsonl", "wb").close()
+        open(path + ".offsets", "wb").close()
+        return cls(path)
+
+    def __len__(self):
+        return self.count
+
+    def append(self, vectors, ids, metadatas=None):
+        vectors = normalize(vectors)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of dimension {self.dim}")
+        if len(ids) != len(vectors):
+            raise ValueError("ids and vectors must have the same length")
+        metadatas = metadatas or [{}] * len(ids)
+        self._drop_uncommitted()
+
+        # Metadata first, vectors next, header count last: a crash never leaves rows without metadata.
+        with open(self.meta_path, "ab") as meta, open(self.offsets_path, "ab") as offsets:
+            offset = meta.tell()
+            positions = np.empty(len(ids), dtype=np.uint64)
+            for i, (id_, metadata) in enumerate(zip(ids, metadatas)):
+                line = (json.dumps({"id": id_, "metadata": metadata}) + "\n").encode("utf-8")
+                positions[i] = offset
+                meta.write(line)
+                offset += len(line)
+            offsets.write(positions.tobytes())
+
+        with open(self.vec_path, "r+b") as f:
+            f.seek(HEADER_SIZE + self.count * self.dim * 4)
+            f.write(vectors.tobytes())
+            self.count += len(vectors)
+            f.seek(0)
+            f.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, self.dim, self.count))
+
+    def _drop_uncommitted(self):
+        # A crash in the middle of append() leaves metadata lines, offsets or vectors past the header
+        # count. Cut them off before appending, or the new offsets would land after orphan ones and
+        # row i would no longer read offsets[i].
+        with open(self.offsets_path, "r+b") as offsets:
+            offsets.seek(0, os.SEEK_END)
+            if offsets.tell() > self.count * 8:
+                offsets.seek(self.count * 8)
+                (meta_end,) = struct.unpack("<Q", offsets.read(8))
+                offsets.truncate(self.count * 8)
+            elif self.count:
+                # offsets are complete: the metadata ends after the line of the last row
+                offsets.seek((self.count - 1) * 8)
+                (offset,) = struct.unpack("<Q", offsets.read(8))
+                with open(self.meta_path, "rb") as meta:
+                    meta.seek(offset)
+                    meta_end = offset + len(meta.readline())
+            else:
+                meta_end = 0
+        with open(self.meta_path, "r+b") as meta:
+            meta.truncate(meta_end)
+        with open(self.vec_path, "r+b") as f:
+            f.truncate(HEADER_SIZE + self.count * self.dim * 4)
+
+    def block(self, start, stop):
+        # Maps only rows [start, stop); the mapping is released when the array is garbage collected.
+        return np.memmap(
+            self.vec_path, dtype=np.float32, mode="r",
+            offset=HEADER_SIZE + start * self.dim * 4, shape=(stop - start, self.dim),
+        )
+
+    def search(self, query, k=1, block_size=BLOCK_SIZE):
+        queries = normalize(np.atleast_2d(query))
+        best_idx = np.empty((len(queries), 0), dtype=np.int64)
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+
+        for start in range(0, self.count, block_size):
+            stop = min(start + block_size, self.count)
+            block = self.block(start, stop)
+            idx, scores = top_k(queries @ block.T, k)
+            del block
+
+            # Merge this block's top-k with the running top-k.
+            candidates = np.hstack([best_idx, idx + start])
+            order, best_scores = top_k(np.hstack([best_scores, scores]), k)
+            best_idx = np.take_along_axis(candidates, order, axis=1)
+
+        if np.ndim(query) == 1:
+            return best_idx[0], best_scores[0]
+        return best_idx, best_scores
+
+    def get(self, row):
+        with open(self.offsets_path, "rb") as offsets:
+            offsets.seek(row * 8)
+            (offset,) = struct.unpack("<Q", offsets.read(8))
+        with open(self.meta_path, "rb") as meta:
+            meta.seek(offset)
+            return json.loads(meta.readline())
@@ -0,0 +1,62 @@
+# Benchmark for VectorFile: open time, search latency and RSS on a large on-disk index.
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import psutil
+
+from similarity_search import VectorIndex
+from vector_file import VectorFile
+
+DIM = 128
+# pass the number of vectors on the command line, e.g. python vector_file_benchmark.py 4000000
+TOTAL = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+APPEND_BATCH = 100_000
+QUERIES = 5
+
+process = psutil.Process()
+
+
+def rss_mb():
+    return process.memory_info().rss / 1e6
+
+
+rng = np.random.default_rng(0)
+
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "chunks")
+
+    # Build the index in batches so the builder itself never holds all vectors.
+    store = VectorFile.create(path, dim=DIM)
+    start = time.perf_counter()
+    for first in range(0, TOTAL, APPEND_BATCH):
+        n = min(APPEND_BATCH, TOTAL - first)
+        vectors = rng.standard_normal((n, DIM), dtype=np.float32)
+        store.append(vectors, ids=[f"chunk-{i}" for i in range(first, first + n)])
+    print(f"Built {TOTAL} vectors ({os.path.getsize(path + '.vec') / 1e6:.0f} MB) in {time.perf_counter() - start:.1f} sec")
+    del store, vectors
+
+    baseline = rss_mb()
+    start = time.perf_counter()
+    store = VectorFile(path)
+    print(f"Open            : {(time.perf_counter() - start) * 1000:.2f} ms, RSS +{rss_mb() - baseline:.1f} MB")
+
+    query = rng.standard_normal(DIM, dtype=np.float32)
+    peak = 0.0
+    start = time.perf_counter()
+    for _ in range(QUERIES):
+        rows, scores = store.search(query, k=5)
+        peak = max(peak, rss_mb() - baseline)
+    print(f"Streaming search: {(time.perf_counter() - start) / QUERIES * 1000:.1f} ms/query, peak RSS +{peak:.1f} MB")
+    print("Top result      :", store.get(int(rows[0])), round(float(scores[0]), 4))
+
+    # For comparison: load the whole body into RAM and search it in one go.
+    start = time.perf_counter()
+    index = VectorIndex(store.block(0, len(store)))
+    load_time = time.perf_counter() - start
+    start = time.perf_counter()
+    in_memory_rows, _ = index.search(query, k=5)
+    print(f"In-memory index : load {load_time:.2f} sec, {(time.perf_counter() - start) * 1000:.1f} ms/query, RSS +{rss_mb() - baseline:.1f} MB")
+    print("Same top-5      :", sorted(rows.tolist()) == sorted(in_memory_rows.tolist()))
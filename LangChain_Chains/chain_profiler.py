@@ -0,0 +1,264 @@
+"""
+Per-node profiling for runnable chains.
+
+chain.get_graph().print_ascii() shows the shape of a chain but not where the time goes.
+ChainProfiler is a callback handler that records, for every node of the graph:
+
+    wall time    start -> end of the node
+    queue time   from when the node could start (parent started / previous step finished) to when it
+                 did start, e.g. time spent waiting for a connection limit
+    tokens       input/output tokens reported by the chat model (usage_metadata)
+    bytes        size of the node's input and output text
+
+Nodes are named like the graph nodes, numbered by occurrence: the two chat_model steps in
+sequential_chain.py are "ChatGoogleGenerativeAI#1" and "ChatGoogleGenerativeAI#2".
+
+    profiler = ChainProfiler()
+    chain.invoke({'topic': 'anime'}, config={'callbacks': [profiler]})
+    profiler.print_ascii(chain)              # graph with p50/p95 per node
+    profiler.save_json('chain_profile.json') # p50/p95/p99 histograms
+    profiler.export_otel()                   # spans to a local OpenTelemetry collector (OTLP gRPC)
+"""
+import json
+import math
+import threading
+import time
+from collections import Counter, deque
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.runnables.graph import Graph
+
+# runs that only group other runs; they are not nodes of the drawn graph
+CONTAINERS = ("RunnableSequence", "RunnableParallel")
+
+
+def percentile(sorted_values, q):
+    # nearest-rank percentile of an already sorted list
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(q / 100 * len(sorted_values)) - 1)]
+
+
+def text_bytes(value):
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, dict):
+        return sum(text_bytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(text_bytes(v) for v in value)
+    content = getattr(value, "content", None)
+    if content is not None:
+        return text_bytes(content)
+    if hasattr(value, "to_string"):
+        return text_bytes(value.to_string())
+    return len(str(value).encode("utf-8"))
+
+
+class ChainProfiler(BaseCallbackHandler):
+    # record in the calling thread/loop so async timings aren't shifted by an executor hop
+    run_inline = True
+
+    def __init__(self, max_samples=10_000, max_runs=10_000):
+        self.lock = threading.Lock()
+        self.active = {}  # run_id -> run dict while running
+        self.ready = {}  # parent run_id -> time the next child could start
+        self.occurrences = {}  # root run_id -> Counter of node names
+        self.samples = {}  # node -> {"wall": deque, "queue": deque, ...totals}
+        self.runs = deque(maxlen=max_runs)  # finished runs, for span export
+        self.max_samples = max_samples
+        # perf_counter for durations, shifted to wall-clock time for exported spans
+        self.epoch_offset = time.time() - time.perf_counter()
+
+    # --- callbacks ---------------------------------------------------------------------------
+
+    def _start(self, serialized, inputs, run_id, parent_run_id, kwargs):
+        now = time.perf_counter()
+        name = kwargs.get("name") or (serialized or {}).get("name") or ((serialized or {}).get("id") or ["?"])[-1]
+        with self.lock:
+            parent = self.active.get(parent_run_id)
+            root = parent["root"] if parent else run_id
+            node = None
+            if parent is None:
+                node = name
+            elif not name.startswith(CONTAINERS):
+                counter = self.occurrences.setdefault(root, Counter())
+                counter[name] += 1
+                node = f"{name}#{counter[name]}"
+            ready = self.ready.get(parent_run_id, parent["start"] if parent else now)
+            self.active[run_id] = {
+                "id": run_id, "parent": parent_run_id, "root": root, "name": name, "node": node,
+                "start": now, "queue": max(0.0, now - ready), "bytes_in": text_bytes(inputs),
+                "tokens_in": 0, "tokens_out": 0,
+            }
+
+    def _end(self, run_id, outputs=None, error=None, tokens=(0, 0)):
+        now = time.perf_counter()
+        with self.lock:
+            run = self.active.pop(run_id, None)
+            if run is None:
+                return
+            run["end"] = now
+            run["error"] = repr(error) if error is not None else None
+            run["bytes_out"] = text_bytes(outputs)
+            run["tokens_in"], run["tokens_out"] = tokens
+            if run["parent"] is not None:
+                self.ready[run["parent"]] = max(self.ready.get(run["parent"], now), now)
+            else:
+                self.occurrences.pop(run_id, None)
+            self.ready.pop(run_id, None)
+            self.runs.append(run)
+            if run["node"] is not None:
+                self._add_sample(run)
+
+    def _add_sample(self, run):
+        stats = self.samples.get(run["node"])
+        if stats is None:
+            stats = self.samples[run["node"]] = {
+                "wall": deque(maxlen=self.max_samples), "queue": deque(maxlen=self.max_samples),
+                "count": 0, "errors": 0, "tokens_in": 0, "tokens_out": 0, "bytes_in": 0, "bytes_out": 0,
+            }
+        stats["wall"].append(run["end"] - run["start"])
+        stats["queue"].append(run["queue"])
+        stats["count"] += 1
+        stats["errors"] += run["error"] is not None
+        for key in ("tokens_in", "tokens_out", "bytes_in", "bytes_out"):
+            stats[key] += run[key]
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, **kwargs):
+        self._start(serialized, inputs, run_id, parent_run_id, kwargs)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._end(run_id, outputs)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=error)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, **kwargs):
+        self._start(serialized, messages, run_id, parent_run_id, kwargs)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, **kwargs):
+        self._start(serialized, prompts, run_id, parent_run_id, kwargs)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        tokens_in = tokens_out = 0
+        texts = []
+        for generations in response.generations:
+            for generation in generations:
+                texts.append(generation.text)
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    tokens_in += usage.get("input_tokens", 0)
+                    tokens_out += usage.get("output_tokens", 0)
+        self._end(run_id, texts, tokens=(tokens_in, tokens_out))
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=error)
+
+    # --- reports -----------------------------------------------------------------------------
+
+    def stats(self):
+        report = {}
+        with self.lock:
+            items = [(node, dict(stats, wall=sorted(stats["wall"]), queue=sorted(stats["queue"])))
+                     for node, stats in self.samples.items()]
+        for node, stats in items:
+            report[node] = {
+                "count": stats["count"],
+                "errors": stats["errors"],
+                "wall_ms": {f"p{q}": percentile(stats["wall"], q) * 1000 for q in (50, 95, 99)},
+                "queue_ms": {f"p{q}": percentile(stats["queue"], q) * 1000 for q in (50, 95, 99)},
+                "tokens_in": stats["tokens_in"],
+                "tokens_out": stats["tokens_out"],
+                "bytes_in": stats["bytes_in"],
+                "bytes_out": stats["bytes_out"],
+            }
+        return report
+
+    def to_json(self):
+        return json.dumps(self.stats(), indent=2)
+
+    def save_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+
+    def print_stats(self):
+        print(f"{'node':<32} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queue p50':>10} "
+              f"{'tokens in/out':>14} {'bytes in/out':>14}")
+        for node, s in self.stats().items():
+            print(f"{node:<32} {s['count']:>6} {s['wall_ms']['p50']:>9.2f} {s['wall_ms']['p95']:>9.2f} "
+                  f"{s['wall_ms']['p99']:>9.2f} {s['queue_ms']['p50']:>10.3f} "
+                  f"{s['tokens_in']:>6}/{s['tokens_out']:<7} {s['bytes_in']:>6}/{s['bytes_out']:<7}")
+
+    def annotate_graph(self, graph):
+        # copy of the graph with "p50 .. p95 .." added to the name of every profiled node
+        stats = self.stats()
+        counter = Counter()
+        nodes = {}
+        for node_id, node in graph.nodes.items():
+            if isinstance(node.data, type):  # Input/Output schema nodes
+                nodes[node_id] = node
+                continue
+            counter[node.name] += 1
+            s = stats.get(f"{node.name}#{counter[node.name]}")
+            if s is None:
+                nodes[node_id] = node
+            else:
+                label = f"{node.name} p50 {s['wall_ms']['p50']:.1f}ms p95 {s['wall_ms']['p95']:.1f}ms"
+                nodes[node_id] = node._replace(name=label)
+        return Graph(nodes=nodes, edges=list(graph.edges))
+
+    def print_ascii(self, chain):
+        self.annotate_graph(chain.get_graph()).print_ascii()
+
+    def export_otel(self, endpoint="http://localhost:4317", exporter=None, service_name="langchain-tutorial"):
+        # Sends the recorded runs as OpenTelemetry spans (parent/child kept) to an OTLP collector.
+        try:
+            from opentelemetry import trace
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+        except ImportError as error:
+            raise ImportError("export_otel needs opentelemetry-sdk: pip install opentelemetry-sdk "
+                              "opentelemetry-exporter-otlp-proto-grpc") from error
+        if exporter is None:
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+            exporter = OTLPSpanExporter(endpoint=endpoint, insecure=True)
+
+        provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        tracer = provider.get_tracer("chain_profiler")
+
+        with self.lock:
+            runs = sorted(self.runs, key=lambda run: run["start"])
+        spans = {}
+        for run in runs:
+            parent = spans.get(run["parent"])
+            context = trace.set_span_in_context(parent) if parent is not None else None
+            span = tracer.start_span(run["node"] or run["name"], context=context,
+                                     start_time=self._ns(run["start"]))
+            span.set_attributes({
+                "langchain.run_id": str(run["id"]),
+                "langchain.queue_ms": run["queue"] * 1000,
+                "langchain.tokens_in": run["tokens_in"],
+                "langchain.tokens_out": run["tokens_out"],
+                "langchain.bytes_in": run["bytes_in"],
+                "langchain.bytes_out": run["bytes_out"],
+            })
+            if run["error"]:
+                span.set_status(trace.Status(trace.StatusCode.ERROR, run["error"]))
+            spans[run["id"]] = span
+        # end children before parents
+        for run in sorted(runs, key=lambda run: run["end"]):
+            spans[run["id"]].end(end_time=self._ns(run["end"]))
+        provider.shutdown()
+        return len(runs)
+
+    def _ns(self, perf_time):
+        return int((perf_time + self.epoch_offset) * 1e9)
+
+    def reset(self):
+        with self.lock:
+            self.samples.clear()
+            self.runs.clear()
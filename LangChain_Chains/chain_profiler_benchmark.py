@@ -0,0 +1,92 @@
+# ChainProfiler on the sequential_chain.py chain with a fake model: per-node report, annotated graph,
+# JSON/OpenTelemetry export, and the profiler's overhead.
+import json
+import time
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.prompts import PromptTemplate
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from chain_profiler import ChainProfiler
+
+RUNS = 300
+LATENCY = 0.005  # seconds per fake model call
+
+
+# Fake chat model with latency and usage metadata, like a real provider response.
+class FakeChatModel(BaseChatModel):
+    latency: float = LATENCY
+
+    @property
+    def _llm_type(self):
+        return "fake-with-usage"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        prompt = messages[-1].content
+        text = "Report: " + prompt[::-1] * 3
+        message = AIMessage(content=text, usage_metadata={
+            "input_tokens": len(prompt) // 4, "output_tokens": len(text) // 4, "total_tokens": (len(prompt) + len(text)) // 4,
+        })
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def build(chat_model):
+    # same shape as sequential_chain.py
+    prompt1 = PromptTemplate(template='Generate a detailed report on {topic}', input_variables=['topic'])
+    prompt2 = PromptTemplate(template='Generate summary for the text : {text}..', input_variables=['text'])
+    parser = StrOutputParser()
+    return prompt1 | chat_model | parser | prompt2 | chat_model | parser
+
+
+def timed(chain, config):
+    start = time.perf_counter()
+    for i in range(RUNS):
+        chain.invoke({'topic': f'anime {i}'}, config=config)
+    return (time.perf_counter() - start) / RUNS * 1000
+
+
+chain = build(FakeChatModel())
+profiler = ChainProfiler()
+chain.invoke({'topic': 'warm up'}, config={'callbacks': [profiler]})
+profiler.reset()
+timed(chain, {'callbacks': [profiler]})
+
+print(f"{RUNS} runs of prompt1 | chat_model | parser | prompt2 | chat_model | parser "
+      f"({LATENCY * 1000:.0f} ms per model call)\n")
+profiler.print_stats()
+print()
+profiler.print_ascii(chain)
+
+report = json.loads(profiler.to_json())
+assert report["FakeChatModel#1"]["count"] == RUNS and report["FakeChatModel#2"]["tokens_out"] > 0
+
+exporter = InMemorySpanExporter()
+exported = profiler.export_otel(exporter=exporter)
+spans = exporter.get_finished_spans()
+roots = [span for span in spans if span.parent is None]
+print(f"\nOpenTelemetry: {exported} runs exported as {len(spans)} spans, {len(roots)} root spans "
+      f"(each with {len(spans) // len(roots) - 1} children)")
+
+
+# A handler that does nothing: what LangChain itself adds once any callback is attached.
+class NoopHandler(BaseCallbackHandler):
+    run_inline = True
+
+
+# Overhead: the same chain with and without the profiler, alternating to even out noise.
+print(f"\n{'model latency':>14} {'no callbacks ms':>16} {'no-op handler ms':>17} {'profiler ms':>12} {'overhead':>9}")
+for latency in (LATENCY, 0.0):
+    chain = build(FakeChatModel(latency=latency))
+    plain, noop, profiled = [], [], []
+    for _ in range(3):
+        plain.append(timed(chain, {}))
+        noop.append(timed(chain, {'callbacks': [NoopHandler()]}))
+        profiled.append(timed(chain, {'callbacks': [ChainProfiler()]}))
+    plain, noop, profiled = min(plain), min(noop), min(profiled)
+    print(f"{latency * 1000:>11.0f} ms {plain:>16.3f} {noop:>17.3f} {profiled:>12.3f} {(profiled / plain - 1) * 100:>8.1f}%")
@@ -1,12 +1,26 @@
 from typing import Literal
 from langchain_core.output_parsers import PydanticOutputParser, StrOutputParser
-from langchain_core.runnables import RunnableBranch,RunnableLambda, RunnablePassthrough
+from langchain_core.runnables import RunnableBranch,RunnableLambda, RunnableParallel, RunnablePassthrough
 from langchain_google_genai import ChatGoogleGenerativeAI
 from dotenv import load_dotenv
 from langchain_core.prompts import PromptTemplate
 from pydantic import BaseModel,Field
 
 import os
+import sys
+
+# Compiled prompt templates from LangChain_Prompts/
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LangChain_Prompts'))
+from compiled_template import compile_prompt
+
+# Batch runner for many reviews from LangChain_Runnables/
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LangChain_Runnables'))
+from branch_batch_runner import BranchBatchRunner
+
+# Cached format instructions + model_validate_json fast path from LangChain_Parsers/
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LangChain_Parsers'))
+from fast_pydantic_parser import FastPydanticOutputParser
+from repairing_parser import RepairingOutputParser
 
 load_dotenv()
 
@@ -20,22 +34,25 @@ chat_model = ChatGoogleGenerativeAI(model = MODEL)
 class Feedback(BaseModel):
     sentiment : Literal['Positive','Negative'] = Field(description="Give the sentiment of the feedback.")
 
-# PydanticOutputParser for validation.
-parser1 = PydanticOutputParser(pydantic_object=Feedback)
+# PydanticOutputParser for validation (fast path: model_validate_json on the raw output).
+parser1 = FastPydanticOutputParser(pydantic_object=Feedback)
 
 # Prompt1 -> To get the sentiment of the feedback
 
-prompt1 = PromptTemplate(
+# compile_prompt writes the format instructions into the template once, instead of on every call
+prompt1 = compile_prompt(PromptTemplate(
     template="Classify the sentiment of the given feedback into either positive or negative \n feedback : {feedback} \n {format_instructions}",
     input_variables=['feedback'],
     partial_variables= {'format_instructions':parser1.get_format_instructions()}
-)
+))
 
 
 # StrOutputParser for textual output.
 parser2 = StrOutputParser()
 
-classifier_chain = prompt1 | chat_model | parser1
+# Malformed JSON is repaired locally; a missing/invalid sentiment is asked for again (at most 2 extra calls),
+# with the prompt (and so the feedback) passed along to the parser for that request.
+classifier_chain = prompt1 | RunnableParallel(completion = chat_model, prompt_value = RunnablePassthrough()) | RepairingOutputParser(parser = parser1, llm = chat_model, max_retries = 2)
 
 # Prompt2 -> It will write response to feedback based on sentiment. 
 
@@ -77,4 +94,16 @@ chain = RunnablePassthrough.assign(
 
 print(chain.invoke({'feedback':'This worst phone.'}))
 
-chain.get_graph().print_ascii()
\ No newline at end of file
+chain.get_graph().print_ascii()
+
+
+# Scoring many reviews at once: classify in batches, then send each arm all of its reviews in one batch call.
+reviews = [
+    'This worst phone.',
+    'Battery life is amazing and the camera is great.',
+    'Delivery was late and the box was broken.',
+]
+runner = BranchBatchRunner(classifier_chain, branch_chain, key = 'sentiment', max_concurrency = 4)
+for review, response in zip(reviews, runner.run([{'feedback': review} for review in reviews])):
+    print(review, '->', response)
+print(runner.summary())
@@ -3,7 +3,13 @@ from langchain_core.runnables import RunnableParallel
 from langchain_google_genai import ChatGoogleGenerativeAI
 from dotenv import load_dotenv
 from langchain_core.prompts import PromptTemplate
+import asyncio
 import os
+import sys
+
+# asyncio fan-out with connection limits from LangChain_Runnables/
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LangChain_Runnables'))
+from async_parallel import AsyncParallel, limit_model
 
 load_dotenv()
 
@@ -65,3 +71,22 @@ result = chain.invoke(text)
 print(result)
 
 chain.get_graph().print_ascii()
+
+
+# Async version: notes and quiz run as asyncio tasks with ainvoke instead of a thread pool per request.
+# Each model gets at most 8 calls in flight; if one branch fails or passes the 60 s deadline, the
+# other one is cancelled right away.
+limited_model_1 = limit_model(chat_model_1, max_connections = 8)
+limited_model_2 = limit_model(chat_model_2, max_connections = 8)
+
+async_chain = AsyncParallel(
+    {
+        'notes':prompt1 | limited_model_1 | parser,
+        'quiz' :prompt2 | limited_model_2 | parser
+    },
+    timeout = 60
+) | prompt3 | limited_model_1 | parser
+
+result = asyncio.run(async_chain.ainvoke(text))
+
+print(result)
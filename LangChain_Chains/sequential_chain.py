@@ -4,6 +4,9 @@ from dotenv import load_dotenv
 from langchain_core.prompts import PromptTemplate
 import os
 
+# Per-node timings, tokens and bytes
+from chain_profiler import ChainProfiler
+
 load_dotenv()
 
 MODEL = os.environ.get('GOOGLE_CHAT_MODEL')
@@ -29,10 +32,20 @@ parser = StrOutputParser()
 # Chain 
 chain = prompt1 | chat_model | parser | prompt2 | chat_model | parser 
 
-# Invoking chain 
-result = chain.invoke({'topic':'anime'})
+# Invoking chain (with the profiler attached as a callback)
+profiler = ChainProfiler()
+result = chain.invoke({'topic':'anime'}, config = {'callbacks':[profiler]})
 
 print(result )
 
 # Visualizing chain 
-chain.get_graph().print_ascii()
\ No newline at end of file
+chain.get_graph().print_ascii()
+
+# Same graph with the time spent in every node, plus the full per-node report
+profiler.print_ascii(chain)
+profiler.print_stats()
+
+# Export as JSON, and as OpenTelemetry spans when a local collector is configured
+profiler.save_json('chain_profile.json')
+if os.environ.get('OTEL_EXPORTER_OTLP_ENDPOINT'):
+    profiler.export_otel(endpoint = os.environ['OTEL_EXPORTER_OTLP_ENDPOINT'])
@@ -1,15 +1,23 @@
 from langchain_core.output_parsers import StrOutputParser
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_google_genai import ChatGoogleGenerativeAI, GoogleGenerativeAIEmbeddings
 from dotenv import load_dotenv
 from langchain_core.prompts import PromptTemplate
 import os
+import sys
+
+# Two-tier (exact + semantic) response cache from ChatModels/
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ChatModels'))
+from semantic_cache import SemanticCache
 
 load_dotenv()
 
 MODEL = os.environ.get('GOOGLE_CHAT_MODEL')
 
+# Repeated or near-identical prompts are answered from the cache instead of the model
+llm_cache = SemanticCache(GoogleGenerativeAIEmbeddings(model = os.environ.get('GOOGLE_EMBEDDING_MODEL')), threshold=0.95)
+
 # Model is loaded 
-chat_model = ChatGoogleGenerativeAI(model = MODEL)
+chat_model = ChatGoogleGenerativeAI(model = MODEL, cache = llm_cache)
 
 # Create a simple prompt 
 prompt = PromptTemplate(
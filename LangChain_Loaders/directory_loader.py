@@ -9,4 +9,16 @@ loader = DirectoryLoader(
 docs = loader.load()
 
 print(docs[0].page_content)
-print(docs[0].metadata)
\ No newline at end of file
+print(docs[0].metadata)
+
+# Parallel version: parses files on all CPU cores, keeps a fixed order and skips broken files.
+# from parallel_loader import ParallelDirectoryLoader
+#
+# loader = ParallelDirectoryLoader(
+#     path = "Path to the folder",
+#     glob = "*.pdf",
+#     loader_cls = PyPDFLoader,
+#     max_workers = 4
+# )
+# docs = loader.load()
+# print(loader.errors)
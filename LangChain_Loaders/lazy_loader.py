@@ -5,8 +5,12 @@ loader = DirectoryLoader(
     glob = "Pattern to retrive file for ex '*.pdf' ",
     loader_cls = "Mention loader class for ex PyPDFLoader"
 )
-# Using lazy_load
+# Using lazy_load -> it returns a generator, not a list, so docs[0] does not work.
+# Each document is loaded only when the loop asks for it (one at a time in memory).
 docs = loader.lazy_load()
 
-print(docs[0].page_content)
-print(docs[0].metadata)
\ No newline at end of file
+for doc in docs:
+    print(doc.page_content)
+    print(doc.metadata)
+
+# For a full load -> split -> embed -> upsert pipeline with bounded memory see streaming_pipeline.py
\ No newline at end of file
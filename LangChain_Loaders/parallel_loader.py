@@ -0,0 +1,90 @@
+"""
+Parallel DirectoryLoader: parse files on a process pool.
+
+PDF parsing with PyPDFLoader is CPU bound, so DirectoryLoader (one file after another in one
+process) leaves most cores idle. ParallelDirectoryLoader sends files to worker processes and
+streams the documents back in a fixed order (sorted file paths), so every run gives the same
+output. A file that fails to parse is recorded in loader.errors instead of stopping the run.
+Files go to the pool in batches of `chunksize`, with at most max_workers * prefetch batches in
+flight, so a large directory is parsed while the documents are consumed and not queued all at
+once. loader_cls defaults to UnstructuredFileLoader, like DirectoryLoader.
+
+    loader = ParallelDirectoryLoader("data/", glob="**/*.pdf", loader_cls=PyPDFLoader, max_workers=8)
+    for doc in loader.lazy_load():
+        ...
+    print(loader.errors)
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+
+from langchain_community.document_loaders import UnstructuredFileLoader
+from langchain_core.document_loaders import BaseLoader
+
+
+def load_file(args):
+    # Runs in the worker process. Errors are returned, not raised, so one bad file can't abort the map.
+    path, loader_cls, loader_kwargs = args
+    try:
+        return path, loader_cls(path, **loader_kwargs).load(), None
+    except Exception as error:
+        return path, [], f"{type(error).__name__}: {error}"
+
+
+def load_files(paths, loader_cls, loader_kwargs):
+    # one round trip to a worker: a batch of files
+    return [load_file((path, loader_cls, loader_kwargs)) for path in paths]
+
+
+class ParallelDirectoryLoader(BaseLoader):
+
+    def __init__(self, path, glob="**/*", loader_cls=UnstructuredFileLoader, loader_kwargs=None, max_workers=None,
+                 chunksize=4, prefetch=2):
+        if loader_cls is None:
+            raise ValueError("loader_cls is required")
+        self.path = path
+        self.glob = glob
+        self.loader_cls = loader_cls
+        self.loader_kwargs = loader_kwargs or {}
+        self.max_workers = max_workers or os.cpu_count()
+        self.chunksize = chunksize  # files sent to a worker per round trip
+        self.prefetch = prefetch    # batches in flight per worker
+        self.errors = []
+
+    def files(self):
+        root = Path(self.path)
+        if not root.is_dir():
+            raise FileNotFoundError(f"Directory not found: '{self.path}'")
+        return sorted(str(p) for p in root.glob(self.glob) if p.is_file())
+
+    def lazy_load(self):
+        self.errors = []
+        paths = self.files()
+
+        if self.max_workers == 1:
+            results = (load_file((path, self.loader_cls, self.loader_kwargs)) for path in paths)
+            yield from self._collect(results)
+            return
+
+        paths = iter(paths)
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            # a bounded window of batches, consumed in submission order, so the output is deterministic
+            # whatever finishes first
+            pending = deque()
+            while True:
+                while len(pending) < self.max_workers * self.prefetch:
+                    batch = list(islice(paths, self.chunksize))
+                    if not batch:
+                        break
+                    pending.append(pool.submit(load_files, batch, self.loader_cls, self.loader_kwargs))
+                if not pending:
+                    return
+                yield from self._collect(pending.popleft().result())
+
+    def _collect(self, results):
+        for path, docs, error in results:
+            if error:
+                self.errors.append((path, error))
+            yield from docs
@@ -0,0 +1,134 @@
+"""
+Streaming ingestion pipeline: load -> split -> embed batch -> upsert.
+
+Every stage runs in its own thread and the stages are connected by small bounded queues.
+When a later stage is slow the queues fill up and the earlier stages wait (backpressure),
+so only a few documents are in memory at any time, no matter how big the folder is.
+
+    def upsert(chunks, vectors):
+        # write one batch to your store, e.g. VectorFile.append or a Chroma collection
+        ...
+
+    pipeline = StreamingPipeline(splitter, embed_model, upsert)
+    stats = pipeline.run(stream_documents("data/"))
+"""
+import queue
+import threading
+import time
+
+from langchain_community.document_loaders import DirectoryLoader, PyPDFLoader, TextLoader
+
+# Marks the end of a stream inside the queues.
+DONE = object()
+
+
+class StageError:
+    # Carries an exception from a worker thread to the main thread.
+    def __init__(self, error):
+        self.error = error
+
+
+def stream_documents(path):
+    # DirectoryLoader takes one loader class, so use one loader per file type and chain them.
+    loaders = [
+        DirectoryLoader(path, glob="**/*.txt", loader_cls=TextLoader, loader_kwargs={"encoding": "utf-8"}),
+        DirectoryLoader(path, glob="**/*.pdf", loader_cls=PyPDFLoader),
+    ]
+    for loader in loaders:
+        # lazy_load is a generator: one document (one PDF page) at a time
+        yield from loader.lazy_load()
+
+
+class StreamingPipeline:
+
+    def __init__(self, splitter, embeddings, upsert, batch_size=64, queue_size=8):
+        self.splitter = splitter
+        self.embeddings = embeddings
+        self.upsert = upsert  # called as upsert(chunks, vectors)
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.stop = threading.Event()
+
+    def _put(self, out_queue, item):
+        # Blocking put that gives up when the pipeline is stopped, so no thread hangs forever.
+        while not self.stop.is_set():
+            try:
+                out_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _run_stage(self, produce, out_queue):
+        try:
+            for item in produce():
+                if not self._put(out_queue, item):
+                    return
+            self._put(out_queue, DONE)
+        except Exception as error:
+            self._put(out_queue, StageError(error))
+
+    def _drain(self, in_queue):
+        # Yields items from the upstream queue until DONE, passing errors along.
+        while True:
+            try:
+                item = in_queue.get(timeout=0.1)
+            except queue.Empty:
+                if self.stop.is_set():
+                    return
+                continue
+            if item is DONE:
+                return
+            if isinstance(item, StageError):
+                raise item.error
+            yield item
+
+    def run(self, documents):
+        self.stop.clear()
+        docs_queue = queue.Queue(self.queue_size)
+        chunks_queue = queue.Queue(self.queue_size * self.batch_size)
+        vectors_queue = queue.Queue(self.queue_size)
+        stats = {"documents": 0, "chunks": 0, "batches": 0}
+
+        def load():
+            for doc in documents:
+                stats["documents"] += 1
+                yield doc
+
+        def split():
+            for doc in self._drain(docs_queue):
+                yield from self.splitter.split_documents([doc])
+
+        def embed():
+            batch = []
+            for chunk in self._drain(chunks_queue):
+                batch.append(chunk)
+                if len(batch) == self.batch_size:
+                    yield batch, self.embeddings.embed_documents([c.page_content for c in batch])
+                    batch = []
+            if batch:
+                yield batch, self.embeddings.embed_documents([c.page_content for c in batch])
+
+        threads = [
+            threading.Thread(target=self._run_stage, args=(load, docs_queue), daemon=True),
+            threading.Thread(target=self._run_stage, args=(split, chunks_queue), daemon=True),
+            threading.Thread(target=self._run_stage, args=(embed, vectors_queue), daemon=True),
+        ]
+
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        try:
+            # Upsert runs in the calling thread.
+            for chunks, vectors in self._drain(vectors_queue):
+                self.upsert(chunks, vectors)
+                stats["chunks"] += len(chunks)
+                stats["batches"] += 1
+        finally:
+            self.stop.set()
+            for thread in threads:
+                thread.join()
+
+        stats["seconds"] = time.perf_counter() - start
+        stats["docs_per_sec"] = stats["documents"] / stats["seconds"] if stats["seconds"] else 0.0
+        return stats
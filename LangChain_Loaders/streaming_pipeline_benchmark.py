@@ -0,0 +1,75 @@
+# Benchmark for StreamingPipeline: peak RSS and docs/sec on a generated folder of text and PDF files.
+import os
+import resource
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from sample_files import write_pdf
+from streaming_pipeline import StreamingPipeline, stream_documents
+
+# Store the vectors with the memory-mapped VectorFile from EmbeddingModels/
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "EmbeddingModels"))
+from vector_file import VectorFile
+
+TEXT_FILES = 3000
+PDF_FILES = 300
+DIM = 256
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+sentence = "Space exploration has led to incredible scientific discoveries and new technology. "
+
+with tempfile.TemporaryDirectory() as tmp:
+    data_dir = os.path.join(tmp, "data")
+    os.makedirs(data_dir)
+    for i in range(TEXT_FILES):
+        with open(os.path.join(data_dir, f"doc_{i}.txt"), "w", encoding="utf-8") as f:
+            f.write(f"Document {i}. " + sentence * (20 + i % 40))
+    for i in range(PDF_FILES):
+        write_pdf(os.path.join(data_dir, f"doc_{i}.pdf"), [f"PDF {i} line {n}. Rockets and satellites." for n in range(30)])
+
+    store = VectorFile.create(os.path.join(tmp, "chunks"), dim=DIM)
+
+    # chunk number within its source, counted across batches (a source's chunks can span several batches)
+    chunks_per_source = Counter()
+    seen_ids = set()
+
+    def upsert(chunks, vectors):
+        ids = []
+        for c in chunks:
+            source = c.metadata["source"]
+            ids.append(f"{source}#{chunks_per_source[source]}")
+            chunks_per_source[source] += 1
+        seen_ids.update(ids)
+        store.append(vectors, ids=ids, metadatas=[c.metadata for c in chunks])
+
+    pipeline = StreamingPipeline(
+        RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50),
+        DeterministicFakeEmbedding(size=DIM),
+        upsert,
+        batch_size=64,
+    )
+
+    before = peak_rss_mb()
+    stats = pipeline.run(stream_documents(data_dir))
+    print(f"Streaming pipeline : {stats['documents']} docs, {stats['chunks']} chunks, "
+          f"{stats['docs_per_sec']:.0f} docs/sec, peak RSS {peak_rss_mb():.0f} MB (start {before:.0f} MB)")
+    print("Vectors stored     :", len(store))
+    assert len(seen_ids) == len(store), "every chunk needs its own id"
+
+    # Baseline: load everything first, like directory_loader.py does.
+    start = time.perf_counter()
+    docs = list(stream_documents(data_dir))
+    chunks = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50).split_documents(docs)
+    vectors = DeterministicFakeEmbedding(size=DIM).embed_documents([c.page_content for c in chunks])
+    elapsed = time.perf_counter() - start
+    print(f"Load everything    : {len(docs)} docs, {len(chunks)} chunks, "
+          f"{len(docs) / elapsed:.0f} docs/sec, peak RSS {peak_rss_mb():.0f} MB")
@@ -0,0 +1,105 @@
+"""
+Append-only chat history store with fast "last N messages" loading.
+
+Each session is two files in the store directory:
+
+    <session_id>.jsonl  one typed message per line (langchain message dicts)
+    <session_id>.idx    8 byte offset of every line in the .jsonl file
+
+Appending writes one line and one offset (O(1)). Loading the last N messages reads the last N
+offsets from the .idx file and seeks straight to them, so it costs the same for 10 or 100k messages.
+FileChatMessageHistory is a normal LangChain BaseChatMessageHistory, so it works with
+MessagesPlaceholder and RunnableWithMessageHistory.
+
+    store = ChatHistoryStore("chat_histories")
+    history = store.get("customer-42")
+    history.add_messages([HumanMessage(content="Where is my refund?")])
+    chat_history = history.last(20)
+"""
+import json
+import os
+import re
+import struct
+import threading
+
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import messages_from_dict, messages_to_dict
+
+OFFSET = struct.Struct("<Q")
+SESSION_ID = re.compile(r"^[A-Za-z0-9_.-]{1,128}$")
+
+
+class FileChatMessageHistory(BaseChatMessageHistory):
+
+    def __init__(self, directory, session_id, lock=None):
+        if not SESSION_ID.match(session_id):
+            raise ValueError(f"Invalid session id: {session_id!r}")
+        self.session_id = session_id
+        self.log_path = os.path.join(directory, session_id + ".jsonl")
+        self.index_path = os.path.join(directory, session_id + ".idx")
+        self.lock = lock or threading.Lock()
+
+    def __len__(self):
+        try:
+            return os.path.getsize(self.index_path) // OFFSET.size
+        except FileNotFoundError:
+            return 0
+
+    def add_messages(self, messages):
+        lines = [json.dumps(item, ensure_ascii=False).encode("utf-8") + b"\n" for item in messages_to_dict(messages)]
+        with self.lock, open(self.log_path, "ab") as log, open(self.index_path, "ab") as index:
+            offset = log.seek(0, os.SEEK_END)
+            offsets = bytearray()
+            for line in lines:
+                offsets += OFFSET.pack(offset)
+                offset += len(line)
+            # log first, index second: an offset never points at a line that isn't written yet
+            log.write(b"".join(lines))
+            log.flush()
+            index.write(offsets)
+
+    def last(self, n):
+        with self.lock:
+            count = len(self)
+            if count == 0 or n <= 0:
+                return []
+            first = max(0, count - n)
+            with open(self.index_path, "rb") as index:
+                index.seek(first * OFFSET.size)
+                offsets = [offset for (offset,) in OFFSET.iter_unpack(index.read((count - first) * OFFSET.size))]
+            with open(self.log_path, "rb") as log:
+                log.seek(offsets[0])
+                data = log.read(offsets[-1] - offsets[0]) + log.readline()
+        # one read for the whole range, but only the indexed lines are parsed: a line written to the log
+        # by a write that crashed before its index entry sits between them and is skipped
+        base = offsets[0]
+        lines = [data[offset - base:data.index(b"\n", offset - base)] for offset in offsets]
+        return messages_from_dict([json.loads(line) for line in lines])
+
+    @property
+    def messages(self):
+        return self.last(len(self))
+
+    def clear(self):
+        with self.lock:
+            for path in (self.log_path, self.index_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+class ChatHistoryStore:
+    # One history per session id; each session has its own lock so sessions never block each other.
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.locks = {}
+        self.locks_guard = threading.Lock()
+
+    def get(self, session_id):
+        with self.locks_guard:
+            lock = self.locks.setdefault(session_id, threading.Lock())
+        return FileChatMessageHistory(self.directory, session_id, lock)
+
+    def sessions(self):
+        return sorted(name[:-6] for name in os.listdir(self.directory) if name.endswith(".jsonl"))
@@ -0,0 +1,71 @@
+# Benchmark for ChatHistoryStore: load time of the last 20 messages as a history grows to 100k messages.
+import json
+import tempfile
+import threading
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage, messages_from_dict
+
+from chat_history_store import ChatHistoryStore
+
+LAST_N = 20
+CHECKPOINTS = [100, 1_000, 10_000, 100_000]
+SESSIONS = 8
+
+
+def turn(i):
+    return [
+        HumanMessage(content=f"Message {i}: I want to request a refund for my order #{i}."),
+        AIMessage(content=f"Your refund request for order #{i} has been initiated. It will be processed in 3-5 business days."),
+    ]
+
+
+def timed(fn, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def readlines_last(path, n):
+    # old approach: read the whole file, then keep the tail
+    with open(path, "rb") as f:
+        lines = f.readlines()
+    return messages_from_dict([json.loads(line) for line in lines[-n:]])
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    store = ChatHistoryStore(tmp)
+    history = store.get("customer-1")
+
+    print(f"{'messages':>9} {'last(20) ms':>12} {'readlines ms':>13} {'append us/msg':>14}")
+    written = 0
+    for target in CHECKPOINTS:
+        start = time.perf_counter()
+        appended = 0
+        while written < target:
+            history.add_messages(turn(written))
+            written += 2
+            appended += 2
+        append_us = (time.perf_counter() - start) / appended * 1e6
+
+        last_ms, last_messages = timed(lambda: history.last(LAST_N))
+        full_ms, full_messages = timed(lambda: readlines_last(history.log_path, LAST_N), repeat=3)
+        assert [m.content for m in last_messages] == [m.content for m in full_messages]
+        print(f"{len(history):>9} {last_ms:>12.3f} {full_ms:>13.2f} {append_us:>14.1f}")
+
+    # many sessions appended concurrently from threads
+    def chat(session):
+        h = store.get(f"session-{session}")
+        for i in range(1000):
+            h.add_messages(turn(i))
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=chat, args=(s,)) for s in range(SESSIONS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    print(f"\n{SESSIONS} concurrent sessions: {SESSIONS * 2000 / elapsed:.0f} messages/sec appended, "
+          f"each has {len(store.get('session-0'))} messages")
@@ -1,6 +1,13 @@
-from langchain_core.messages import HumanMessage
+import os
+import re
+
+from langchain_core.messages import AIMessage, HumanMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 
+from chat_history_store import ChatHistoryStore
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 # chat template with messages placeholder
 chat_template = ChatPromptTemplate([
     ("system", "Your are a helpful customer support assistant."),
@@ -8,16 +15,25 @@ chat_template = ChatPromptTemplate([
     ("human", "{query}")
 ])
 
-chat_history = []
-# load chat history
-with open("chat_history.txt", "r") as file:
-    chat_history.extend(file.readlines())
+# Chat history store -> one typed JSONL log per session id (see chat_history_store.py)
+store = ChatHistoryStore(os.path.join(BASE_DIR, "chat_histories"))
+history = store.get("customer-12345")
+
+# First run: import chat_history.txt. Its lines are HumanMessage(content="...") strings,
+# so parse them into real message objects instead of passing the raw text along.
+if len(history) == 0:
+    message_types = {"HumanMessage": HumanMessage, "AIMessage": AIMessage}
+    with open(os.path.join(BASE_DIR, "chat_history.txt"), "r") as file:
+        for line in file:
+            match = re.match(r'\s*(HumanMessage|AIMessage)\(content="(.*)"\)\s*$', line)
+            if match:
+                history.add_message(message_types[match.group(1)](content = match.group(2)))
+
+# load only the last 10 messages (constant time, however long the history is)
+chat_history = history.last(10)
 
 print("Chat History : ",chat_history)
 
 prompt = chat_template.invoke({'chat_history':chat_history,'query':'Where is my refund'})
 
 print("Prompt : ",prompt)
-
-
-
@@ -1,6 +1,12 @@
 from langchain_google_genai import ChatGoogleGenerativeAI
 from dotenv import load_dotenv
+import json
 import os
+import sys
+
+# Incremental parser for streamed JSON from LangChain_Parsers/
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LangChain_Parsers'))
+from streaming_json import IncrementalJsonOutputParser
 
 load_dotenv()
 
@@ -65,4 +71,19 @@ Review by Yogesh Bawankar
 
 result = structured_model.invoke(data)
 
-print(result)
\ No newline at end of file
+print(result)
+
+
+# Streaming the same schema field by field: ask for JSON directly and parse it while it streams,
+# so key_themes and summary can be used before pros and cons are even generated.
+stream_prompt = f"Extract the review below as a JSON object matching this JSON schema:\n{json.dumps(review_schema)}\n\nReview:\n{data}"
+
+stream_chain = chat_model | IncrementalJsonOutputParser(diff = True)
+
+for path, value in stream_chain.stream(stream_prompt):
+    if path:
+        print(path[0], '->', value)
+    else:
+        result = value   # the last event is the complete object
+
+print(result)
@@ -0,0 +1,90 @@
+"""
+PydanticOutputParser with a fast path.
+
+PydanticOutputParser does the same work on every call:
+    get_format_instructions()  builds the JSON schema of the model again
+    parse()                    parses the text into a dict (parse_json_markdown), then validates the dict
+
+FastPydanticOutputParser is a drop-in replacement:
+    - the format instructions, with the JSON schema in them, are built once per model class
+    - the raw model output goes straight to Model.model_validate_json (pydantic's Rust JSON parser,
+      no intermediate dict)
+    - only when that fails because the text is not plain JSON does it run a repair pass: the JSON is
+      cut out of code fences / surrounding text and validated again, and if that fails too the
+      normal PydanticOutputParser parsing is used
+
+    parser1 = FastPydanticOutputParser(pydantic_object=Feedback)
+    print(parser1.stats())   # how this parser's outputs were parsed
+"""
+import threading
+from functools import lru_cache
+from typing import Any
+
+import pydantic
+from langchain_core.exceptions import OutputParserException
+from langchain_core.output_parsers import PydanticOutputParser
+from pydantic import PrivateAttr
+
+
+@lru_cache(maxsize=None)
+def format_instructions(model_class):
+    # the JSON schema is generated here, once per model class, as part of the instructions
+    return PydanticOutputParser(pydantic_object=model_class).get_format_instructions()
+
+
+def extract_json(text):
+    # the outermost {...} or [...] of the text: drops code fences and any words around the JSON
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        return None
+    start = min(starts)
+    end = text.rfind("}" if text[start] == "{" else "]")
+    return text[start:end + 1] if end > start else None
+
+
+class FastPydanticOutputParser(PydanticOutputParser):
+    # how this parser's outputs were parsed
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _stats: dict = PrivateAttr(default_factory=lambda: {"fast_parses": 0, "repaired_parses": 0, "fallback_parses": 0})
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+    def get_format_instructions(self):
+        return format_instructions(self.pydantic_object)
+
+    def _fast_parse(self, text):
+        try:
+            return self.pydantic_object.model_validate_json(text)
+        except pydantic.ValidationError as error:
+            if any(e["type"] == "json_invalid" for e in error.errors()):
+                return None  # not plain JSON -> repair pass
+            name = self.pydantic_object.__name__
+            raise OutputParserException(f"Failed to parse {name} from completion {text}. Got: {error}",
+                                        llm_output=text) from error
+
+    def parse_result(self, result, *, partial=False):
+        if partial or not issubclass(self.pydantic_object, pydantic.BaseModel):
+            return super().parse_result(result, partial=partial)
+
+        text = result[0].text
+        parsed = self._fast_parse(text)
+        if parsed is not None:
+            self._count("fast_parses")
+            return parsed
+
+        # repair pass: cut the JSON out of fences/prose and validate that
+        extracted = extract_json(text)
+        parsed = self._fast_parse(extracted) if extracted and extracted != text else None
+        if parsed is not None:
+            self._count("repaired_parses")
+            return parsed
+
+        # last resort: the normal PydanticOutputParser path (tolerant markdown / partial JSON parsing)
+        self._count("fallback_parses")
+        return super().parse_result(result, partial=partial)
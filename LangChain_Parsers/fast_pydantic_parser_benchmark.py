@@ -0,0 +1,88 @@
+# Parse throughput on 100k canned model outputs (Person, Feedback, Review), PydanticOutputParser vs
+# FastPydanticOutputParser, plus the cost of get_format_instructions() per call.
+import json
+import random
+import time
+from typing import Literal, Optional
+
+from langchain_core.output_parsers import PydanticOutputParser
+from pydantic import BaseModel, Field
+
+from fast_pydantic_parser import FastPydanticOutputParser
+
+OUTPUTS = 100_000
+FENCED = 0.1  # share of outputs wrapped in ```json fences, which need the repair pass
+
+
+# the models from pydantic_output_parser.py, conditional_chain.py and with_structure_output_pydantic.py
+class Person(BaseModel):
+    name: str = Field(description="Name of the person")
+    age: int = Field(description="Age of the person")
+    city: str = Field(description="Name of city that person belongs to. ")
+
+
+class Feedback(BaseModel):
+    sentiment: Literal['Positive', 'Negative'] = Field(description="Give the sentiment of the feedback.")
+
+
+class Review(BaseModel):
+    key_themes: list[str] = Field(description="Write down all the key themes discussed in the review in a list.")
+    summary: str = Field(description="A brief summary of the review. ")
+    sentiment: Literal["pos", "neg"] = Field(description="Return sentiment of the review either negative , positive or neutral.")
+    pros: Optional[list[str]] = Field(default=None, description="Write down all the pros inside a list.")
+    cons: Optional[list[str]] = Field(default=None, description="Write down all the cons inside the list")
+    name: Optional[str] = Field(description="Write the name of the reviewer", default=None)
+
+
+random.seed(0)
+
+
+def canned(model):
+    if model is Person:
+        value = {"name": random.choice(["Asha", "Ravi", "Kumar"]), "age": random.randint(18, 80), "city": "Colombo"}
+    elif model is Feedback:
+        value = {"sentiment": random.choice(["Positive", "Negative"])}
+    else:
+        value = {"key_themes": ["battery", "camera", "price"], "summary": "Powerful phone, heavy and expensive.",
+                 "sentiment": "pos", "pros": ["fast processor", "200MP camera", "battery life"],
+                 "cons": ["weight", "bloatware", "price"], "name": "Yogesh Bawankar"}
+    text = json.dumps(value, indent=random.choice([None, 2]))
+    return f"```json\n{text}\n```" if random.random() < FENCED else text
+
+
+models = [Person, Feedback, Review]
+outputs = [(model, canned(model)) for model in random.choices(models, k=OUTPUTS)]
+
+print(f"{OUTPUTS:,} outputs, {FENCED:.0%} in code fences\n")
+print(f"{'':<34} {'PydanticOutputParser':>21} {'FastPydanticOutputParser':>25} {'speedup':>8}")
+
+rates = {}
+for label, parser_cls in [("PydanticOutputParser", PydanticOutputParser), ("FastPydanticOutputParser", FastPydanticOutputParser)]:
+    parsers = {model: parser_cls(pydantic_object=model) for model in models}
+    # warm up
+    for model, text in outputs[:100]:
+        parsers[model].parse(text)
+
+    start = time.perf_counter()
+    results = [parsers[model].parse(text) for model, text in outputs]
+    rates[label, "parse"] = OUTPUTS / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for model, _ in outputs[:10_000]:
+        parsers[model].get_format_instructions()
+    rates[label, "format"] = 10_000 / (time.perf_counter() - start)
+
+    if label == "PydanticOutputParser":
+        expected = results
+    else:
+        assert results == expected
+
+for kind, title in [("parse", "parse() per second"), ("format", "get_format_instructions() per second")]:
+    slow, fast = rates["PydanticOutputParser", kind], rates["FastPydanticOutputParser", kind]
+    print(f"{title:<34} {slow:>21,.0f} {fast:>25,.0f} {fast / slow:>7.1f}x")
+
+print()
+for model, parser in parsers.items():
+    stats = parser.stats()
+    print(f"{model.__name__:<9} fast path: {stats['fast_parses']:,}, repaired: {stats['repaired_parses']:,}, "
+          f"PydanticOutputParser fallback: {stats['fallback_parses']:,}")
@@ -4,6 +4,9 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from dotenv import load_dotenv
 import os
 
+# Incremental parser for streamed JSON
+from streaming_json import IncrementalJsonOutputParser
+
 load_dotenv()
 
 MODEL = os.environ.get("GOOGLE_CHAT_MODEL")
@@ -37,4 +40,14 @@ result = chain.invoke(prompt)
 
 print("------- RESULT -------")
 print(result)
-print("----------------------")
\ No newline at end of file
+print("----------------------")
+
+
+# Streaming: instead of waiting for the full response, IncrementalJsonOutputParser hands out the
+# partial object every time a field is complete (name, then age, then city).
+stream_chain = chat_model | IncrementalJsonOutputParser()
+
+print("------- STREAM -------")
+for partial in stream_chain.stream(prompt):
+    print(partial)
+print("----------------------")
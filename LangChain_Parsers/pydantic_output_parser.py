@@ -4,6 +4,14 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 import os
+import sys
+
+# Compiled prompt templates from LangChain_Prompts/
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LangChain_Prompts'))
+from compiled_template import compile_prompt
+
+# Cached format instructions + model_validate_json fast path
+from fast_pydantic_parser import FastPydanticOutputParser
 
 load_dotenv()
 
@@ -18,13 +26,14 @@ class Person(BaseModel):
     age : int = Field(description="Age of the person")
     city : str = Field(description="Name of city that person belongs to. ")
 
-parser = PydanticOutputParser(pydantic_object=Person)
+parser = FastPydanticOutputParser(pydantic_object=Person)
 
-template = PromptTemplate(
+# compile_prompt writes the format instructions into the template once, instead of on every call
+template = compile_prompt(PromptTemplate(
     template = "Generate the name, age and city of a fictional {place} person  \n {format_instructions}",
     input_variables=['place'],
     partial_variables={'format_instructions':parser.get_format_instructions()}
-)
+))
 
 # Without using chain 
 
@@ -0,0 +1,326 @@
+"""
+Self-repairing structured output.
+
+When StructuredOutputParser / PydanticOutputParser reject a model response, the chain fails, or has
+to be run again from the prompt (twice the latency and cost). RepairingOutputParser wraps either
+parser and repairs the response in three steps, cheapest first:
+
+    1. parse as is
+    2. local fixes, no model call: code fences and text around the JSON, trailing commas,
+       single quotes, Python True/False/None, truncated output (unclosed strings/brackets; a
+       field cut off in the middle is dropped so step 3 can ask for it again)
+    3. targeted re-generation: the fields that are still missing or invalid are requested from the
+       model on their own; the fields that were fine are kept. At most `max_retries` extra model
+       calls per response.
+
+    parser = RepairingOutputParser(parser=parser1, llm=chat_model, max_retries=2)
+    classifier_chain = prompt1 | chat_model | parser
+    print(parser.stats())   # repair rate, extra calls, latency added
+
+Step 3 works best with the original prompt, so the model sees the input again and not only the broken
+output. Pass it like RetryWithErrorOutputParser: parser.parse_with_prompt(completion, prompt_value),
+or in a chain send {"completion": ..., "prompt_value": ...} to the parser:
+
+    classifier_chain = prompt1 | RunnableParallel(completion=chat_model, prompt_value=RunnablePassthrough()) | parser
+
+The re-generation call gets the parser's config, so it shows up in tracing as a child run.
+"""
+import json
+import re
+import threading
+import time
+from typing import Any
+
+from langchain_core.exceptions import OutputParserException
+from langchain_core.messages import BaseMessage
+from langchain_core.output_parsers import BaseOutputParser, PydanticOutputParser
+from langchain_core.runnables.config import run_in_executor
+from pydantic import BaseModel, PrivateAttr, ValidationError
+
+PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+WORD = re.compile(r"[A-Za-z_]+")
+DANGLING_KEY = re.compile(r',?\s*"(?:[^"\\]|\\.)*"\s*:\s*$')
+
+REGENERATE_PROMPT = """{request}The following output was supposed to be a JSON object, but some fields are missing or invalid.
+
+Output:
+{completion}
+
+Return ONLY a JSON object with these fields:
+{fields}"""
+REQUEST = """The request was:
+{prompt}
+
+"""
+
+
+def repair_json(text):
+    # -> (repaired text, list of fixes applied); string-aware, one pass over the text
+    fixes = []
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        return text, fixes
+    start = min(starts)
+    if text[:start].strip():
+        fixes.append("code fences" if "```" in text[:start] else "text around json")
+
+    out = []
+    stack = []
+    quote = None  # quote character of the string being read
+    string_start = 0  # len(out) where that string started
+    i, n = start, len(text)
+    end = None
+    while i < n:
+        char = text[i]
+        if quote:
+            if char == "\\":
+                # \' is not a JSON escape
+                out.append("'" if text[i + 1:i + 2] == "'" else text[i:i + 2])
+                i += 2
+                continue
+            if char == quote:
+                out.append('"')
+                quote = None
+            elif char == '"':  # double quote inside a single-quoted string
+                out.append('\\"')
+            elif char == "\n":
+                out.append("\\n")
+            else:
+                out.append(char)
+            i += 1
+            continue
+
+        if char == '"' or char == "'":
+            if char == "'" and "single quotes" not in fixes:
+                fixes.append("single quotes")
+            quote = char
+            string_start = len(out)
+            out.append('"')
+        elif char == "{" or char == "[":
+            stack.append("}" if char == "{" else "]")
+            out.append(char)
+        elif char == "}" or char == "]":
+            if _drop_trailing_comma(out) and "trailing comma" not in fixes:
+                fixes.append("trailing comma")
+            if stack:
+                stack.pop()
+            out.append(char)
+            if not stack:
+                end = i + 1
+                break
+        elif char.isalpha():
+            match = WORD.match(text, i)
+            if match is None:
+                # a letter outside a string that no fix applies to (e.g. a non-ASCII word)
+                raise OutputParserException(f"Unexpected character {char!r} at position {i}: {text[:200]}",
+                                            llm_output=text)
+            word = match.group()
+            if word in PYTHON_LITERALS and "python literals" not in fixes:
+                fixes.append("python literals")
+            out.append(PYTHON_LITERALS.get(word, word))
+            i += len(word)
+            continue
+        else:
+            out.append(char)
+        i += 1
+
+    if end is None:
+        fixes.append("truncated")
+        if quote:
+            # a string cut off in the middle: drop it (and its key) rather than keep half a value
+            del out[string_start:]
+        repaired = DANGLING_KEY.sub("", "".join(out)).rstrip()
+        repaired = repaired.rstrip(",").rstrip()
+        return repaired + "".join(reversed(stack)), fixes
+
+    if text[end:].strip() and not fixes:
+        fixes.append("text around json")
+    return "".join(out), fixes
+
+
+def _drop_trailing_comma(out):
+    j = len(out) - 1
+    while j >= 0 and out[j].isspace():
+        j -= 1
+    if j >= 0 and out[j] == ",":
+        del out[j]
+        return True
+    return False
+
+
+class RepairingOutputParser(BaseOutputParser):
+    parser: Any
+    llm: Any = None
+    max_retries: int = 2
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _stats: dict = PrivateAttr(default_factory=lambda: {
+        "outputs": 0, "ok": 0, "local_repairs": 0, "model_repairs": 0, "failed": 0,
+        "extra_calls": 0, "repair_seconds": 0.0,
+    })
+
+    @property
+    def _type(self):
+        return "repairing"
+
+    def get_format_instructions(self):
+        return self.parser.get_format_instructions()
+
+    # --- what the wrapped parser expects -----------------------------------------------------
+
+    def _model(self):
+        if isinstance(self.parser, PydanticOutputParser) and issubclass(self.parser.pydantic_object, BaseModel):
+            return self.parser.pydantic_object
+        return None
+
+    def _field_specs(self):
+        # field name -> description, for the re-generation prompt
+        model = self._model()
+        if model is not None:
+            return {name: field.description or name for name, field in model.model_fields.items()}
+        schemas = getattr(self.parser, "response_schemas", None)
+        if schemas:
+            return {schema.name: f"{schema.description} ({schema.type})" for schema in schemas}
+        return {}
+
+    def _failing_fields(self, obj):
+        model = self._model()
+        if model is not None:
+            try:
+                model.model_validate(obj)
+                return []
+            except ValidationError as error:
+                fields = list(dict.fromkeys(str(e["loc"][0]) for e in error.errors() if e["loc"]))
+                # a model-level error (model_validator, root type) names no field: ask for all of them
+                return fields or list(model.model_fields)
+        return [name for name in self._field_specs() if name not in obj]
+
+    def _finish(self, obj, text):
+        model = self._model()
+        if model is None:
+            return obj
+        try:
+            return model.model_validate(obj)
+        except ValidationError as error:
+            raise OutputParserException(f"Failed to parse {model.__name__} from repaired output: {error}",
+                                        llm_output=text) from error
+
+    # --- parsing -----------------------------------------------------------------------------
+
+    def _count(self, key, seconds=0.0, calls=0):
+        with self._lock:
+            self._stats[key] += 1
+            self._stats["outputs"] += 1
+            self._stats["repair_seconds"] += seconds
+            self._stats["extra_calls"] += calls
+
+    def invoke(self, input, config=None, **kwargs):
+        # input: the model output (str or message), or {"completion": ..., "prompt_value": ...}
+        return self._call_with_config(
+            lambda inner_input, config: self._parse(*self._completion_and_prompt(inner_input), config=config),
+            input, config, run_type="parser")
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        return await self._acall_with_config(
+            lambda inner_input, config: run_in_executor(
+                config, self._parse, *self._completion_and_prompt(inner_input), config),
+            input, config, run_type="parser")
+
+    @staticmethod
+    def _completion_and_prompt(input):
+        prompt = None
+        if isinstance(input, dict):
+            input, prompt = input["completion"], input.get("prompt_value")
+        if isinstance(input, BaseMessage):
+            input = input.text()
+        return input, prompt
+
+    def parse(self, text):
+        return self._parse(text)
+
+    def parse_with_prompt(self, completion, prompt_value):
+        return self._parse(completion, prompt_value)
+
+    def _parse(self, text, prompt_value=None, config=None):
+        # the wrapped parsers accept truncated JSON (it is parsed as partial JSON, so a value cut off
+        # in the middle comes back cut off): JSON that doesn't end in a bracket goes straight to the
+        # repair steps. Output without any JSON is parsed as is, so the error is the parser's own.
+        first_error = None
+        stripped = text.rstrip().rstrip("`").rstrip()
+        if stripped[-1:] in ("}", "]") or ("{" not in stripped and "[" not in stripped):
+            try:
+                result = self.parser.parse(text)
+                self._count("ok")
+                return result
+            except OutputParserException as error:
+                first_error = error
+        start = time.perf_counter()
+
+        # 2. local fixes
+        try:
+            repaired, fixes = repair_json(text)
+        except OutputParserException as error:
+            repaired, fixes = text, []
+            first_error = first_error or error
+        if fixes:
+            try:
+                result = self.parser.parse(repaired)
+                self._count("local_repairs", time.perf_counter() - start)
+                return result
+            except OutputParserException as error:
+                first_error = first_error or error
+
+        # 3. ask the model again for the failing fields only
+        try:
+            obj = json.loads(repaired)
+        except ValueError:
+            obj = {}
+        if not isinstance(obj, dict):
+            obj = {}
+        specs = self._field_specs()
+        request = REQUEST.format(prompt=prompt_value.to_string()) if prompt_value is not None else ""
+        calls = 0
+        while self.llm is not None and specs and calls < self.max_retries:
+            failing = self._failing_fields(obj)
+            if not failing:
+                break
+            # keep the good fields, drop the bad ones
+            obj = {k: v for k, v in obj.items() if k not in failing}
+            fields = "\n".join(f'- "{name}": {specs.get(name, name)}' for name in failing)
+            calls += 1
+            answer = self.llm.invoke(REGENERATE_PROMPT.format(request=request, completion=text, fields=fields),
+                                     config)
+            try:
+                patch, _ = repair_json(getattr(answer, "content", answer))
+                patch = json.loads(patch)
+            except (ValueError, OutputParserException):
+                continue
+            if isinstance(patch, dict):
+                obj.update({k: v for k, v in patch.items() if k in failing})
+
+        if specs and not self._failing_fields(obj):
+            try:
+                result = self._finish(obj, text)
+            except OutputParserException as error:
+                first_error = first_error or error
+            else:
+                self._count("model_repairs", time.perf_counter() - start, calls)
+                return result
+        self._count("failed", time.perf_counter() - start, calls)
+        if first_error is None:
+            # truncated JSON that the repair couldn't close into something the parser accepts
+            try:
+                json.loads(repaired)
+                message = f"Truncated output, fields still missing or invalid: {self._failing_fields(obj)}"
+            except ValueError as error:
+                message = f"Invalid json output ({error}): {text[-200:]}"
+            first_error = OutputParserException(message, llm_output=text)
+        raise first_error
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        outputs = stats["outputs"] or 1
+        repaired = stats["local_repairs"] + stats["model_repairs"]
+        stats["repair_rate"] = repaired / outputs
+        stats["repair_success_rate"] = repaired / (repaired + stats["failed"]) if repaired + stats["failed"] else 1.0
+        return stats
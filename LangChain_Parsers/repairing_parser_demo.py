@@ -0,0 +1,160 @@
+# RepairingOutputParser against a fake model that breaks its JSON in the usual ways (code fences, trailing
+# commas, single quotes, truncation, missing / invalid fields). Checks every kind of repair, then reports
+# the repair rate and the latency it adds over many outputs. No API key needed.
+import json
+import random
+import time
+from typing import Literal
+
+from langchain.output_parsers import ResponseSchema, StructuredOutputParser
+from langchain_core.exceptions import OutputParserException
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel, Field, model_validator
+
+from fast_pydantic_parser import FastPydanticOutputParser
+from repairing_parser import RepairingOutputParser, repair_json
+
+MODEL_LATENCY = 0.02  # seconds per fake model call
+OUTPUTS = 500
+random.seed(0)
+
+
+# the schemas from structure_output_parser.py and conditional_chain.py
+class Feedback(BaseModel):
+    sentiment: Literal['Positive', 'Negative'] = Field(description="Give the sentiment of the feedback.")
+
+
+class Person(BaseModel):
+    name: str = Field(description="Name of the person")
+    age: int = Field(description="Age of the person")
+    city: str = Field(description="Name of city that person belongs to. ")
+
+
+class Adult(Person):
+
+    @model_validator(mode="after")
+    def check_age(self):
+        # a model-level check: its error names no field
+        if self.age < 18:
+            raise ValueError("must be an adult")
+        return self
+
+
+facts_parser = StructuredOutputParser.from_response_schemas([
+    ResponseSchema(name='fact_1', description="Fact 1 about the topic "),
+    ResponseSchema(name='fact_2', description="Fact 2 about the topic "),
+    ResponseSchema(name='fact_3', description="Fact 3 about the topic "),
+])
+
+ANSWERS = {
+    "name": "Asha", "age": 31, "city": "Colombo", "sentiment": "Negative",
+    "fact_1": "Nothing escapes a black hole.", "fact_2": "Time slows near the horizon.",
+    "fact_3": "They evaporate through Hawking radiation.",
+}
+
+
+def fake_model(prompt):
+    # answers the targeted re-generation prompt with only the fields it asks for
+    time.sleep(MODEL_LATENCY)
+    text = prompt.to_string() if hasattr(prompt, "to_string") else str(prompt)
+    asked = [name for name in ANSWERS if f'- "{name}"' in text]
+    return AIMessage(content=json.dumps({name: ANSWERS[name] for name in asked}))
+
+
+llm = RunnableLambda(fake_model)
+
+
+# --- repair_json on its own ---------------------------------------------------------------------
+
+cases = [
+    ('```json\n{"name": "Asha", "age": 31}\n```', {"name": "Asha", "age": 31}, "code fences"),
+    ('Here you go: {"name": "Asha"} Hope it helps!', {"name": "Asha"}, "text around json"),
+    ('{"pros": ["battery", "camera",], "name": "Asha",}', {"pros": ["battery", "camera"], "name": "Asha"}, "trailing comma"),
+    ("{'name': 'Asha', 'quote': 'it\\'s \"fine\"'}", {"name": "Asha", "quote": 'it\'s "fine"'}, "single quotes"),
+    ('{"ok": True, "error": None}', {"ok": True, "error": None}, "python literals"),
+    ('{"name": "Asha", "pros": ["battery", "cam', {"name": "Asha", "pros": ["battery"]}, "truncated"),
+    ('{"name": "Asha", "age": ', {"name": "Asha"}, "truncated"),
+]
+for text, expected, fix in cases:
+    repaired, fixes = repair_json(text)
+    assert json.loads(repaired) == expected, (text, repaired)
+    assert fix in fixes, (text, fixes)
+    print(f"{fix:<18} {text!r:<50} -> {repaired}")
+
+
+# --- every repair step through the parser -------------------------------------------------------
+
+person = RepairingOutputParser(parser=FastPydanticOutputParser(pydantic_object=Person), llm=llm)
+assert person.parse('{"name": "Asha", "age": 31, "city": "Colombo"}') == Person(name="Asha", age=31, city="Colombo")
+assert person.parse("```json\n{'name': 'Asha', 'age': 31, 'city': 'Colombo',}\n```").age == 31
+# truncated in the middle of city: name and age are kept, city is asked for again
+assert person.parse('{"name": "Ravi", "age": 40, "city": "Kan') == Person(name="Ravi", age=40, city="Colombo")
+# invalid field: only age is re-generated
+assert person.parse('{"name": "Ravi", "age": "forty", "city": "Kandy"}') == Person(name="Ravi", age=31, city="Kandy")
+stats = person.stats()
+assert (stats["ok"], stats["local_repairs"], stats["model_repairs"], stats["extra_calls"]) == (1, 1, 2, 2)
+
+# a model_validator failure: the whole object is asked for again
+adult = RepairingOutputParser(parser=FastPydanticOutputParser(pydantic_object=Adult), llm=llm)
+assert adult.parse('{"name": "Ravi", "age": 12, "city": "Kandy"}') == Adult(name="Asha", age=31, city="Colombo")
+try:
+    RepairingOutputParser(parser=FastPydanticOutputParser(pydantic_object=Adult)).parse('{"name": "Ravi", "age": 12, "city": "Kandy"}')
+    raise AssertionError("expected OutputParserException")
+except OutputParserException:
+    pass
+
+facts = RepairingOutputParser(parser=facts_parser, llm=llm)
+assert facts.parse('```json\n{"fact_1": "a", "fact_2": "b"}\n```') == {"fact_1": "a", "fact_2": "b", "fact_3": ANSWERS["fact_3"]}
+
+# without a model (or once the retry budget is spent) the original error is raised
+try:
+    RepairingOutputParser(parser=facts_parser).parse('{"fact_1": "a"}')
+    raise AssertionError("expected OutputParserException")
+except OutputParserException:
+    pass
+
+# in a chain, like conditional_chain.py
+feedback = RepairingOutputParser(parser=FastPydanticOutputParser(pydantic_object=Feedback), llm=llm)
+chain = RunnableLambda(lambda _: AIMessage(content="{'sentiment': 'Negative',}")) | feedback
+assert chain.invoke({'feedback': 'This worst phone.'}).sentiment == 'Negative'
+print("\nall repair steps ok\n")
+
+
+# --- repair rate and added latency over many outputs --------------------------------------------
+
+def malformed(value):
+    text = json.dumps(value)
+    kind = random.choices(["ok", "fence", "comma", "quotes", "truncated", "invalid"], [70, 10, 5, 5, 5, 5])[0]
+    if kind == "fence":
+        return kind, f"```json\n{text}\n```"
+    if kind == "comma":
+        return kind, text[:-1] + ",}"
+    if kind == "quotes":
+        return kind, text.replace('"', "'")
+    if kind == "truncated":
+        return kind, text[:random.randint(len(text) // 2, len(text) - 2)]
+    if kind == "invalid":
+        return kind, json.dumps({**value, "age": "unknown"})
+    return kind, text
+
+
+parser = RepairingOutputParser(parser=FastPydanticOutputParser(pydantic_object=Person), llm=llm, max_retries=2)
+values = [{"name": random.choice(["Asha", "Ravi"]), "age": random.randint(18, 80), "city": "Kandy"} for _ in range(OUTPUTS)]
+kinds = {}
+for value in values:
+    kind, text = malformed(value)
+    kinds[kind] = kinds.get(kind, 0) + 1
+    parser.parse(text)
+
+stats = parser.stats()
+repaired = stats["local_repairs"] + stats["model_repairs"]
+print(f"{OUTPUTS} outputs, {MODEL_LATENCY * 1000:.0f} ms per model call: {kinds}")
+print(f"parsed first try  {stats['ok']}")
+print(f"repaired locally  {stats['local_repairs']}")
+print(f"repaired by model {stats['model_repairs']} ({stats['extra_calls']} extra calls)")
+print(f"failed            {stats['failed']}")
+print(f"repair rate       {stats['repair_rate']:.1%} of outputs, {stats['repair_success_rate']:.0%} of broken outputs")
+print(f"added latency     {stats['repair_seconds'] / max(repaired, 1) * 1000:.2f} ms per repaired output "
+      f"(re-running the whole chain: >= {MODEL_LATENCY * 1000:.0f} ms each)")
+assert stats["failed"] == 0
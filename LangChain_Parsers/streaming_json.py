@@ -0,0 +1,261 @@
+"""
+Incremental JSON parsing for streamed model output.
+
+JsonOutputParser (and with_structured_output) either wait for the whole response, or, when
+streaming, re-parse the whole buffer after every chunk: O(n^2) for a long response. For the big
+review schema (key_themes, pros, cons, summary) that delays every consumer.
+
+IncrementalJsonParser reads each character once. It keeps a stack of the objects/arrays being
+built and reports a value as soon as it closes:
+
+    parser = IncrementalJsonParser()
+    for chunk in chat_model.stream(prompt):
+        for path, value in parser.feed(chunk.content):
+            print(path, value)        # ('summary',) 'Great phone ...'   ('pros', 0) 'Battery'
+    result = parser.result()          # final parse of the whole text, with orjson
+
+Events are emitted for values up to `emit_depth` levels deep (2 = top-level fields and the items
+of top-level arrays). parser.partial is the object built so far.
+
+IncrementalJsonOutputParser wraps it as a LangChain output parser, so it can end a chain:
+
+    chain = template | chat_model | IncrementalJsonOutputParser()
+    for partial in chain.stream(inputs):   # a new partial object every time a top-level field closes
+        ...
+"""
+import re
+from typing import Optional
+
+from langchain_core.exceptions import OutputParserException
+from langchain_core.messages import BaseMessage
+from langchain_core.output_parsers import BaseTransformOutputParser, JsonOutputParser
+from langchain_core.utils.json import parse_json_markdown
+
+try:
+    import orjson
+
+    def loads(text):
+        return orjson.loads(text)
+except ImportError:  # orjson is optional, the standard library parser gives the same result
+    import json
+
+    def loads(text):
+        return json.loads(text)
+
+STRING_STOP = re.compile(r'["\\]')
+SCALAR_STOP = re.compile(r'[,\]}\s]')
+WHITESPACE = re.compile(r"\s+")
+FENCE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$")
+
+
+def parse_json(text):
+    # orjson on the raw text first; code fences and other wrapping only when that fails
+    try:
+        return loads(FENCE.sub("", text))
+    except ValueError:
+        try:
+            return parse_json_markdown(text)
+        except ValueError as error:
+            raise OutputParserException(f"Invalid json output: {text[:200]}") from error
+
+
+class IncrementalJsonParser:
+
+    def __init__(self, emit_depth=2):
+        self.emit_depth = emit_depth
+        self.chunks = []
+        self.offset = 0  # characters fed before the current chunk
+        self.start = None  # offset of the first '{' or '['
+        self.end = None  # offset just after the closing bracket of the root value
+        self.failed = False
+        self.partial = None
+        # frames of the containers being built: [container, key or index]
+        self.stack = []
+        self.expect_key = False
+        # string or scalar token being read: its kind ('key', 'string', 'scalar') and raw pieces
+        self.token_kind = None
+        self.token = []
+        self.escape = False
+        self.events = []
+
+    @property
+    def done(self):
+        return self.end is not None
+
+    def feed(self, text):
+        self.chunks.append(text)
+        self.events = []
+        if not (self.done or self.failed):
+            try:
+                self._scan(text)
+            except ValueError:
+                # stop streaming events; result() will report the error
+                self.failed = True
+        self.offset += len(text)
+        return self.events
+
+    def _scan(self, text):
+        i, n = 0, len(text)
+        if self.start is None:
+            match = re.search(r"[{\[]", text)
+            if match is None:
+                return
+            i = match.start()
+            self.start = self.offset + i
+
+        while i < n:
+            kind = self.token_kind
+            if kind == "key" or kind == "string":
+                if self.escape:
+                    self.token.append(text[i])
+                    self.escape = False
+                    i += 1
+                    continue
+                match = STRING_STOP.search(text, i)
+                if match is None:
+                    self.token.append(text[i:])
+                    return
+                j = match.start()
+                if text[j] == "\\":
+                    self.token.append(text[i:j + 2])
+                    self.escape = j + 1 == n
+                    i = j + 2
+                    continue
+                self.token.append(text[i:j])
+                i = j + 1
+                self._end_string()
+                continue
+            if kind == "scalar":
+                match = SCALAR_STOP.search(text, i)
+                if match is None:
+                    self.token.append(text[i:])
+                    return
+                self.token.append(text[i:match.start()])
+                i = match.start()
+                self.token_kind = None
+                self._value(loads("".join(self.token)))
+                continue
+
+            char = text[i]
+            if char in " \t\r\n":
+                i = WHITESPACE.match(text, i).end()
+                continue
+            if char == "{":
+                self._open({})
+                self.expect_key = True
+            elif char == "[":
+                self._open([])
+            elif char == "}" or char == "]":
+                container = self.stack.pop()[0]
+                self.expect_key = False
+                if not self.stack:
+                    self.end = self.offset + i + 1
+                    return
+                self._emit(container, len(self.stack))
+            elif char == '"':
+                self.token_kind = "key" if self.expect_key else "string"
+                self.token = []
+            elif char == ",":
+                self.expect_key = isinstance(self.stack[-1][0], dict)
+            elif char == ":":
+                self.expect_key = False
+            else:
+                self.token_kind = "scalar"
+                self.token = [char]
+            i += 1
+
+    def _end_string(self):
+        raw = "".join(self.token)
+        value = loads('"' + raw + '"') if "\\" in raw else raw
+        kind, self.token_kind = self.token_kind, None
+        if kind == "key":
+            self.stack[-1][1] = value
+            self.expect_key = False
+        else:
+            self._value(value)
+
+    def _attach(self, value):
+        frame = self.stack[-1]
+        container = frame[0]
+        if isinstance(container, dict):
+            container[frame[1]] = value
+        else:
+            container.append(value)
+            frame[1] = len(container) - 1
+
+    def _open(self, container):
+        if self.stack:
+            self._attach(container)
+        else:
+            self.partial = container
+        self.stack.append([container, None])
+
+    def _value(self, value):
+        if not self.stack:
+            raise ValueError("JSON value outside an object or array")
+        self._attach(value)
+        self._emit(value, len(self.stack))
+
+    def _emit(self, value, depth):
+        if depth <= self.emit_depth:
+            path = tuple(frame[1] for frame in self.stack[:depth])
+            self.events.append((path, value))
+
+    def result(self):
+        text = "".join(self.chunks)
+        if self.start is not None and self.end is not None and not self.failed:
+            try:
+                return loads(text[self.start:self.end])
+            except ValueError:
+                pass
+        return parse_json(text)
+
+
+def snapshot(value):
+    # copy of the partial object down to its top-level containers, safe to hand out while parsing
+    if isinstance(value, dict):
+        return {k: (v.copy() if isinstance(v, (dict, list)) else v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [v.copy() if isinstance(v, (dict, list)) else v for v in value]
+    return value
+
+
+class IncrementalJsonOutputParser(BaseTransformOutputParser):
+    # Streams a snapshot of the partial object every time a value up to emit_depth closes
+    # (1 = every top-level field), then the final object. With diff=True it streams
+    # (path, value) events instead, ending with ((), final object).
+    pydantic_object: Optional[type] = None
+    emit_depth: int = 1
+    diff: bool = False
+
+    @property
+    def _type(self):
+        return "incremental_json"
+
+    def get_format_instructions(self):
+        return JsonOutputParser(pydantic_object=self.pydantic_object).get_format_instructions()
+
+    def parse(self, text):
+        return parse_json(text)
+
+    def _updates(self, parser, chunk):
+        events = parser.feed(chunk.content if isinstance(chunk, BaseMessage) else chunk)
+        if self.diff:
+            return events
+        return [snapshot(parser.partial)] if events and not parser.done else []
+
+    def _final(self, parser):
+        return ((), parser.result()) if self.diff else parser.result()
+
+    def _transform(self, input):
+        parser = IncrementalJsonParser(self.emit_depth)
+        for chunk in input:
+            yield from self._updates(parser, chunk)
+        yield self._final(parser)
+
+    async def _atransform(self, input):
+        parser = IncrementalJsonParser(self.emit_depth)
+        async for chunk in input:
+            for update in self._updates(parser, chunk):
+                yield update
+        yield self._final(parser)
@@ -1,14 +1,22 @@
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_google_genai import ChatGoogleGenerativeAI, GoogleGenerativeAIEmbeddings
 from langchain_core.prompts import PromptTemplate
 from dotenv import load_dotenv
 import os 
+import sys
+
+# Two-tier (exact + semantic) response cache from ChatModels/
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ChatModels'))
+from semantic_cache import SemanticCache
 
 load_dotenv()
 
 MODEL = os.environ.get("GOOGLE_CHAT_MODEL")
 
-chat_model = ChatGoogleGenerativeAI(model = MODEL)
+# Repeated or near-identical prompts are answered from the cache instead of the model
+llm_cache = SemanticCache(GoogleGenerativeAIEmbeddings(model = os.environ.get("GOOGLE_EMBEDDING_MODEL")), threshold=0.95)
+
+chat_model = ChatGoogleGenerativeAI(model = MODEL, cache = llm_cache)
 
 # 1st prompt -> detailed prompt 
 
@@ -3,9 +3,17 @@ In the structure output parser we can enforce schema so that we can get json for
 """
 from langchain.output_parsers import ResponseSchema, StructuredOutputParser
 from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import RunnableParallel, RunnablePassthrough
 from langchain_google_genai import ChatGoogleGenerativeAI
 from dotenv import load_dotenv
 import os
+import sys
+
+# Compiled prompt templates from LangChain_Prompts/
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'LangChain_Prompts'))
+from compiled_template import compile_prompt
+
+from repairing_parser import RepairingOutputParser
 
 load_dotenv()
 
@@ -25,19 +33,26 @@ schema = [
 # Initialize our parser
 parser = StructuredOutputParser.from_response_schemas(schema)
 
-template = PromptTemplate(
+# compile_prompt writes the format instructions into the template once, instead of on every call
+template = compile_prompt(PromptTemplate(
     template = "Give three fact about {topic} \n {format_instruction}",
     input_variables = ['topic'],
     partial_variables= {'format_instruction':parser.get_format_instructions()}
-)
+))
 
 prompt = template.invoke({'topic':'black hole'})
 
-chain = chat_model | parser 
+# RepairingOutputParser fixes broken JSON locally and asks the model again only for the missing facts
+repairing_parser = RepairingOutputParser(parser = parser, llm = chat_model, max_retries = 2)
+
+# the prompt goes to the parser too, so a re-generation request includes the topic
+chain = RunnableParallel(completion = chat_model, prompt_value = RunnablePassthrough()) | repairing_parser
 
 result = chain.invoke(prompt)
 
 print(result)
 
+print(repairing_parser.stats())
+
 
 
@@ -3,9 +3,16 @@ from dotenv import load_dotenv
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from langchain_core.prompts import PromptTemplate
 import os 
+import sys
 
 import streamlit as st 
 
+# Streaming helpers from ChatModels/
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ChatModels'))
+from streaming import StreamMetrics
+
+from conversation_memory import SummaryBufferMemory
+
 load_dotenv()
 
 MODEL = os.environ.get("GOOGLE_CHAT_MODEL")
@@ -13,20 +20,32 @@ MODEL = os.environ.get("GOOGLE_CHAT_MODEL")
 chat_model = ChatGoogleGenerativeAI(
     model = MODEL,
 )
-# LLM Memory in the form of a list of messages
-chat_history = [SystemMessage(content = "You are a helpful assistant that can answer questions and help with tasks.")]
+# LLM Memory: system message + rolling summary of old turns + recent turns, kept under 2000 tokens.
+# (A plain list of every message grows each turn until it breaks the context limit.)
+memory = SummaryBufferMemory(
+    summarizer = chat_model,
+    system_message = SystemMessage(content = "You are a helpful assistant that can answer questions and help with tasks."),
+    max_tokens = 2000
+)
 
 while True: 
     user_input = input('You: ')
-    chat_history.append(HumanMessage(content = user_input))
 
     if user_input == 'exits':
         break
-    result = chat_model.invoke(chat_history)
-    
-    chat_history.append(AIMessage(content = result.content))
+    memory.add(HumanMessage(content = user_input))
+    chat_history = memory.messages()
+
+    # Stream the answer to the terminal as it is generated
+    print("AI : ", end="", flush=True)
+    metrics = StreamMetrics()
+    answer = ""
+    for chunk in metrics.wrap(chat_model.stream(chat_history)):
+        print(chunk.content, end="", flush=True)
+        answer += chunk.content
+    print(f"\n[{metrics.summary()}]")
 
-    print("AI : ",result.content)
+    memory.add(AIMessage(content = answer))
 
-print(chat_history)
+print(memory.messages())
 
@@ -0,0 +1,80 @@
+"""
+Compiled prompt templates.
+
+PromptTemplate.format merges the partial variables and runs the f-string formatter over the
+whole template on every call. For templates with big static partials (for example
+parser.get_format_instructions()) that is the same work again and again.
+
+compile_prompt parses the template once into literal and slot segments, writes the partial
+variables into the literals at build time, and then renders by joining the segments.
+The result is still a PromptTemplate, so it works unchanged in chains:
+
+    template = compile_prompt(PromptTemplate(
+        template="Classify ... {feedback} \n {format_instructions}",
+        input_variables=['feedback'],
+        partial_variables={'format_instructions': parser1.get_format_instructions()}
+    ))
+    chain = template | chat_model | parser1
+
+Only f-string templates with plain {name} slots are compiled; anything else ({x!r}, {x:>10},
+{a.b}, jinja2, mustache) falls back to the normal PromptTemplate.format.
+"""
+from string import Formatter
+
+from langchain_core.prompts import PromptTemplate
+from pydantic import PrivateAttr
+
+
+def parse_segments(template, frozen):
+    # -> list of (is_slot, text); slots hold the variable name, frozen values become literals
+    segments = []
+    for literal, field, spec, conversion in Formatter().parse(template):
+        if literal:
+            segments.append((False, literal))
+        if field is None:
+            continue
+        if spec or conversion or not field.isidentifier():
+            return None
+        if field in frozen:
+            segments.append((False, str(frozen[field])))
+        else:
+            segments.append((True, field))
+
+    # merge neighbouring literals so rendering joins as few pieces as possible
+    merged = []
+    for is_slot, text in segments:
+        if merged and not is_slot and not merged[-1][0]:
+            merged[-1] = (False, merged[-1][1] + text)
+        else:
+            merged.append((is_slot, text))
+    return merged
+
+
+class CompiledPromptTemplate(PromptTemplate):
+    _segments: list = PrivateAttr(default=None)
+
+    def compile(self):
+        if self.template_format == "f-string":
+            # partial variables are frozen here (callables are called once, at build time)
+            frozen = {k: v() if callable(v) else v for k, v in self.partial_variables.items()}
+            self._segments = parse_segments(self.template, frozen)
+        return self
+
+    def format(self, **kwargs):
+        # pydantic resolves self._segments through __getattr__, which costs more than the render itself
+        segments = self.__pydantic_private__["_segments"]
+        if segments is None:
+            return super().format(**kwargs)
+        try:
+            return "".join(format(kwargs[text]) if is_slot else text for is_slot, text in segments)
+        except KeyError as error:
+            raise KeyError(f"Missing prompt variable {error}. Expected: {self.input_variables}") from None
+
+
+def compile_prompt(template):
+    return CompiledPromptTemplate(
+        template=template.template,
+        input_variables=template.input_variables,
+        partial_variables=template.partial_variables,
+        template_format=template.template_format,
+    ).compile()
@@ -0,0 +1,83 @@
+# Renders per second: PromptTemplate vs compile_prompt, for the prompt_ui.py and conditional_chain.py templates.
+import time
+from typing import Literal
+
+from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.prompts import PromptTemplate
+from pydantic import BaseModel, Field
+
+from compiled_template import compile_prompt
+
+SECONDS = 1.0
+
+
+# same template as prompt_ui.py
+prompt_ui_template = PromptTemplate(
+    template=
+    """
+    Please summarize the research paper titled "{paper_input}" with the following specifications:
+    Explanation Style: {style_input}
+    Explanation length: {length_input}
+
+    Mathematical Details:
+
+    Include relevant mathematical equations if present in the paper.
+
+    Explain the mathematical concepts using simple, intuitive code snippets where applicable.
+
+    Analogies:
+
+    Use relatable analogies to simplify complex ideas.
+
+    If certain information is not available in the paper, respond with: "Insufficient information available" instead of guessing.
+    Ensure the summary is clear, accurate, and aligned with the provided style and length.
+    """
+)
+prompt_ui_input = {
+    'paper_input': 'Attention Is All You Need',
+    'style_input': 'Technical',
+    'length_input': 'Medium (3-5 paragraphs)',
+}
+
+
+# same template as conditional_chain.py (prompt1)
+class Feedback(BaseModel):
+    sentiment: Literal['Positive', 'Negative'] = Field(description="Give the sentiment of the feedback.")
+
+
+parser1 = PydanticOutputParser(pydantic_object=Feedback)
+conditional_template = PromptTemplate(
+    template="Classify the sentiment of the given feedback into either positive or negative \n feedback : {feedback} \n {format_instructions}",
+    input_variables=['feedback'],
+    partial_variables={'format_instructions': parser1.get_format_instructions()}
+)
+conditional_input = {'feedback': 'This worst phone.'}
+
+
+def rate(fn):
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < SECONDS:
+        for _ in range(100):
+            fn()
+        count += 100
+    return count / (time.perf_counter() - start)
+
+
+print(f"{'template':<20} {'method':<8} {'original/s':>12} {'compiled/s':>12} {'speedup':>8}")
+for name, template, inputs in [
+    ("prompt_ui", prompt_ui_template, prompt_ui_input),
+    ("conditional_chain", conditional_template, conditional_input),
+]:
+    compiled = compile_prompt(template)
+    assert compiled.format(**inputs) == template.format(**inputs)
+    assert compiled.invoke(inputs).to_string() == template.invoke(inputs).to_string()
+
+    for method in ("format", "invoke"):
+        if method == "format":
+            original_rate = rate(lambda: template.format(**inputs))
+            compiled_rate = rate(lambda: compiled.format(**inputs))
+        else:
+            original_rate = rate(lambda: template.invoke(inputs))
+            compiled_rate = rate(lambda: compiled.invoke(inputs))
+        print(f"{name:<20} {method:<8} {original_rate:>12,.0f} {compiled_rate:>12,.0f} {compiled_rate / original_rate:>7.1f}x")
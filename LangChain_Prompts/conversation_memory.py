@@ -0,0 +1,131 @@
+"""
+Token-bounded conversation memory with a rolling summary.
+
+chatbot.py used to resend the whole chat_history on every turn, so the prompt grew with every
+message until it hit the context limit. SummaryBufferMemory keeps:
+
+    [system message] + [summary of older turns] + [most recent turns]
+
+and makes sure the total stays under max_tokens. When the recent window gets too big, the oldest
+turns are folded into the summary. The summary is updated incrementally: the model only sees the
+previous summary plus the turns being folded, never the whole conversation again.
+
+If the summary itself outgrows the budget (nothing left to fold), it is cut to the tokens that are
+left; the newest message is always kept, even when it alone is over max_tokens.
+"""
+from functools import lru_cache
+
+from langchain_core.messages import SystemMessage
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import PromptTemplate
+
+SUMMARY_PROMPT = PromptTemplate.from_template(
+    "Progressively summarize the conversation, adding onto the previous summary and returning a new summary. "
+    "Keep names, facts and open questions.\n\n"
+    "Current summary:\n{summary}\n\n"
+    "New lines of conversation:\n{new_lines}\n\n"
+    "New summary:"
+)
+
+
+@lru_cache(maxsize=1)
+def get_encoding():
+    # Loaded once per process and shared; falls back to ~4 characters per token without tiktoken.
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def count_tokens(text):
+    encoding = get_encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text))
+
+
+def truncate_tokens(text, max_tokens):
+    # the first max_tokens tokens of text
+    encoding = get_encoding()
+    if encoding is None:
+        return text[:max(0, max_tokens - 1) * 4]
+    return encoding.decode(encoding.encode(text)[:max_tokens])
+
+
+def message_tokens(message):
+    # +4 for the role and message separators every chat format adds
+    return count_tokens(f"{message.type}: {message.content}") + 4
+
+
+class SummaryBufferMemory:
+
+    def __init__(self, summarizer, system_message, max_tokens=2000, fold_tokens=500):
+        self.summary_chain = SUMMARY_PROMPT | summarizer | StrOutputParser()
+        self.system_message = system_message
+        self.max_tokens = max_tokens
+        # fold at least this many tokens at once, so we don't summarize on every single turn
+        self.fold_tokens = fold_tokens
+        self.summary = ""
+        self.summary_message = None
+        self.summary_tokens = 0
+        self.recent = []  # (message, tokens)
+        self.recent_tokens = 0
+        self.summary_calls = 0
+
+    def add(self, message):
+        tokens = message_tokens(message)
+        self.recent.append((message, tokens))
+        self.recent_tokens += tokens
+        # every fold can make the summary longer, so check the budget again after each one
+        while self.total_tokens() > self.max_tokens and len(self.recent) > 1:
+            self._fold()
+        if self.total_tokens() > self.max_tokens:
+            self._shrink_summary()
+
+    def total_tokens(self):
+        return message_tokens(self.system_message) + self.summary_tokens + self.recent_tokens
+
+    def _fold(self):
+        folded = []
+        folded_tokens = 0
+        target = max(self.fold_tokens, self.total_tokens() - self.max_tokens)
+        # keep at least the newest message in the window
+        while len(self.recent) > 1 and folded_tokens < target:
+            message, tokens = self.recent.pop(0)
+            folded.append(message)
+            folded_tokens += tokens
+        self.recent_tokens -= folded_tokens
+
+        new_lines = "\n".join(f"{m.type}: {m.content}" for m in folded)
+        self.summary = self.summary_chain.invoke({"summary": self.summary or "(empty)", "new_lines": new_lines})
+        self._set_summary(self.summary)
+        self.summary_calls += 1
+
+    def _set_summary(self, summary):
+        self.summary = summary
+        self.summary_message = SystemMessage(content=f"Summary of the earlier conversation: {summary}")
+        self.summary_tokens = message_tokens(self.summary_message)
+
+    def _shrink_summary(self):
+        # only the newest message is left in the window: cut the summary to the tokens that are left,
+        # or drop it when there are none
+        if self.summary_message is None:
+            return
+        budget = self.max_tokens - message_tokens(self.system_message) - self.recent_tokens
+        overhead = message_tokens(SystemMessage(content="Summary of the earlier conversation: "))
+        if budget <= overhead:
+            self.summary, self.summary_message, self.summary_tokens = "", None, 0
+            return
+        self._set_summary(truncate_tokens(self.summary, budget - overhead))
+        while self.summary and self.summary_tokens > budget:
+            # tokens can merge differently at the new edge
+            self._set_summary(truncate_tokens(self.summary, count_tokens(self.summary) - 1))
+
+    def messages(self):
+        messages = [self.system_message]
+        if self.summary_message:
+            messages.append(self.summary_message)
+        messages.extend(message for message, _ in self.recent)
+        return messages
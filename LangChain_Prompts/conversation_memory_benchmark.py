@@ -0,0 +1,62 @@
+# 200-turn scripted chat with a fake model: prompt tokens and latency per turn, full history vs SummaryBufferMemory.
+import time
+
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from conversation_memory import SummaryBufferMemory, count_tokens, message_tokens
+
+TURNS = 200
+# simulated prefill cost of the fake model
+SECONDS_PER_1K_PROMPT_TOKENS = 0.002
+
+
+# Fake model whose latency grows with the prompt size, like a real one.
+class FakeChatModel(FakeListChatModel):
+
+    def _call(self, messages, *args, **kwargs):
+        time.sleep(sum(message_tokens(m) for m in messages) / 1000 * SECONDS_PER_1K_PROMPT_TOKENS)
+        return super()._call(messages, *args, **kwargs)
+
+
+answers = [f"Here is a detailed answer number {i} about anime, cricket and space travel. " * 3 for i in range(7)]
+questions = [f"Question {i}: tell me more about topic {i % 13} and how it relates to the previous answer?" for i in range(TURNS)]
+system = SystemMessage(content="You are a helpful assistant that can answer questions and help with tasks.")
+
+
+def run(label, use_memory):
+    chat_model = FakeChatModel(responses=answers)
+    summarizer = FakeChatModel(responses=["The user asked many questions about anime, cricket and space; "
+                                          "the assistant answered each one in detail."])
+    memory = SummaryBufferMemory(summarizer, system, max_tokens=1500, fold_tokens=400)
+    chat_history = [system]
+
+    rows = []
+    start = time.perf_counter()
+    for turn, question in enumerate(questions, start=1):
+        turn_start = time.perf_counter()
+        if use_memory:
+            memory.add(HumanMessage(content=question))
+            prompt = memory.messages()
+        else:
+            chat_history.append(HumanMessage(content=question))
+            prompt = chat_history
+        prompt_tokens = sum(message_tokens(m) for m in prompt)
+        result = chat_model.invoke(prompt)
+        if use_memory:
+            memory.add(AIMessage(content=result.content))
+        else:
+            chat_history.append(AIMessage(content=result.content))
+        rows.append((turn, prompt_tokens, (time.perf_counter() - turn_start) * 1000))
+    total = time.perf_counter() - start
+
+    print(f"\n{label}: total {total:.2f} s" + (f", summary calls {memory.summary_calls}" if use_memory else ""))
+    print(f"{'turn':>6} {'prompt tokens':>14} {'latency ms':>11}")
+    for turn, tokens, ms in rows:
+        if turn in (1, 10, 50, 100, 150, 200):
+            print(f"{turn:>6} {tokens:>14} {ms:>11.2f}")
+
+
+run("Full history (old chatbot.py)", use_memory=False)
+run("SummaryBufferMemory", use_memory=True)
+print("\nTokenizer cache:", count_tokens.cache_info())
@@ -3,18 +3,40 @@ from dotenv import load_dotenv
 from langchain_core.prompts import PromptTemplate
 
 import os 
+import sys
 
 import streamlit as st
 
+# Response cache and streaming helpers from ChatModels/
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ChatModels'))
+from semantic_cache import SemanticCache
+from streaming import StreamMetrics, cached_stream
+from single_flight import SingleFlight
+from compiled_template import compile_prompt
+
 load_dotenv()
 
 # GOOGLE_CHAT_MODEL = "gemini-1.5-flash"
 MODEL = os.environ.get("GOOGLE_CHAT_MODEL")
 
 
+# Streamlit re-runs this script on every click, so create the cache once and share it.
+# The dropdowns repeat the same paper/style/length combinations, so the exact tier is enough here:
+# prompts that differ only in "Short" vs "Long" are semantically close but need different answers.
+@st.cache_resource
+def get_llm_cache():
+    return SemanticCache(embeddings = None, ttl = 24 * 3600)
+
+# Users who press "Summrize" for the same paper/style/length at the same moment share one model call
+# (the cache only helps once the first answer is finished).
+@st.cache_resource
+def get_single_flight():
+    return SingleFlight()
+
 # Initialize the Gemini chat model
 chat_model = ChatGoogleGenerativeAI(
     model= MODEL,
+    cache = get_llm_cache()
 )
 
 # Heading for streamlit website
@@ -30,7 +52,8 @@ length_input = st.selectbox("Select Explanation Length", ["Short (1-2 paragraphs
 # user_input = st.text_input("Enter your prompt : ")
 
 # Now let's use langchain prompt template 
-template = PromptTemplate(
+# compile_prompt parses the template once into segments, so rendering only joins strings
+template = compile_prompt(PromptTemplate(
     template = 
     """
     Please summarize the research paper titled "{paper_input}" with the following specifications:
@@ -51,7 +74,7 @@ template = PromptTemplate(
     Ensure the summary is clear, accurate, and aligned with the provided style and length.
     """,
     input_varibales = ['paper_input','style_input','length_input']
-)
+))
 
 # prompt = template.invoke({
 #         'paper_input':paper_input,
@@ -66,12 +89,20 @@ if st.button('Summrize'):
     # result = chat_model.invoke(prompt)
 
     # Try to use chain for same task
-    chain = template | chat_model
-    result = chain.invoke({       
+    # chain = template | chat_model
+    # result = chain.invoke({...})
+    # st.write(result.content)
+
+    # Stream the summary token by token instead of showing a blank screen until it is complete.
+    # cached_stream still answers repeated paper/style/length combinations from the cache.
+    prompt = template.invoke({       
         'paper_input':paper_input,
         'style_input':style_input,
         'length_input':length_input   
     })
-    st.write(result.content)
+    metrics = StreamMetrics()
+    chunks = get_single_flight().stream(prompt.to_string(), lambda: cached_stream(chat_model, prompt))
+    st.write_stream(metrics.wrap(chunks))
+    st.caption(metrics.summary())
 
 
@@ -0,0 +1,146 @@
+"""
+Async fan-out for RunnableParallel pipelines, with concurrency limits and sibling cancellation.
+
+runnable_parallel.py (tweet + linkedin) and parallel_chains.py (notes + quiz -> merge) call
+chain.invoke, so RunnableParallel starts a new thread pool for every request. With hundreds of
+requests at once that is hundreds of threads, and a failing branch still waits for its siblings.
+
+This module gives those pipelines an asyncio path:
+
+    AsyncParallel   like RunnableParallel, but ainvoke runs every branch with branch.ainvoke as
+                    tasks on the event loop. If one branch fails, or the deadline passes, the other
+                    branches are cancelled right away and the error is raised.
+    limit_model     wraps a chat model so that at most `max_connections` calls to that model are in
+                    flight, and at most PROCESS_LIMIT calls to any limited model in the process.
+
+    parallel_chain = AsyncParallel({
+        'tweet': prompt1 | limit_model(chat_model, 8) | parser,
+        'linkedin': prompt2 | limit_model(chat_model, 8) | parser,
+    }, timeout=30)
+    result = await parallel_chain.ainvoke({'topic': 'AI'})
+
+Both are normal Runnables, so `|` composition, invoke() and batch() keep working.
+"""
+import asyncio
+import os
+import threading
+import weakref
+
+from langchain_core.runnables import Runnable, RunnableParallel
+from langchain_core.runnables.config import ensure_config, get_async_callback_manager_for_config, patch_config
+
+
+class ConnectionLimit:
+    # Caps in-flight calls. Sync callers share a thread semaphore; async callers share one asyncio
+    # semaphore per event loop (asyncio semaphores can't be shared across loops).
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.thread_semaphore = threading.BoundedSemaphore(limit)
+        self.loop_semaphores = weakref.WeakKeyDictionary()
+        self.lock = threading.Lock()
+
+    def async_semaphore(self):
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            semaphore = self.loop_semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self.loop_semaphores[loop] = asyncio.Semaphore(self.limit)
+        return semaphore
+
+
+# process-wide cap on concurrent model calls through limit_model
+PROCESS_LIMIT = ConnectionLimit(int(os.environ.get("MAX_MODEL_CONCURRENCY", 64)))
+
+
+class LimitedModel(Runnable):
+
+    def __init__(self, model, max_connections, process_limit=PROCESS_LIMIT):
+        self.model = model
+        self.connections = ConnectionLimit(max_connections)
+        self.process_limit = process_limit
+        self.name = f"Limited{model.get_name()}"
+
+    @property
+    def InputType(self):
+        return self.model.InputType
+
+    @property
+    def OutputType(self):
+        return self.model.OutputType
+
+    # the model's own slot first: a call queued behind a saturated model must not hold a process-wide
+    # slot while it waits, or calls to the other models starve behind it
+    def invoke(self, input, config=None, **kwargs):
+        with self.connections.thread_semaphore, self.process_limit.thread_semaphore:
+            return self.model.invoke(input, config, **kwargs)
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        async with self.connections.async_semaphore(), self.process_limit.async_semaphore():
+            return await self.model.ainvoke(input, config, **kwargs)
+
+
+def limit_model(model, max_connections, process_limit=PROCESS_LIMIT):
+    return LimitedModel(model, max_connections, process_limit)
+
+
+class AsyncParallel(Runnable):
+
+    def __init__(self, steps, timeout=None):
+        # reuse RunnableParallel to coerce lambdas/dicts into runnables and for the graph/schemas
+        self.parallel = RunnableParallel(steps)
+        self.steps = self.parallel.steps__
+        self.timeout = timeout
+        self.name = "AsyncParallel"
+
+    @property
+    def InputType(self):
+        return self.parallel.InputType
+
+    @property
+    def OutputType(self):
+        return self.parallel.OutputType
+
+    def get_graph(self, config=None):
+        return self.parallel.get_graph(config)
+
+    def invoke(self, input, config=None, **kwargs):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.ainvoke(input, config, **kwargs))
+        # already inside an event loop (e.g. a notebook): fall back to RunnableParallel's threads
+        return self.parallel.invoke(input, config, **kwargs)
+
+    async def ainvoke(self, input, config=None, **kwargs):
+        # one run for the parallel node, with the branches as child runs (like RunnableParallel)
+        config = ensure_config(config)
+        callback_manager = get_async_callback_manager_for_config(config)
+        run_manager = await callback_manager.on_chain_start(
+            None, input, name=config.get("run_name") or self.get_name(), run_id=config.pop("run_id", None))
+        tasks = {
+            asyncio.create_task(step.ainvoke(
+                input, patch_config(config, callbacks=run_manager.get_child(f"map:key:{key}")), **kwargs)): key
+            for key, step in self.steps.items()
+        }
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=self.timeout, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+            if pending:
+                names = ", ".join(sorted(tasks[task] for task in pending))
+                raise TimeoutError(f"AsyncParallel branches did not finish within {self.timeout} s: {names}")
+            output = {key: task.result() for task, key in tasks.items()}
+        except BaseException as error:
+            await run_manager.on_chain_error(error)
+            raise
+        finally:
+            # cancel siblings on error, deadline or when the caller itself is cancelled, and wait for
+            # them so no task is left pending ("Task was destroyed but it is pending")
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        await run_manager.on_chain_end(output)
+        return output
+
@@ -0,0 +1,164 @@
+# 500 concurrent requests through the parallel_chains.py pipeline (notes + quiz -> merge) on a fake model:
+# end-to-end latency and peak thread count, thread-based invoke vs AsyncParallel with connection limits.
+import asyncio
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import RunnableParallel
+
+from async_parallel import AsyncParallel, ConnectionLimit, limit_model
+
+REQUESTS = 500
+LATENCY = 0.2             # seconds per model call
+MAX_CONNECTIONS = 100     # per model
+PROCESS_CONNECTIONS = 150  # all models together
+
+
+# Fake chat model with configurable latency; counts started and finished calls.
+class SlowChatModel(BaseChatModel):
+    latency: float = LATENCY
+    fail: bool = False
+    started: int = 0
+    finished: int = 0
+
+    @property
+    def _llm_type(self):
+        return "slow-fake"
+
+    def _result(self, messages):
+        self.finished += 1
+        if self.fail:
+            raise RuntimeError("model unavailable")
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=f"answer to {len(messages[0].content)} chars"))])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.started += 1
+        time.sleep(self.latency)
+        return self._result(messages)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.started += 1
+        await asyncio.sleep(self.latency)
+        return self._result(messages)
+
+
+prompt1 = PromptTemplate.from_template("Generate short and simple notes from the following text : {text}")
+prompt2 = PromptTemplate.from_template("Generate five short questions and answer from the following text : {text} ")
+prompt3 = PromptTemplate.from_template("Merge the provided notes and quiz into a single document \n notes -> {notes} and quiz -> {quiz}")
+parser = StrOutputParser()
+
+
+def build(async_parallel, chat_model_1, chat_model_2, timeout=None,
+          max_connections=MAX_CONNECTIONS, process_connections=PROCESS_CONNECTIONS):
+    if async_parallel:
+        process_limit = ConnectionLimit(process_connections)
+        chat_model_1 = limit_model(chat_model_1, max_connections, process_limit)
+        chat_model_2 = limit_model(chat_model_2, max_connections, process_limit)
+        parallel_chain = AsyncParallel({
+            'notes': prompt1 | chat_model_1 | parser,
+            'quiz': prompt2 | chat_model_2 | parser,
+        }, timeout=timeout)
+    else:
+        parallel_chain = RunnableParallel({
+            'notes': prompt1 | chat_model_1 | parser,
+            'quiz': prompt2 | chat_model_2 | parser,
+        })
+    return parallel_chain | prompt3 | chat_model_1 | parser
+
+
+class ThreadMonitor:
+
+    def __init__(self):
+        self.peak = threading.active_count()
+        self.running = True
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+        self.thread.start()
+
+    def sample(self):
+        while self.running:
+            self.peak = max(self.peak, threading.active_count())
+            time.sleep(0.005)
+
+    def stop(self):
+        self.running = False
+        self.thread.join()
+        return self.peak
+
+
+def report(label, wall, latencies, peak_threads):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<34} {wall:>7.2f} {statistics.median(latencies):>8.2f} {p95:>8.2f} {peak_threads:>8}")
+
+
+def timed_invoke(chain, text):
+    start = time.perf_counter()
+    chain.invoke({'text': text})
+    return time.perf_counter() - start
+
+
+async def timed_ainvoke(chain, text):
+    start = time.perf_counter()
+    await chain.ainvoke({'text': text})
+    return time.perf_counter() - start
+
+
+texts = [f"Linear regression text number {i}. " * 20 for i in range(REQUESTS)]
+print(f"{REQUESTS} concurrent requests, {LATENCY * 1000:.0f} ms per model call, 3 calls per request\n")
+print(f"{'mode':<34} {'wall s':>7} {'p50 s':>8} {'p95 s':>8} {'threads':>8}")
+
+# 1. current scripts: chain.invoke from one thread per request, RunnableParallel thread pools inside
+chain = build(False, SlowChatModel(), SlowChatModel())
+monitor = ThreadMonitor()
+start = time.perf_counter()
+with ThreadPoolExecutor(max_workers=REQUESTS) as pool:
+    latencies = list(pool.map(lambda text: timed_invoke(chain, text), texts))
+report("invoke + RunnableParallel threads", time.perf_counter() - start, latencies, monitor.stop())
+
+
+async def run_async(chain):
+    monitor = ThreadMonitor()
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(timed_ainvoke(chain, text) for text in texts))
+    return time.perf_counter() - start, latencies, monitor.stop()
+
+
+# 2. ainvoke with AsyncParallel, limits high enough to never block (same load on the provider as 1.)
+chain = build(True, SlowChatModel(), SlowChatModel(), max_connections=REQUESTS * 2, process_connections=REQUESTS * 2)
+report("ainvoke + AsyncParallel", *asyncio.run(run_async(chain)))
+
+# 3. ainvoke with AsyncParallel and connection limits: fewer open connections, requests queue instead
+chain = build(True, SlowChatModel(), SlowChatModel())
+report(f"  + limits ({MAX_CONNECTIONS}/model, {PROCESS_CONNECTIONS} total)", *asyncio.run(run_async(chain)))
+print("(thread counts include the main thread and the sampling thread)")
+
+
+# 4. one branch fails: the sibling branch is cancelled instead of running to the end
+async def failing():
+    notes_model = SlowChatModel(latency=2.0)
+    quiz_model = SlowChatModel(latency=0.05, fail=True)
+    chain = build(True, notes_model, quiz_model)
+    start = time.perf_counter()
+    try:
+        await chain.ainvoke({'text': texts[0]})
+    except RuntimeError as error:
+        print(f"\nquiz branch failed ({error}) after {time.perf_counter() - start:.2f} s; "
+              f"notes branch (2.00 s) started {notes_model.started}, finished {notes_model.finished}")
+
+    # 5. deadline
+    chain = build(True, SlowChatModel(latency=2.0), SlowChatModel(latency=0.05), timeout=0.5)
+    start = time.perf_counter()
+    try:
+        await chain.ainvoke({'text': texts[0]})
+    except TimeoutError as error:
+        print(f"deadline hit after {time.perf_counter() - start:.2f} s: {error}")
+
+
+asyncio.run(failing())
@@ -0,0 +1,103 @@
+"""
+Batch runner for classifier + RunnableBranch pipelines.
+
+runnable_branch.py and conditional_chain.py build
+
+    chain = RunnablePassthrough.assign(sentiment = classifier_chain) | branch_chain
+
+and score one feedback per chain.invoke. chain.batch helps, but RunnableBranch.batch still sends
+every item through its arm one at a time. BranchBatchRunner runs the same two chains in groups:
+
+    1. classify : classifier_chain.batch(group, max_concurrency=...)
+    2. route    : every item is checked against the branch conditions, in order, like RunnableBranch
+    3. respond  : each arm gets ONE arm.batch(items) call with all of its items in the group
+
+A RunnableSequence (prompt | chat_model | parser) passes the whole list to chat_model.batch,
+so a provider with a batch endpoint gets one request per arm per group; other models fall back to
+LangChain's thread pool, limited by max_concurrency. Results come back in input order.
+
+    runner = BranchBatchRunner(classifier_chain, branch_chain, key='sentiment')
+    responses = runner.run([{'feedback': review} for review in reviews])
+    print(runner.summary())
+"""
+import time
+from contextlib import contextmanager
+
+from langchain_core.runnables import RunnableLambda
+
+
+class BranchBatchRunner:
+
+    def __init__(self, classifier_chain, branch_chain, key="sentiment", group_size=256, max_concurrency=8,
+                 return_exceptions=False):
+        self.classifier_chain = classifier_chain
+        # RunnableBranch keeps its arms as [(condition, runnable), ...] plus a default runnable
+        self.branches = list(branch_chain.branches)
+        # conditions are usually plain lambdas; calling them directly skips the per-item callback setup
+        self.conditions = []
+        for condition, _ in self.branches:
+            func = getattr(condition, "func", None) if isinstance(condition, RunnableLambda) else None
+            self.conditions.append(func or condition.invoke)
+        self.default = branch_chain.default
+        self.key = key
+        self.group_size = group_size
+        self.config = {"max_concurrency": max_concurrency}
+        self.return_exceptions = return_exceptions
+        self.stages = {"classify": [0, 0.0], "route": [0, 0.0], "respond": [0, 0.0]}
+
+    def run(self, inputs):
+        inputs = list(inputs)
+        results = [None] * len(inputs)
+        for start in range(0, len(inputs), self.group_size):
+            group = inputs[start:start + self.group_size]
+            for offset, result in enumerate(self._run_group(group)):
+                results[start + offset] = result
+        return results
+
+    def _run_group(self, group):
+        results = [None] * len(group)
+
+        with self._stage("classify", len(group)):
+            labels = self.classifier_chain.batch(group, self.config, return_exceptions=self.return_exceptions)
+
+        with self._stage("route", len(group)):
+            # arm index -> positions in the group; len(self.branches) is the default arm
+            routes = {}
+            for position, (item, label) in enumerate(zip(group, labels)):
+                if isinstance(label, Exception):
+                    results[position] = label
+                    continue
+                item = {**item, self.key: label}
+                routes.setdefault(self._route(item), []).append((position, item))
+
+        with self._stage("respond", sum(len(routed) for routed in routes.values())):
+            for arm, routed in routes.items():
+                runnable = self.default if arm == len(self.branches) else self.branches[arm][1]
+                outputs = runnable.batch([item for _, item in routed], self.config,
+                                         return_exceptions=self.return_exceptions)
+                for (position, _), output in zip(routed, outputs):
+                    results[position] = output
+        return results
+
+    def _route(self, item):
+        for arm, condition in enumerate(self.conditions):
+            if condition(item):
+                return arm
+        return len(self.branches)
+
+    @contextmanager
+    def _stage(self, name, items):
+        start = time.perf_counter()
+        yield
+        self.stages[name][0] += items
+        self.stages[name][1] += time.perf_counter() - start
+
+    def throughput(self):
+        # items/sec per stage
+        return {name: (items / seconds if seconds else 0.0) for name, (items, seconds) in self.stages.items()}
+
+    def summary(self):
+        rates = self.throughput()
+        return ", ".join(f"{name}: {items} items in {seconds:.2f} s ({rates[name]:,.0f}/s)"
+                         for name, (items, seconds) in self.stages.items())
+
@@ -0,0 +1,128 @@
+# 10k synthetic reviews through the conditional_chain.py pipeline on a fake model with simulated latency:
+# invoke per review vs chain.batch vs BranchBatchRunner (with and without a batch-capable provider).
+import random
+import time
+from typing import Literal
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.output_parsers import PydanticOutputParser, StrOutputParser
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import RunnableBranch, RunnableLambda, RunnablePassthrough
+from pydantic import BaseModel, Field
+
+from branch_batch_runner import BranchBatchRunner
+
+REVIEWS = 10_000
+LATENCY = 0.01           # seconds per model request
+BATCH_ITEM_LATENCY = 0.0002  # extra seconds per item in a batched request
+MAX_CONCURRENCY = 16
+INVOKE_SAMPLE = 200      # invoke-per-review is timed on a sample and extrapolated
+
+
+class Feedback(BaseModel):
+    sentiment: Literal['Positive', 'Negative'] = Field(description="Give the sentiment of the feedback.")
+
+
+# Fake chat model: classifies by keyword, answers support replies, sleeps LATENCY per request.
+class FakeReviewModel(BaseChatModel):
+    requests: int = 0
+
+    @property
+    def _llm_type(self):
+        return "fake-review-model"
+
+    def reply(self, prompt):
+        if prompt.startswith("Classify"):
+            feedback = prompt.split("feedback :", 1)[1].split("\n", 1)[0]
+            negative = any(word in feedback for word in ("worst", "broken", "bad"))
+            return '{"sentiment": "%s"}' % ("Negative" if negative else "Positive")
+        return "Thank you for your feedback, we are looking into it."
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.requests += 1
+        time.sleep(LATENCY)
+        prompt = "\n".join(str(m.content) for m in messages)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.reply(prompt)))])
+
+
+# Same model behind a provider batch endpoint: one request for the whole list.
+class FakeBatchReviewModel(FakeReviewModel):
+
+    def batch(self, inputs, config=None, *, return_exceptions=False, **kwargs):
+        self.requests += 1
+        time.sleep(LATENCY + BATCH_ITEM_LATENCY * len(inputs))
+        return [AIMessage(content=self.reply(self._convert_input(i).to_string())) for i in inputs]
+
+
+def build(chat_model):
+    # the chains from conditional_chain.py
+    parser1 = PydanticOutputParser(pydantic_object=Feedback)
+    prompt1 = PromptTemplate(
+        template="Classify the sentiment of the given feedback into either positive or negative \n feedback : {feedback} \n {format_instructions}",
+        input_variables=['feedback'],
+        partial_variables={'format_instructions': parser1.get_format_instructions()}
+    )
+    prompt2 = PromptTemplate.from_template("You are a customer support agent. Reply to the following positive customer feedback. \n\nCustomer Feedback: {feedback}\n\nYour Response:")
+    prompt3 = PromptTemplate.from_template("You are a customer support agent. Apologize for the following negative customer feedback. \n\nCustomer Feedback: {feedback}\n\nYour Response:")
+    parser2 = StrOutputParser()
+
+    classifier_chain = prompt1 | chat_model | parser1
+    branch_chain = RunnableBranch(
+        (lambda x: x['sentiment'].sentiment == 'Positive', prompt2 | chat_model | parser2),
+        (lambda x: x['sentiment'].sentiment == 'Negative', prompt3 | chat_model | parser2),
+        RunnableLambda(lambda x: "Could not find sentiment.")
+    )
+    chain = RunnablePassthrough.assign(sentiment=classifier_chain) | branch_chain
+    return classifier_chain, branch_chain, chain
+
+
+random.seed(0)
+words = ["great", "battery", "camera", "worst", "screen", "broken", "love", "fast", "bad", "delivery", "price"]
+reviews = [{'feedback': f"Review {i}: " + " ".join(random.choices(words, k=8))} for i in range(REVIEWS)]
+
+print(f"{REVIEWS} reviews, {LATENCY * 1000:.0f} ms per model request, max_concurrency={MAX_CONCURRENCY}\n")
+print(f"{'mode':<38} {'seconds':>8} {'reviews/s':>10} {'requests':>9}")
+
+
+def report(label, seconds, requests, extrapolated=False):
+    note = " (extrapolated)" if extrapolated else ""
+    print(f"{label:<38} {seconds:>8.2f} {REVIEWS / seconds:>10,.0f} {requests:>9}{note}")
+
+
+# 1. chain.invoke per review (the current scripts)
+model = FakeReviewModel()
+_, _, chain = build(model)
+start = time.perf_counter()
+expected_sample = [chain.invoke(review) for review in reviews[:INVOKE_SAMPLE]]
+seconds = (time.perf_counter() - start) * REVIEWS / INVOKE_SAMPLE
+report("chain.invoke per review", seconds, model.requests * REVIEWS // INVOKE_SAMPLE, extrapolated=True)
+
+# 2. chain.batch
+model = FakeReviewModel()
+_, _, chain = build(model)
+start = time.perf_counter()
+expected = chain.batch(reviews, {"max_concurrency": MAX_CONCURRENCY})
+report("chain.batch", time.perf_counter() - start, model.requests)
+assert expected[:INVOKE_SAMPLE] == expected_sample
+
+# 3. BranchBatchRunner, per-request model
+model = FakeReviewModel()
+classifier_chain, branch_chain, _ = build(model)
+runner = BranchBatchRunner(classifier_chain, branch_chain, group_size=512, max_concurrency=MAX_CONCURRENCY)
+start = time.perf_counter()
+results = runner.run(reviews)
+report("BranchBatchRunner", time.perf_counter() - start, model.requests)
+assert results == expected
+print("   ", runner.summary())
+
+# 4. BranchBatchRunner, batch-capable model: one request per stage and arm per group
+model = FakeBatchReviewModel()
+classifier_chain, branch_chain, _ = build(model)
+runner = BranchBatchRunner(classifier_chain, branch_chain, group_size=512, max_concurrency=MAX_CONCURRENCY)
+start = time.perf_counter()
+results = runner.run(reviews)
+report("BranchBatchRunner + batch endpoint", time.perf_counter() - start, model.requests)
+assert results == expected
+print("   ", runner.summary())
@@ -8,6 +8,9 @@ from pydantic import BaseModel,Field
 
 import os
 
+# Batch runner for many reviews
+from branch_batch_runner import BranchBatchRunner
+
 load_dotenv()
 
 MODEL = os.environ.get('GOOGLE_CHAT_MODEL')
@@ -77,4 +80,16 @@ chain = RunnablePassthrough.assign(
 
 print(chain.invoke({'feedback':'This worst phone.'}))
 
-chain.get_graph().print_ascii()
\ No newline at end of file
+chain.get_graph().print_ascii()
+
+
+# Scoring many reviews at once: classify in batches, then send each arm all of its reviews in one batch call.
+reviews = [
+    'This worst phone.',
+    'Battery life is amazing and the camera is great.',
+    'Delivery was late and the box was broken.',
+]
+runner = BranchBatchRunner(classifier_chain, branch_chain, key = 'sentiment', max_concurrency = 4)
+for review, response in zip(reviews, runner.run([{'feedback': review} for review in reviews])):
+    print(review, '->', response)
+print(runner.summary())
@@ -4,8 +4,12 @@ from langchain_core.runnables import RunnableParallel,RunnableSequence
 from langchain_google_genai import ChatGoogleGenerativeAI
 from dotenv import load_dotenv
 from langchain_core.prompts import PromptTemplate
+import asyncio
 import os
 
+# asyncio fan-out with connection limits
+from async_parallel import AsyncParallel, limit_model
+
 load_dotenv()
 
 MODEL = os.environ.get('GOOGLE_CHAT_MODEL')
@@ -35,3 +39,19 @@ result = parallel_chain.invoke({'topic':'AI'})
 print(result['tweet'])
 print("="*50)
 print(result['linkedin'])
+
+
+# Async version for many topics at once: every branch runs as an asyncio task (ainvoke), so there
+# is no thread pool per request. At most 8 calls to the model are in flight, and if one branch
+# fails or takes longer than 60 s the other branch is cancelled.
+limited_model = limit_model(chat_model, max_connections = 8)
+
+async_parallel_chain = AsyncParallel({
+    'tweet':RunnableSequence(prompt1,limited_model,parser),
+    'linkedin':RunnableSequence(prompt2,limited_model,parser)
+}, timeout = 60)
+
+results = asyncio.run(async_parallel_chain.abatch([{'topic':topic} for topic in ['AI','Cricket','Space']]))
+
+for result in results:
+    print(result['tweet'])
@@ -0,0 +1,153 @@
+"""
+SemanticChunker with cached, batched embeddings and NumPy distances.
+
+SemanticChunker (langchain_experimental) embeds every sentence window again on every run and
+computes the distance between neighbours one pair at a time in Python. FastSemanticChunker gives
+the same chunks, but:
+
+    - embeddings go through an EmbeddingCache: the misses are sent in large batches (batch_size
+      texts per embed_documents call), and the last max_entries vectors stay in memory (least
+      recently used dropped first), so a text embedded again soon is not sent again
+    - the cosine distances between neighbouring sentences are one NumPy operation on a matrix
+    - the threshold (percentile / standard_deviation / interquartile / gradient) is computed on the
+      distance array, and the breakpoints with np.flatnonzero
+    - long texts are embedded window_size sentences at a time: one window of embeddings is needed
+      at a time, on top of what the cache keeps; the distances (one float per sentence) are kept
+      for the whole text, so the threshold and the chunks are the same as without windows
+
+The in-memory cache only lasts as long as the process. To reuse the embeddings on the next run,
+put the persistent SQLite cache of EmbeddingModels/embedding_cache.py behind it:
+
+    cache = EmbeddingCache(CachedEmbeddings(embed_model, "embedding_cache.sqlite3"), batch_size=256)
+    splitter = FastSemanticChunker(cache, breakpoint_threshold_type='standard_deviation', breakpoint_threshold_amount=1)
+    result = splitter.create_documents([text])
+"""
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_experimental.text_splitter import SemanticChunker
+
+
+class EmbeddingCache(Embeddings):
+    # In-memory LRU cache of at most max_entries vectors in front of any Embeddings, keyed by the exact text.
+
+    def __init__(self, embeddings, batch_size=256, max_entries=20_000):
+        self.embeddings = embeddings
+        self.batch_size = batch_size
+        self.max_entries = max_entries
+        self.vectors = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.calls = 0
+
+    def __getstate__(self):
+        # pickled for worker processes (parallel_splitter.py): an empty cache, without the lock
+        state = self.__dict__.copy()
+        del state["lock"]
+        state["vectors"] = OrderedDict()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def embed_matrix(self, texts):
+        # -> float32 array with one row per text
+        # the vectors of this call are collected in `found`, so evictions can't drop one before it is used
+        found = {}
+        with self.lock:
+            for text in dict.fromkeys(texts):
+                vector = self.vectors.get(text)
+                if vector is not None:
+                    self.vectors.move_to_end(text)
+                    found[text] = vector
+            missing = [text for text in dict.fromkeys(texts) if text not in found]
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+        for i in range(0, len(missing), self.batch_size):
+            batch = missing[i:i + self.batch_size]
+            vectors = np.asarray(self.embeddings.embed_documents(batch), dtype=np.float32)
+            found.update(zip(batch, vectors))
+            with self.lock:
+                self.calls += 1
+                self.vectors.update(zip(batch, vectors))
+                while len(self.vectors) > self.max_entries:
+                    self.vectors.popitem(last=False)
+        return np.stack([found[t] for t in texts]) if texts else np.empty((0, 0), dtype=np.float32)
+
+    def embed_documents(self, texts):
+        return self.embed_matrix(texts).tolist()
+
+    def embed_query(self, text):
+        return self.embed_matrix([text])[0].tolist()
+
+    def stats(self):
+        return {"texts": len(self.vectors), "hits": self.hits, "misses": self.misses, "calls": self.calls}
+
+
+def adjacent_cosine_distances(matrix):
+    # 1 - cos(row i, row i + 1) for every i; zero vectors count as similarity 0, like cosine_similarity.
+    # Vectors are stored as float32 (what the embedding APIs return), the math is done in float64.
+    matrix = matrix.astype(np.float64)
+    norms = np.linalg.norm(matrix, axis=1)
+    dots = np.einsum("ij,ij->i", matrix[:-1], matrix[1:])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        similarity = dots / (norms[:-1] * norms[1:])
+    similarity[~np.isfinite(similarity)] = 0.0
+    return 1.0 - similarity
+
+
+def combined_sentences(sentences, start, end, buffer_size):
+    # the text embedded for sentences[start:end]: each sentence with buffer_size neighbours on both sides
+    n = len(sentences)
+    return [" ".join(sentences[max(0, i - buffer_size):min(n, i + buffer_size + 1)]) for i in range(start, end)]
+
+
+class FastSemanticChunker(SemanticChunker):
+
+    def __init__(self, embeddings, *args, window_size=4096, batch_size=256, **kwargs):
+        if not isinstance(embeddings, EmbeddingCache):
+            embeddings = EmbeddingCache(embeddings, batch_size=batch_size)
+        super().__init__(embeddings, *args, **kwargs)
+        self.window_size = window_size
+
+    def sentence_distances(self, sentences):
+        # one distance per neighbouring pair, embedding window_size sentences at a time
+        n = len(sentences)
+        distances = np.empty(n - 1, dtype=np.float64)
+        for start in range(0, n - 1, self.window_size):
+            # one sentence past the window, for the distance across the window edge (it stays cached)
+            end = min(start + self.window_size + 1, n)
+            matrix = self.embeddings.embed_matrix(combined_sentences(sentences, start, end, self.buffer_size))
+            distances[start:end - 1] = adjacent_cosine_distances(matrix)
+        return distances
+
+    def split_text(self, text):
+        sentences = re.split(self.sentence_split_regex, text)
+        if len(sentences) == 1:
+            return sentences
+        if self.breakpoint_threshold_type == "gradient" and len(sentences) == 2:
+            return sentences
+
+        distances = self.sentence_distances(sentences)
+        if self.number_of_chunks is not None:
+            threshold, breakpoint_array = self._threshold_from_clusters(distances), distances
+        else:
+            threshold, breakpoint_array = self._calculate_breakpoint_threshold(distances)
+
+        chunks = []
+        start = 0
+        for index in np.flatnonzero(np.asarray(breakpoint_array) > threshold).tolist():
+            combined = " ".join(sentences[start:index + 1])
+            # same rule as SemanticChunker: a chunk below min_chunk_size grows into the next one
+            if self.min_chunk_size is not None and len(combined) < self.min_chunk_size:
+                continue
+            chunks.append(combined)
+            start = index + 1
+        if start < len(sentences):
+            chunks.append(" ".join(sentences[start:]))
+        return chunks
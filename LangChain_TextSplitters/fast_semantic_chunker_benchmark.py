@@ -0,0 +1,108 @@
+# SemanticChunker vs FastSemanticChunker on a 1M-character synthetic corpus (paragraphs about farming, cricket,
+# terrorism and space, like semantic_meaning_based.py) with a local hashing embedder that charges a fixed
+# latency per request of up to 100 texts (the GoogleGenerativeAIEmbeddings batch size).
+import random
+import re
+import time
+import zlib
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_experimental.text_splitter import SemanticChunker, calculate_cosine_distances, combine_sentences
+
+from fast_semantic_chunker import EmbeddingCache, FastSemanticChunker, adjacent_cosine_distances
+
+CORPUS_CHARS = 1_000_000
+DIMENSIONS = 384
+REQUEST_LATENCY = 0.02  # seconds per embedding request
+REQUEST_SIZE = 100
+random.seed(0)
+
+TOPICS = {
+    "farming": "farmers fields soil seeds season harvest crops rain tractor village wheat rice irrigation cattle",
+    "cricket": "IPL cricket league matches teams fans stadium batsman bowler wicket runs captain trophy season",
+    "terrorism": "terrorism peace safety attacks security forces laws fear cities police danger victims support",
+    "space": "space exploration moon mars rocket satellite orbit astronauts telescope galaxy mission launch planet",
+}
+FILLER = "the a and of in to with for on is are was were has have".split()
+
+
+def sentence(topic):
+    words = random.choices(TOPICS[topic].split(), k=random.randint(6, 12)) + random.choices(FILLER, k=4)
+    random.shuffle(words)
+    return " ".join(words).capitalize() + random.choice([".", ".", "!", "?"])
+
+
+def corpus(chars):
+    paragraphs, size = [], 0
+    while size < chars:
+        topic = random.choice(list(TOPICS))
+        paragraph = " ".join(sentence(topic) for _ in range(random.randint(4, 12)))
+        paragraphs.append(paragraph)
+        size += len(paragraph) + 2
+    return "\n\n".join(paragraphs)
+
+
+class HashingEmbeddings(Embeddings):
+    # bag of words hashed into DIMENSIONS buckets; float32 values, like the embedding APIs return
+
+    def __init__(self):
+        self.requests = 0
+
+    def embed_documents(self, texts):
+        vectors = np.zeros((len(texts), DIMENSIONS), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, zlib.crc32(word.strip(".!?").encode()) % DIMENSIONS] += 1.0
+        requests = -(-len(texts) // REQUEST_SIZE)
+        self.requests += requests
+        time.sleep(REQUEST_LATENCY * requests)
+        return vectors.tolist()
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+text = corpus(CORPUS_CHARS)
+sentences = re.split(r"(?<=[.?!])\s+", text)
+print(f"corpus: {len(text):,} characters, {len(sentences):,} sentences, "
+      f"{REQUEST_LATENCY * 1000:.0f} ms per embedding request of {REQUEST_SIZE} texts\n")
+
+# the distance step on its own, same embeddings for both
+matrix = np.asarray(HashingEmbeddings().embed_documents(sentences[:20_000]), dtype=np.float32)
+combined = combine_sentences([{"sentence": s, "combined_sentence_embedding": v}
+                              for s, v in zip(sentences, matrix.tolist())])
+start = time.perf_counter()
+expected, _ = calculate_cosine_distances(combined)
+loop_seconds = time.perf_counter() - start
+start = time.perf_counter()
+distances = adjacent_cosine_distances(matrix)
+numpy_seconds = time.perf_counter() - start
+assert np.allclose(distances, expected, rtol=0, atol=1e-12)
+print(f"adjacent distances for {len(matrix):,} sentences: loop {loop_seconds * 1000:.0f} ms, "
+      f"NumPy {numpy_seconds * 1000:.1f} ms ({loop_seconds / numpy_seconds:.0f}x)\n")
+
+print(f"{'splitter':<50} {'seconds':>8} {'requests':>9} {'chunks':>7}")
+for threshold_type, amount in [("standard_deviation", 1), ("percentile", 95), ("interquartile", 1.5)]:
+    embedder = HashingEmbeddings()
+    start = time.perf_counter()
+    expected = SemanticChunker(embedder, breakpoint_threshold_type=threshold_type,
+                               breakpoint_threshold_amount=amount).split_text(text)
+    print(f"{'SemanticChunker ' + threshold_type:<50} {time.perf_counter() - start:>8.2f} {embedder.requests:>9} "
+          f"{len(expected):>7}")
+
+    embedder = HashingEmbeddings()
+    cache = EmbeddingCache(embedder, batch_size=1000)
+    for label, window_size, fresh in [("cold cache", 4096, False), ("warm cache (second run)", 4096, False),
+                                      ("cold cache, 512-sentence windows", 512, True)]:
+        if fresh:
+            cache = EmbeddingCache(embedder, batch_size=1000)
+        before = embedder.requests
+        splitter = FastSemanticChunker(cache, breakpoint_threshold_type=threshold_type,
+                                       breakpoint_threshold_amount=amount, window_size=window_size)
+        start = time.perf_counter()
+        chunks = splitter.split_text(text)
+        seconds = time.perf_counter() - start
+        assert chunks == expected
+        print(f"{'  FastSemanticChunker ' + label:<50} {seconds:>8.2f} {embedder.requests - before:>9} {len(chunks):>7}")
+print("\nFastSemanticChunker gives the same chunks as SemanticChunker for every threshold type.")
@@ -1,4 +1,5 @@
-from langchain.text_splitter import CharacterTextSplitter
+# Same chunks as CharacterTextSplitter, in linear time on big inputs (linear_splitter.py)
+from linear_splitter import FastCharacterTextSplitter
 
 text = """
 Space exploration has led to incredible scientific discoveries. From landing on the Moon to exploring Mars, humanity continues to push the boundaries of what's possible beyond our planet.
@@ -6,7 +7,7 @@ Space exploration has led to incredible scientific discoveries. From landing on
 These missions have not only expanded our knowledge of the universe but have also contributed to advancements in technology here on Earth. Satellite communications, GPS, and even certain medical imaging techniques trace their roots back to innovations driven by space programs.
 """
 # Splitter object
-splitter = CharacterTextSplitter(
+splitter = FastCharacterTextSplitter(
     chunk_size = 100, 
     chunk_overlap = 0, 
     separator=''
@@ -0,0 +1,363 @@
+"""
+Linear-time versions of RecursiveCharacterTextSplitter and CharacterTextSplitter.
+
+Both LangChain splitters turn the text into a list of small strings (re.split, or list(text) for
+separator='') and merge them back into chunks with TextSplitter._merge_splits. The merge drops the
+first piece of the current chunk with `current_doc = current_doc[1:]`, so every piece popped copies
+the whole chunk: O(n * chunk_size) for a big text, and millions of small strings for chunk_size=10.
+
+The splitters here give the same chunks, but work on offsets into the original text:
+
+    - separators are searched with pattern.finditer(text, start, end) on the original string, and a
+      separator that is searched in many segments gets its offsets precomputed once for the whole
+      text (looked up with bisect)
+    - separator='' (single characters) needs no pieces at all: the chunk boundaries are arithmetic
+    - pieces are lists of start/end offsets, never copied substrings
+    - the merge window is a head index into the list of pieces: dropping a piece is O(1)
+    - a chunk is a Span(start, end); the text is only cut out when the caller asks for it
+
+    splitter = FastRecursiveCharacterTextSplitter(chunk_size=10, chunk_overlap=0)
+    splitter.split_text(text)              # same list as RecursiveCharacterTextSplitter
+    for span in splitter.iter_spans(text): # generator of offsets, no strings
+        print(span.start, span.end)
+    for chunk in splitter.iter_text(text): # generator of strings
+        ...
+
+from_language(Language.PYTHON, ...) works as before. A regex separator with capturing groups
+("(a)") makes re.split return the groups as extra pieces, which the offsets don't model: with such
+a separator the text is split by LangChain's own code, and the spans are found in the text like
+create_documents does.
+"""
+import re
+from bisect import bisect_left, bisect_right
+from operator import sub
+from typing import NamedTuple, Optional
+
+from langchain_text_splitters import CharacterTextSplitter, RecursiveCharacterTextSplitter
+
+# regex constructs that see characters before `pos`, or treat `pos` differently from the start of
+# a string: separators using them are searched on a copy of the segment, like LangChain does
+CONTEXT_SENSITIVE = re.compile(r"\^|\\A|\\b|\\B|\(\?<")
+# a regex separator without any of these is a literal string ("\nclass " in from_language)
+REGEX_SYNTAX = re.compile(r"[.^$*+?{}\[\]\\|()]")
+
+
+class Span(NamedTuple):
+    start: int
+    end: int
+    # only set when the chunk is not text[start:end]: pieces joined with a separator that is not the
+    # one between them in the text (empty pieces dropped, or a regex separator without keep_separator)
+    joined: Optional[str] = None
+
+    def text(self, source):
+        return self.joined if self.joined is not None else source[self.start:self.end]
+
+
+# Span(start, end, joined) without the keyword handling of the generated __new__
+new_span = tuple.__new__
+
+
+class OffsetSplitterMixin:
+    # The merge and join of TextSplitter, on (start, end) pieces instead of strings.
+
+    def _pattern(self, separator, is_regex):
+        patterns = self.__dict__.setdefault("_patterns", {})
+        key = (separator, is_regex)
+        if key not in patterns:
+            source = separator if is_regex else re.escape(separator)
+            patterns[key] = (re.compile(source), bool(is_regex and CONTEXT_SENSITIVE.search(separator)))
+        return patterns[key]
+
+    def _offsets(self, text, start, end, separator, is_regex, offsets):
+        # start offsets of all matches of a literal separator in the whole text, or None.
+        # Segments are searched on their own (pattern.finditer(text, start, end)) until the segments
+        # searched for a separator add up to the whole text; from then on its matches are found once for
+        # the whole text and looked up with bisect, so no separator costs more than ~2 passes over the
+        # text, however deep the recursion. Only for separators that cannot overlap themselves ("\n",
+        # " ", "\ndef "): their matches in a segment are then exactly the whole-text matches inside it.
+        if offsets is None or not separator or (is_regex and REGEX_SYNTAX.search(separator)):
+            return None
+        entry = offsets.get(separator, 0)
+        if entry is None or isinstance(entry, list):
+            return entry
+        if entry + end - start <= len(text):
+            offsets[separator] = entry + end - start
+            return None
+        if any(separator[:k] == separator[-k:] for k in range(1, len(separator))):
+            offsets[separator] = None
+        else:
+            pattern, _ = self._pattern(separator, False)
+            offsets[separator] = [m.start() for m in pattern.finditer(text)]
+        return offsets[separator]
+
+    def _search(self, text, start, end, separator, is_regex, offsets=None):
+        found = self._offsets(text, start, end, separator, is_regex, offsets)
+        if found is not None:
+            i = bisect_left(found, start)
+            return i < len(found) and found[i] + len(separator) <= end
+        pattern, copy = self._pattern(separator, is_regex)
+        if copy:
+            return pattern.search(text[start:end]) is not None
+        return pattern.search(text, start, end) is not None
+
+    def _pieces(self, text, start, end, separator, is_regex, offsets=None):
+        # _split_text_with_regex as two lists of offsets (piece i is text[starts[i]:ends[i]]),
+        # empty pieces dropped
+        if not separator:
+            return list(range(start, end)), list(range(start + 1, end + 1))
+        keep = self._keep_separator
+        found = self._offsets(text, start, end, separator, is_regex, offsets)
+        if found is not None:
+            size = len(separator)
+            match_starts = found[bisect_left(found, start):bisect_right(found, end - size)]
+            if keep == "end":
+                cuts = [m + size for m in match_starts]
+            elif keep:
+                cuts = match_starts
+            else:
+                cuts = [x for m in match_starts for x in (m, m + size)]
+        else:
+            pattern, copy = self._pattern(separator, is_regex)
+            if copy:
+                matches = [(m.start() + start, m.end() + start) for m in pattern.finditer(text[start:end])]
+            else:
+                matches = [m.span() for m in pattern.finditer(text, start, end)]
+            if keep == "end":
+                cuts = [m[1] for m in matches]
+            elif keep:
+                cuts = [m[0] for m in matches]
+            else:
+                cuts = [x for m in matches for x in m]
+
+        bounds = [start, *cuts, end]
+        if keep:
+            starts, ends = bounds[:-1], bounds[1:]
+        else:
+            # the separators themselves are not part of any piece
+            starts, ends = bounds[::2], bounds[1::2]
+        if 0 in map(sub, ends, starts):
+            kept = [(s, e) for s, e in zip(starts, ends) if s < e]
+            starts, ends = [s for s, _ in kept], [e for _, e in kept]
+        return starts, ends
+
+    def _lengths(self, text, starts, ends):
+        if self._length_function is len:
+            return list(map(sub, ends, starts))
+        return [self._length_function(text[s:e]) for s, e in zip(starts, ends)]
+
+    def _breaks(self, text, starts, ends, lo, hi, separator):
+        # breaks[i - lo]: how many of the gaps before piece i are not exactly `separator`;
+        # None when every gap is (the usual case: keep_separator, or separator='')
+        if separator == "" and ends[lo:hi - 1] == starts[lo + 1:hi]:
+            return None
+        gaps = zip(ends[lo:hi - 1], starts[lo + 1:hi])
+        breaks = [0]
+        count = 0
+        size = len(separator)
+        for e, s in gaps:
+            count += not (s - e == size and text.startswith(separator, e))
+            breaks.append(count)
+        return breaks if count else None
+
+    def _join(self, text, starts, ends, head, tail, separator, breaks, lo):
+        # _join_docs for pieces head..tail-1 -> Span or None
+        start, end = starts[head], ends[tail - 1]
+        if breaks is None or breaks[tail - 1 - lo] == breaks[head - lo]:
+            # the pieces and the separators between them are text[start:end]
+            if self._strip_whitespace:
+                while start < end and text[start].isspace():
+                    start += 1
+                while end > start and text[end - 1].isspace():
+                    end -= 1
+            return new_span(Span, (start, end, None)) if end > start else None
+        joined = separator.join(text[s:e] for s, e in zip(starts[head:tail], ends[head:tail]))
+        if self._strip_whitespace:
+            joined = joined.strip()
+        return new_span(Span, (start, end, joined)) if joined else None
+
+    def _merge_spans(self, text, starts, ends, lengths, lo, hi, separator, out):
+        # TextSplitter._merge_splits on pieces lo..hi-1, appending to out, with a head index
+        # instead of current_doc = current_doc[1:]
+        if hi <= lo:
+            return
+        chunk_size, overlap = self._chunk_size, self._chunk_overlap
+        separator_len = self._length_function(separator)
+        breaks = self._breaks(text, starts, ends, lo, hi, separator)
+        join = self._join
+        if sum(lengths[lo:hi]) + separator_len * (hi - lo - 1) <= chunk_size:
+            # the whole run fits in one chunk (most runs for a small chunk_size)
+            span = join(text, starts, ends, lo, hi, separator, breaks, lo)
+            if span is not None:
+                out.append(span)
+            return
+        head = lo
+        total = 0
+        if separator_len == 0:
+            # the same loop without the separator terms (keep_separator, the default of the
+            # recursive splitter)
+            for i in range(lo, hi):
+                length = lengths[i]
+                if total + length > chunk_size and i > head:
+                    span = join(text, starts, ends, head, i, separator, breaks, lo)
+                    if span is not None:
+                        out.append(span)
+                    while total > overlap or (total + length > chunk_size and total > 0):
+                        total -= lengths[head]
+                        head += 1
+                total += length
+            span = join(text, starts, ends, head, hi, separator, breaks, lo)
+            if span is not None:
+                out.append(span)
+            return
+        for i in range(lo, hi):
+            length = lengths[i]
+            count = i - head
+            if total + length + (separator_len if count > 0 else 0) > chunk_size:
+                if count > 0:
+                    span = join(text, starts, ends, head, i, separator, breaks, lo)
+                    if span is not None:
+                        out.append(span)
+                    while total > overlap or (
+                        total + length + (separator_len if count > 0 else 0) > chunk_size and total > 0
+                    ):
+                        total -= lengths[head] + (separator_len if count > 1 else 0)
+                        head += 1
+                        count -= 1
+            total += length + (separator_len if count > 0 else 0)
+        span = join(text, starts, ends, head, hi, separator, breaks, lo)
+        if span is not None:
+            out.append(span)
+
+    def _merge_characters(self, text, start, end, out):
+        # _merge_spans for separator='' and length_function=len, without piece lists: every piece is
+        # one character, so the chunks are chunk_size long and start chunk_size - overlap apart
+        chunk_size = self._chunk_size
+        step = chunk_size - min(self._chunk_overlap, chunk_size - 1)
+        strip = self._strip_whitespace
+        head = start
+        while head < end:
+            tail = min(head + chunk_size, end)
+            s, e = head, tail
+            if strip:
+                while s < e and text[s].isspace():
+                    s += 1
+                while e > s and text[e - 1].isspace():
+                    e -= 1
+            if e > s:
+                out.append(new_span(Span, (s, e, None)))
+            if tail == end:
+                break
+            head += step
+
+    def _langchain_only(self, separators):
+        # capturing groups in a regex separator: the pieces are not matches and gaps, keep LangChain's split
+        return bool(self._is_separator_regex) and any(re.compile(separator).groups for separator in separators)
+
+    def _langchain_spans(self, text, split_text):
+        # the chunks of LangChain's split_text as spans, located like TextSplitter.create_documents
+        index = previous_chunk_len = 0
+        for chunk in split_text(self, text):
+            index = text.find(chunk, max(0, index + previous_chunk_len - self._chunk_overlap))
+            previous_chunk_len = len(chunk)
+            if index < 0:
+                yield new_span(Span, (-1, -1, chunk))
+            else:
+                yield new_span(Span, (index, index + len(chunk), None))
+
+    def iter_text(self, text):
+        for span in self.iter_spans(text):
+            yield span.text(text)
+
+    def split_text(self, text):
+        return [text[s:e] if joined is None else joined for s, e, joined in self.iter_spans(text)]
+
+
+class FastRecursiveCharacterTextSplitter(OffsetSplitterMixin, RecursiveCharacterTextSplitter):
+
+    def _level(self, text, start, end, separators, offsets):
+        # one level of RecursiveCharacterTextSplitter._split_text on text[start:end]: the separator,
+        # the pieces, and which pieces are too long and get split again with the next separators
+        is_regex = self._is_separator_regex
+        separator = separators[-1]
+        new_separators = []
+        for i, candidate in enumerate(separators):
+            if candidate == "":
+                separator = candidate
+                break
+            if self._search(text, start, end, candidate, is_regex, offsets):
+                separator = candidate
+                new_separators = separators[i + 1:]
+                break
+        chunk_size = self._chunk_size
+        if separator == "" and self._length_function is len and chunk_size > 1:
+            return None  # single characters: _merge_characters
+        starts, ends = self._pieces(text, start, end, separator, is_regex, offsets)
+        lengths = self._lengths(text, starts, ends)
+        long = [i for i, length in enumerate(lengths) if length >= chunk_size]
+        merge_separator = "" if self._keep_separator else separator
+        return starts, ends, lengths, long, merge_separator, new_separators
+
+    def _split_into(self, text, start, end, separators, out, offsets):
+        # runs of pieces shorter than chunk_size are merged, the long ones split again
+        level = self._level(text, start, end, separators, offsets)
+        if level is None:
+            self._merge_characters(text, start, end, out)
+            return
+        starts, ends, lengths, long, merge_separator, new_separators = level
+        lo = 0
+        for i in long:
+            if i > lo:
+                self._merge_spans(text, starts, ends, lengths, lo, i, merge_separator, out)
+            if new_separators:
+                self._split_into(text, starts[i], ends[i], new_separators, out, offsets)
+            else:
+                out.append(new_span(Span, (starts[i], ends[i], None)))
+            lo = i + 1
+        if len(lengths) > lo:
+            self._merge_spans(text, starts, ends, lengths, lo, len(lengths), merge_separator, out)
+
+    def iter_spans(self, text):
+        # _split_into for the whole text, handing out the spans after every top-level piece
+        if self._langchain_only(self._separators):
+            yield from self._langchain_spans(text, RecursiveCharacterTextSplitter.split_text)
+            return
+        offsets = {}
+        out = []
+        level = self._level(text, 0, len(text), self._separators, offsets)
+        if level is None:
+            self._merge_characters(text, 0, len(text), out)
+            yield from out
+            return
+        starts, ends, lengths, long, merge_separator, new_separators = level
+        lo = 0
+        for i in long:
+            if i > lo:
+                self._merge_spans(text, starts, ends, lengths, lo, i, merge_separator, out)
+            if new_separators:
+                self._split_into(text, starts[i], ends[i], new_separators, out, offsets)
+            else:
+                out.append(new_span(Span, (starts[i], ends[i], None)))
+            lo = i + 1
+            yield from out
+            out.clear()
+        if len(lengths) > lo:
+            self._merge_spans(text, starts, ends, lengths, lo, len(lengths), merge_separator, out)
+        yield from out
+
+
+class FastCharacterTextSplitter(OffsetSplitterMixin, CharacterTextSplitter):
+
+    def iter_spans(self, text):
+        if self._langchain_only([self._separator]):
+            return self._langchain_spans(text, CharacterTextSplitter.split_text)
+        if self._separator == "" and self._length_function is len:
+            out = []
+            self._merge_characters(text, 0, len(text), out)
+            return iter(out)
+        starts, ends = self._pieces(text, 0, len(text), self._separator, self._is_separator_regex)
+        lookaround = self._is_separator_regex and self._separator.startswith(("(?=", "(?<!", "(?<=", "(?!"))
+        merge_separator = "" if self._keep_separator or lookaround else self._separator
+        lengths = self._lengths(text, starts, ends)
+        out = []
+        self._merge_spans(text, starts, ends, lengths, 0, len(starts), merge_separator, out)
+        return iter(out)
@@ -0,0 +1,83 @@
+# Throughput of RecursiveCharacterTextSplitter / CharacterTextSplitter vs the linear_splitter versions by input
+# size, for the settings of recursive_text_splitter.py and length_based_splitter.py plus typical RAG settings.
+import logging
+import random
+import time
+
+from langchain_text_splitters import CharacterTextSplitter, Language, RecursiveCharacterTextSplitter
+
+from linear_splitter import FastCharacterTextSplitter, FastRecursiveCharacterTextSplitter
+
+SIZES = [256 * 1024, 1024 * 1024, 4 * 1024 * 1024]
+logging.disable(logging.WARNING)
+random.seed(0)
+
+words = ("space exploration has led to incredible scientific discoveries from landing on the moon to exploring mars "
+         "humanity continues push boundaries of what possible beyond our planet satellite communications gps").split()
+code_lines = ["def {}(x):", "    return x + {}", "class {}:", "    value = {}", "", "# {}"]
+
+
+def prose(size):
+    paragraphs, total = [], 0
+    while total < size:
+        paragraph = " ".join(random.choices(words, k=random.randint(20, 120))) + "."
+        paragraphs.append(paragraph)
+        total += len(paragraph) + 2
+    return "\n\n".join(paragraphs)[:size]
+
+
+def code(size):
+    lines, total = [], 0
+    while total < size:
+        line = random.choice(code_lines).format(random.choice(words))
+        lines.append(line)
+        total += len(line) + 1
+    return "\n".join(lines)[:size]
+
+
+def no_separators(size):
+    # a long base64-like blob: only separator='' applies
+    return "".join(random.choices("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/", k=size))
+
+
+configs = [
+    ("recursive chunk_size=10", lambda cls: cls(chunk_size=10, chunk_overlap=0), "recursive", prose),
+    ("recursive 1000 / 200", lambda cls: cls(chunk_size=1000, chunk_overlap=200), "recursive", prose),
+    ("recursive 4000 / 200, no separators", lambda cls: cls(chunk_size=4000, chunk_overlap=200), "recursive", no_separators),
+    ("python 200 / 10", lambda cls: cls.from_language(chunk_size=200, chunk_overlap=10, language=Language.PYTHON),
+     "recursive", code),
+    ("character '' 100", lambda cls: cls(chunk_size=100, chunk_overlap=0, separator=''), "character", prose),
+    ("character '' 4000 / 200", lambda cls: cls(chunk_size=4000, chunk_overlap=200, separator=''), "character", prose),
+]
+classes = {
+    "recursive": (RecursiveCharacterTextSplitter, FastRecursiveCharacterTextSplitter),
+    "character": (CharacterTextSplitter, FastCharacterTextSplitter),
+}
+
+
+def timed(run, repeat=3):
+    # best of `repeat` runs
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return result, best
+
+
+print(f"{'settings':<38} {'size':>6} {'chunks':>9} {'LangChain MB/s':>15} {'split_text MB/s':>16} "
+      f"{'iter_spans MB/s':>16} {'speedup':>8}")
+for name, make, kind, generate in configs:
+    slow_cls, fast_cls = classes[kind]
+    for size in SIZES:
+        text = generate(size)
+        megabytes = len(text) / 1024 / 1024
+        # the quadratic LangChain runs take minutes for the biggest inputs: run those once
+        expected, slow = timed(lambda: make(slow_cls).split_text(text), repeat=1 if size > SIZES[0] else 3)
+        chunks, fast = timed(lambda: make(fast_cls).split_text(text))
+        assert chunks == expected
+        count, spans = timed(lambda: sum(1 for _ in make(fast_cls).iter_spans(text)))
+        assert count == len(expected)
+        print(f"{name:<38} {size // 1024:>4}KB {len(chunks):>9,} {megabytes / slow:>15.1f} {megabytes / fast:>16.1f} "
+              f"{megabytes / spans:>16.1f} {slow / fast:>7.1f}x")
@@ -0,0 +1,90 @@
+# Checks that FastRecursiveCharacterTextSplitter / FastCharacterTextSplitter return exactly the chunks of
+# RecursiveCharacterTextSplitter / CharacterTextSplitter: the texts and settings of recursive_text_splitter.py
+# and length_based_splitter.py, then random texts with every keep_separator / strip / overlap setting.
+import logging
+import random
+
+from langchain_text_splitters import CharacterTextSplitter, Language, RecursiveCharacterTextSplitter
+
+from linear_splitter import FastCharacterTextSplitter, FastRecursiveCharacterTextSplitter
+
+# chunks longer than chunk_size log a warning in both splitters
+logging.disable(logging.WARNING)
+
+text = """
+Space exploration has led to incredible scientific discoveries. From landing on the Moon to exploring Mars, humanity continues to push the boundaries of what's possible beyond our planet.
+
+These missions have not only expanded our knowledge of the universe but have also contributed to advancements in technology here on Earth. Satellite communications, GPS, and even certain medical imaging techniques trace their roots back to innovations driven by space programs.
+"""
+
+with open(__file__.replace("linear_splitter_parity.py", "linear_splitter.py")) as f:
+    pycode = f.read()
+
+
+def check(expected_splitter, splitter, text):
+    try:
+        expected = expected_splitter.split_text(text)
+    except IndexError:
+        # LangChain's re.split of a separator with capturing groups can leave an odd piece out
+        try:
+            splitter.split_text(text)
+        except IndexError:
+            return 0
+        raise AssertionError("expected the same IndexError as LangChain")
+    assert splitter.split_text(text) == expected
+    assert list(splitter.iter_text(text)) == expected
+    assert [span.text(text) for span in splitter.iter_spans(text)] == expected
+    # offsets point into the original text
+    for span in splitter.iter_spans(text):
+        if span.joined is None:
+            assert text[span.start:span.end] == span.text(text)
+    docs = splitter.create_documents([text], [{"source": "demo"}])
+    assert docs == expected_splitter.create_documents([text], [{"source": "demo"}])
+    return len(expected)
+
+
+# the repo's examples
+print("recursive_text_splitter.py, chunk_size=10:",
+      check(RecursiveCharacterTextSplitter(chunk_size=10, chunk_overlap=0),
+            FastRecursiveCharacterTextSplitter(chunk_size=10, chunk_overlap=0), text), "chunks")
+print("from_language(Language.PYTHON), chunk_size=200:",
+      check(RecursiveCharacterTextSplitter.from_language(chunk_size=200, chunk_overlap=10, language=Language.PYTHON),
+            FastRecursiveCharacterTextSplitter.from_language(chunk_size=200, chunk_overlap=10, language=Language.PYTHON),
+            pycode), "chunks")
+print("length_based_splitter.py, chunk_size=100, separator='':",
+      check(CharacterTextSplitter(chunk_size=100, chunk_overlap=0, separator=''),
+            FastCharacterTextSplitter(chunk_size=100, chunk_overlap=0, separator=''), text), "chunks")
+
+# random texts built from separators, words and long runs without any separator
+random.seed(0)
+parts = ["a", "bb", "ccc", " ", "  ", "\n", "\n\n", "\n\n\n", "\t", "def ", "\ndef ", "\nclass ", "#", "x" * 15]
+cases = 0
+for _ in range(2000):
+    sample = "".join(random.choices(parts, k=random.randint(0, 80)))
+    chunk_size = random.randint(1, 30)
+    settings = dict(
+        chunk_size=chunk_size,
+        chunk_overlap=random.randint(0, chunk_size),
+        keep_separator=random.choice([True, False, "start", "end"]),
+        strip_whitespace=random.choice([True, False]),
+        add_start_index=random.choice([True, False]),
+        length_function=random.choice([len, lambda s: len(s.split()) + 1]),
+    )
+    separator = random.choice(["", " ", "\n", "\n\n"])
+    regex = random.choice([r"\s+", r"\n+", r"(?=\n)", r"(?<=a)b", r"^a", r"(a)", r"(\n)+", r"(b|c)c"])
+    pairs = [
+        (RecursiveCharacterTextSplitter(**settings), FastRecursiveCharacterTextSplitter(**settings)),
+        (CharacterTextSplitter(separator=separator, **settings), FastCharacterTextSplitter(separator=separator, **settings)),
+        (CharacterTextSplitter(separator=regex, is_separator_regex=True, **settings),
+         FastCharacterTextSplitter(separator=regex, is_separator_regex=True, **settings)),
+        (RecursiveCharacterTextSplitter(separators=[regex, " ", ""], is_separator_regex=True, **settings),
+         FastRecursiveCharacterTextSplitter(separators=[regex, " ", ""], is_separator_regex=True, **settings)),
+    ]
+    sizes = dict(chunk_size=chunk_size, chunk_overlap=settings["chunk_overlap"])
+    for language in (Language.PYTHON, Language.MARKDOWN, Language.LATEX):
+        pairs.append((RecursiveCharacterTextSplitter.from_language(language, **sizes),
+                      FastRecursiveCharacterTextSplitter.from_language(language, **sizes)))
+    for expected_splitter, splitter in pairs:
+        check(expected_splitter, splitter, sample)
+        cases += 1
+print(f"{cases:,} random cases: same chunks")
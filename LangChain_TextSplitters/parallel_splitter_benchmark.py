@@ -0,0 +1,98 @@
+# ParallelDocumentSplitter vs splitter.split_documents from 1 to N worker processes, on a synthetic loader output
+# (PDF-like documents: lines wrapped at ~80 characters, paragraphs of up to ~2,500, with source/page metadata),
+# with the RAG plan's Step 2 settings (chunk_size=1000, chunk_overlap=200) and small chunks (200/50).
+# The output is checked against split_documents every time: same documents, same order.
+# SemanticChunker / FastSemanticChunker (start_index = running length of the chunks) are checked on a smaller corpus.
+# The measured speedup is bounded by the cores of the machine (os.cpu_count() is printed), so the time spent in
+# the workers and in the parent (building the Documents) is measured too, and the speedup it allows on N cores.
+import os
+import pickle
+import random
+import textwrap
+import time
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_experimental.text_splitter import SemanticChunker
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from fast_semantic_chunker import FastSemanticChunker
+from linear_splitter import FastRecursiveCharacterTextSplitter
+from parallel_splitter import ParallelDocumentSplitter, split_texts
+
+CORPUS_CHARS = 16 * 1024 * 1024
+words = ("space exploration has led to incredible scientific discoveries from landing on the moon to exploring mars "
+         "humanity continues push boundaries of what possible beyond our planet satellite communications gps").split()
+
+
+def corpus(chars):
+    random.seed(0)
+    docs, total = [], 0
+    while total < chars:
+        paragraphs = [textwrap.fill(" ".join(random.choices(words, k=random.randint(20, 400))) + ".", 80)
+                      for _ in range(random.randint(4, 150))]
+        text = "\n\n".join(paragraphs)
+        docs.append(Document(page_content=text, metadata={"source": f"doc_{len(docs):04d}.pdf",
+                                                          "page": len(docs) % 7, "tags": ["space"]}))
+        total += len(text)
+    return docs
+
+
+def timed(run, repeat=3):
+    # best of `repeat` runs
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+# The __main__ guard is required: worker processes re-import this file on Windows/macOS.
+if __name__ == "__main__":
+    docs = corpus(CORPUS_CHARS)
+    print(f"{len(docs)} documents, {sum(len(d.page_content) for d in docs):,} characters, "
+          f"os.cpu_count() = {os.cpu_count()}\n")
+
+    for splitter_cls, chunk_size, chunk_overlap in [(RecursiveCharacterTextSplitter, 1000, 200),
+                                                    (RecursiveCharacterTextSplitter, 200, 50),
+                                                    (FastRecursiveCharacterTextSplitter, 1000, 200),
+                                                    (FastRecursiveCharacterTextSplitter, 200, 50)]:
+        splitter = splitter_cls(chunk_size=chunk_size, chunk_overlap=chunk_overlap, add_start_index=True)
+        expected, base_time = timed(lambda: splitter.split_documents(docs))
+        print(f"{splitter_cls.__name__}({chunk_size}/{chunk_overlap}).split_documents: {base_time:.2f} sec, "
+              f"{len(expected):,} chunks")
+
+        # the parallel part (split_texts, in the workers) and the serial part (_collect, in the parent)
+        parallel = ParallelDocumentSplitter(splitter, max_workers=1)
+        results, worker_time = timed(lambda: [split_texts(shard, splitter)
+                                              for shard in parallel.shards([d.page_content for d in docs])])
+        _, parent_time = timed(lambda: parallel._collect(docs, results))
+        allowed = ", ".join(f"{n} cores {base_time / (worker_time / n + parent_time):.1f}x" for n in (2, 4, 8, 16))
+        print(f"  workers {worker_time:.2f} sec, parent {parent_time:.2f} sec: at most {allowed}")
+
+        # what goes back from the workers: offsets instead of Document objects
+        shard = ParallelDocumentSplitter(splitter).shards([d.page_content for d in docs])[0]
+        offsets = pickle.dumps(split_texts(shard, splitter))
+        objects = pickle.dumps(splitter.split_documents(docs[:len(shard)]))
+        print(f"  one shard back to the parent: {len(offsets) / 1024:,.0f}KB of offsets "
+              f"vs {len(objects) / 1024:,.0f}KB of pickled Documents")
+
+        for n in sorted({1, 2, 4, os.cpu_count() or 1}):
+            parallel = ParallelDocumentSplitter(splitter, max_workers=n)
+            chunks, elapsed = timed(lambda: parallel.split_documents(docs))
+            assert chunks == expected
+            # every chunk has its own deep copy of the metadata
+            assert chunks[0].metadata["tags"] is not chunks[1].metadata["tags"]
+            print(f"  ParallelDocumentSplitter {n:>2} workers: {elapsed:.2f} sec, speedup {base_time / elapsed:.2f}x, "
+                  f"same documents and order")
+        print()
+
+    # semantic chunkers: not TextSplitter subclasses, no chunk_overlap, start_index from the chunk lengths
+    small = docs[:4]
+    for splitter in [SemanticChunker(DeterministicFakeEmbedding(size=64), add_start_index=True),
+                     FastSemanticChunker(DeterministicFakeEmbedding(size=64), add_start_index=True)]:
+        expected = splitter.split_documents(small)
+        for n in (1, 2):
+            assert ParallelDocumentSplitter(splitter, max_workers=n).split_documents(small) == expected
+        print(f"{type(splitter).__name__}: {len(expected):,} chunks, same documents with 1 and 2 workers")
@@ -1,11 +1,14 @@
-from langchain.text_splitter import Language, RecursiveCharacterTextSplitter
+from langchain.text_splitter import Language
+
+# Same chunks as RecursiveCharacterTextSplitter, in linear time on big inputs (linear_splitter.py)
+from linear_splitter import FastRecursiveCharacterTextSplitter
 
 text = """
 Space exploration has led to incredible scientific discoveries. From landing on the Moon to exploring Mars, humanity continues to push the boundaries of what's possible beyond our planet.
 
 These missions have not only expanded our knowledge of the universe but have also contributed to advancements in technology here on Earth. Satellite communications, GPS, and even certain medical imaging techniques trace their roots back to innovations driven by space programs.
 """
-txt_splitter = RecursiveCharacterTextSplitter(
+txt_splitter = FastRecursiveCharacterTextSplitter(
     chunk_size = 10,
     chunk_overlap = 0
 )
@@ -14,6 +17,15 @@ result = txt_splitter.split_text(text)
 
 # print(result)
 
+# iter_spans gives (start, end) offsets into text, without copying the chunks
+# for span in txt_splitter.iter_spans(text):
+#     print(span.start, span.end, span.text(text))
+
+# chunk_size / chunk_overlap in model tokens, with the text tokenized once (token_splitter.py)
+# from token_splitter import RecursiveTokenTextSplitter
+# token_splitter = RecursiveTokenTextSplitter(encoding_name = "cl100k_base", chunk_size = 20, chunk_overlap = 5)
+# print(token_splitter.split_text(text))
+
 pycode = """
     from langchain.text_splitter import Language, RecursiveCharacterTextSplitter
 
@@ -40,7 +52,7 @@ result = py_splitter.split_text(pycode)
 
 """
 
-py_splitter = RecursiveCharacterTextSplitter.from_language(
+py_splitter = FastRecursiveCharacterTextSplitter.from_language(
     chunk_size = 200,
     chunk_overlap = 10, 
     language = Language.PYTHON
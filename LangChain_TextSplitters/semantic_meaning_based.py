@@ -1,7 +1,12 @@
-from langchain_experimental.text_splitter import SemanticChunker
+from fast_semantic_chunker import EmbeddingCache, FastSemanticChunker
 from langchain_google_genai.embeddings import GoogleGenerativeAIEmbeddings
 from dotenv import load_dotenv
 import os 
+import sys
+
+# Persistent embedding cache from EmbeddingModels/
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'EmbeddingModels'))
+from embedding_cache import CachedEmbeddings
 
 load_dotenv()
 
@@ -9,6 +14,9 @@ MODEL = os.environ.get('GOOGLE_EMBEDDING_MODEL')
 
 embed_model = GoogleGenerativeAIEmbeddings(model = MODEL)
 
+# Sentence windows are embedded in batches of 256; the SQLite cache keeps them for the next run of this script.
+embed_cache = EmbeddingCache(CachedEmbeddings(embed_model, "embedding_cache.sqlite3"), batch_size = 256)
+
 text = """
 Farmers were working hard in the fields, preparing the soil and planting seeds for the next season. The sun was bright, and the air smelled of earth and fresh grass. The Indian Premier League (IPL) is the biggest cricket league in the world. People all over the world watch the matches and cheer for their favourite teams.
 
@@ -17,8 +25,9 @@ Terrorism is a big danger to peace and safety. It causes harm to people and crea
 
 # If the distance between two sentences is greater than 1 standard deviation is consider as new semantic meaning text. (1 standard cause we set breakpoin threashold amount to 1.)
 
-splitter = SemanticChunker(
-    embed_model, 
+# FastSemanticChunker gives the same chunks as SemanticChunker, with NumPy distances and cached embeddings.
+splitter = FastSemanticChunker(
+    embed_cache, 
     breakpoint_threshold_type='standard_deviation',
     breakpoint_threshold_amount=1
 )
@@ -31,6 +40,3 @@ print("-" * 20)
 for i, doc in enumerate(result):
     print(f"Chunk {i+1}:\n{doc.page_content}\n")
     print("-" * 20)
-
-
-
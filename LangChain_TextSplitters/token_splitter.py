@@ -0,0 +1,103 @@
+"""
+Chunks sized in model tokens, with the document tokenized once.
+
+RecursiveCharacterTextSplitter.from_tiktoken_encoder(...) passes `len(enc.encode(piece))` as the
+length function, so every piece at every level of the recursion is tokenized again, and so is
+every separator. RecursiveTokenTextSplitter tokenizes the whole document once:
+
+    - tokenizer.encode_ordinary(text) gives the tokens; the byte length of every token id (cached
+      per tokenizer) gives each token's start offset in the text, mapped from bytes to characters
+      with NumPy
+    - the size of a piece text[start:end] is the number of tokens starting inside it: one
+      np.searchsorted call for all the pieces of a level
+    - the chunk boundaries are still the recursive separators ("\\n\\n", "\\n", " ", ""), with the
+      merge of linear_splitter.FastRecursiveCharacterTextSplitter; chunk_size and chunk_overlap
+      are in tokens
+    - the tokenizer is loaded on first use and shared by every splitter (get_tokenizer)
+
+    splitter = RecursiveTokenTextSplitter(encoding_name="cl100k_base", chunk_size=256, chunk_overlap=32)
+    chunks = splitter.split_text(text)
+
+The sizes are those of the document's tokenization. A chunk tokenized on its own can come out a
+few tokens longer at its edges (a boundary inside a token, or stripped whitespace), so leave a
+small margin under a hard model limit.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from linear_splitter import FastRecursiveCharacterTextSplitter
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer(encoding_name="cl100k_base"):
+    # one tiktoken Encoding per name for the whole process, loaded on first use
+    import tiktoken
+
+    return tiktoken.get_encoding(encoding_name)
+
+
+@lru_cache(maxsize=None)
+def token_byte_lengths(tokenizer):
+    # byte length of every token id (0 for ids that are not tokens)
+    lengths = np.zeros(tokenizer.n_vocab, dtype=np.int64)
+    for token in range(tokenizer.n_vocab):
+        try:
+            lengths[token] = len(tokenizer.decode_single_token_bytes(token))
+        except KeyError:
+            pass
+    return lengths
+
+
+def token_starts(tokenizer, text):
+    # character offset where each token of `text` starts (a token that starts inside a multi-byte
+    # character gets that character's offset, like Encoding.decode_with_offsets)
+    tokens = np.asarray(tokenizer.encode_ordinary(text), dtype=np.int64)
+    if not len(tokens):
+        return np.zeros(0, dtype=np.int64)
+    byte_starts = np.zeros(len(tokens), dtype=np.int64)
+    np.cumsum(token_byte_lengths(tokenizer)[tokens[:-1]], out=byte_starts[1:])
+    if text.isascii():
+        return byte_starts
+    raw = np.frombuffer(text.encode("utf-8"), dtype=np.uint8)
+    char_of_byte = np.cumsum((raw & 0xC0) != 0x80) - 1
+    return char_of_byte[byte_starts]
+
+
+class RecursiveTokenTextSplitter(FastRecursiveCharacterTextSplitter):
+
+    def __init__(self, encoding_name="cl100k_base", tokenizer=None, chunk_size=256, chunk_overlap=32, **kwargs):
+        super().__init__(chunk_size=chunk_size, chunk_overlap=chunk_overlap, length_function=self.count_tokens,
+                         **kwargs)
+        self._encoding_name = encoding_name
+        self._tokenizer = tokenizer
+        # (text, token starts) of the last text split, so the levels of one split share one tokenization
+        self._last = (None, None)
+
+    def __getstate__(self):
+        # pickled for worker processes (parallel_splitter.py): without the last text split
+        state = self.__dict__.copy()
+        state["_last"] = (None, None)
+        return state
+
+    @property
+    def tokenizer(self):
+        if self._tokenizer is None:
+            self._tokenizer = get_tokenizer(self._encoding_name)
+        return self._tokenizer
+
+    def count_tokens(self, text):
+        # for strings that are not part of the document (the separator when keep_separator=False)
+        return len(self.tokenizer.encode_ordinary(text))
+
+    def _token_starts(self, text):
+        last_text, starts = self._last
+        if last_text is not text:
+            starts = token_starts(self.tokenizer, text)
+            self._last = (text, starts)
+        return starts
+
+    def _lengths(self, text, starts, ends):
+        # tokens starting inside each piece, from the one tokenization of the document
+        offsets = self._token_starts(text)
+        return (np.searchsorted(offsets, ends) - np.searchsorted(offsets, starts)).tolist()
@@ -0,0 +1,103 @@
+# RecursiveTokenTextSplitter vs the usual token-sized splitting, RecursiveCharacterTextSplitter with a tiktoken
+# length function (what from_tiktoken_encoder builds), on the repo's theory notes repeated up to 4MB.
+# tiktoken downloads its encodings, so this trains a small local BPE encoding with tiktoken's own trainer
+# (same pattern as cl100k_base) on part of the notes instead: no network needed.
+import contextlib
+import glob
+import io
+import os
+import time
+
+import tiktoken
+from tiktoken._educational import bpe_train
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from token_splitter import RecursiveTokenTextSplitter, token_starts
+
+SIZES = [256 * 1024, 1024 * 1024, 4 * 1024 * 1024]
+CHUNK_SIZE, CHUNK_OVERLAP = 256, 32
+CL100K_PATTERN = (r"""'(?i:[sdmt]|ll|ve|re)|[^\r\n\p{L}\p{N}]?+\p{L}+|\p{N}{1,3}| ?[^\s\p{L}\p{N}]++[\r\n]*"""
+                  r"""|\s*[\r\n]|\s+(?!\S)|\s+""")
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+notes = "\n\n".join(open(path, encoding="utf-8").read() for path in sorted(glob.glob(os.path.join(root, "*", "*.md"))))
+
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    ranks = bpe_train(notes[:40_000], 512, CL100K_PATTERN, visualise=None)
+tokenizer = tiktoken.Encoding("local_bpe", pat_str=CL100K_PATTERN, mergeable_ranks=ranks, special_tokens={})
+print(f"local BPE encoding: {tokenizer.n_vocab} tokens, trained in {time.perf_counter() - start:.1f}s\n")
+
+
+def count(text):
+    return len(tokenizer.encode_ordinary(text))
+
+
+def candidate_split(text):
+    # the naive loop: grow the chunk word by word and tokenize the whole candidate chunk every time
+    chunks, current = [], []
+    for word in text.split(" "):
+        candidate = " ".join(current + [word])
+        if current and count(candidate) > CHUNK_SIZE:
+            chunks.append(" ".join(current))
+            # keep about CHUNK_OVERLAP tokens of the end of the chunk
+            while current and count(" ".join(current)) > CHUNK_OVERLAP:
+                current.pop(0)
+        current.append(word)
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def timed(run):
+    start = time.perf_counter()
+    result = run()
+    return result, time.perf_counter() - start
+
+
+# the token offsets match tiktoken's own decode_with_offsets, also for non-ASCII text
+sample = notes[:20_000] + " naïve café — 東京 🚀 "
+assert token_starts(tokenizer, sample).tolist() == tokenizer.decode_with_offsets(tokenizer.encode_ordinary(sample))[1]
+
+print(f"chunk_size={CHUNK_SIZE} tokens, chunk_overlap={CHUNK_OVERLAP} tokens\n")
+print(f"{'size':>6} {'splitter':<34} {'seconds':>8} {'encode calls':>13} {'chunks':>7} {'max tokens':>11} "
+      f"{'speedup (per-piece / candidate)':>32}")
+for size in SIZES:
+    text = (notes * (size // len(notes) + 1))[:size]
+
+    # the candidate loop is quadratic in practice, so only on the smaller texts
+    candidate = None
+    if size <= SIZES[1]:
+        candidate_chunks, candidate = timed(lambda: candidate_split(text))
+        print(f"{size // 1024:>4}KB {'re-tokenize every candidate chunk':<34} {candidate:>8.2f} {'':>13} "
+              f"{len(candidate_chunks):>7,} {max(map(count, candidate_chunks)):>11}")
+
+    calls = 0
+
+    def counting(piece):
+        global calls
+        calls += 1
+        return count(piece)
+
+    baseline = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP,
+                                              length_function=counting)
+    expected, slow = timed(lambda: baseline.split_text(text))
+    label = "" if candidate is not None else f"{size // 1024}KB"
+    print(f"{label:>6} {'per-piece (from_tiktoken_encoder)':<34} {slow:>8.2f} {calls:>13,} {len(expected):>7,} "
+          f"{max(map(count, expected)):>11}")
+
+    splitter = RecursiveTokenTextSplitter(tokenizer=tokenizer, chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+    chunks, fast = timed(lambda: splitter.split_text(text))
+    print(f"{'':>6} {'RecursiveTokenTextSplitter':<34} {fast:>8.2f} {'1':>13} {len(chunks):>7,} "
+          f"{max(map(count, chunks)):>11} {slow / fast:>7.1f}x" + (f" / {candidate / fast:.0f}x" if candidate else ""))
+
+    # how far a chunk tokenized on its own is from its size in the document's tokenization
+    spans = list(splitter.iter_spans(text))
+    sizes = splitter._lengths(text, [span.start for span in spans], [span.end for span in spans])
+    drift = max(count(chunk) - tokens for chunk, tokens in zip(chunks, sizes))
+    print(f"{'':>6} {'  chunk tokenized alone: at most':<34} {drift:>+8} tokens\n")
+
+# the tokenizer is loaded on first use and shared
+lazy = RecursiveTokenTextSplitter(encoding_name="cl100k_base")
+assert lazy._tokenizer is None
+print("RecursiveTokenTextSplitter(encoding_name='cl100k_base') does not load the encoding until the first split")
@@ -0,0 +1,143 @@
+"""
+Bulk loading of precomputed embeddings into a Chroma collection.
+
+Chroma.from_documents embeds and writes in one go. When the vectors are already computed
+(EmbeddingModels/batch_embedding.py, a cache, another job ...) it is faster to stream them straight
+into the collection in large batches, with the HNSW index files (header.bin, link_lists.bin ...)
+written to disk once at the end instead of after every sync_threshold inserts:
+
+    - the vectors are written through a client of the loader's own, on which the collection is
+      opened (or created) with configuration={"hnsw": {"sync_threshold": sync_threshold}}; with
+      chromadb 1.0.x a collection keeps the sync_threshold it was opened with, so a modify() on a
+      collection the caller already has open would not defer anything
+    - the original sync_threshold is written back, and the collection is opened again through a
+      fresh client: opening it syncs the vectors of the load to the index files
+    - the stats report the vectors in the index files after that sync, and whether it happened
+
+    client = chromadb.PersistentClient(path="chroma_db")
+    stats = ChromaBulkLoader(client, "ipl_players").load(ids, vectors, documents=texts, metadatas=metadatas)
+    store = Chroma(client=chromadb.PersistentClient(path="chroma_db"), collection_name="ipl_players", ...)
+
+Open the clients that query the collection after load(): chromadb.PersistentClient(path) then
+gives the client that did the sync, while a client that already had the collection's index in
+memory before the load does not see the loaded vectors. For a client without local index files
+(in-memory or HTTP) the vectors are only upserted in batches.
+
+chroma_bulk_loader_benchmark.py compares it with the same batches at the default sync_threshold.
+With chromadb 1.0.20 the upserts take about as long either way (100k x 128: 33-37 sec), and the
+sync on reopening adds ~20 sec, so most of the gain over per-document inserts is the batching.
+"""
+import os
+import sqlite3
+import struct
+import time
+
+import chromadb
+import numpy as np
+from chromadb.errors import NotFoundError
+
+# sync_threshold of a collection created without one
+DEFAULT_SYNC_THRESHOLD = 1000
+
+
+class ChromaBulkLoader:
+
+    def __init__(self, client, collection_name, batch_size=None, sync_threshold=1_000_000):
+        self.client = client
+        self.collection_name = collection_name
+        max_batch = client.get_max_batch_size()
+        self.batch_size = min(batch_size or max_batch, max_batch)
+        self.sync_threshold = sync_threshold
+
+    def _fresh_client(self):
+        # a client with a new chromadb System for the same directory, which loads the collection again
+        self.client.clear_system_cache()
+        settings = self.client.get_settings()
+        return chromadb.PersistentClient(path=settings.persist_directory, settings=settings,
+                                         tenant=self.client.tenant, database=self.client.database)
+
+    def _open_for_loading(self, client):
+        # the collection opened with the raised sync_threshold, and the sync_threshold to restore
+        try:
+            collection = client.get_collection(self.collection_name)
+        except NotFoundError:
+            collection = client.create_collection(
+                self.collection_name, configuration={"hnsw": {"sync_threshold": self.sync_threshold}})
+            return collection, DEFAULT_SYNC_THRESHOLD
+
+        hnsw = (collection.configuration or {}).get("hnsw")
+        if not hnsw:
+            raise ValueError(f"collection {self.collection_name!r} has no HNSW index")
+        old_threshold = hnsw.get("sync_threshold") or DEFAULT_SYNC_THRESHOLD
+        if old_threshold >= self.sync_threshold:
+            return collection, None
+        collection.modify(configuration={"hnsw": {"sync_threshold": self.sync_threshold}})
+        # only a collection loaded after the modify() uses the new value
+        return self._fresh_client().get_collection(self.collection_name), old_threshold
+
+    def index_file_count(self, collection):
+        # vectors in the collection's header.bin (hnswlib cur_element_count), 0 before the first sync
+        persist_directory = self.client.get_settings().persist_directory
+        db = sqlite3.connect(f"file:{os.path.join(persist_directory, 'chroma.sqlite3')}?mode=ro", uri=True)
+        try:
+            row = db.execute("SELECT id FROM segments WHERE collection = ? AND scope = 'VECTOR'",
+                             (str(collection.id),)).fetchone()
+        finally:
+            db.close()
+        header = os.path.join(persist_directory, row[0], "header.bin") if row else None
+        if not header or not os.path.exists(header):
+            return 0
+        with open(header, "rb") as f:
+            return struct.unpack("<Q", f.read(28)[20:28])[0]
+
+    def _upsert(self, collection, ids, embeddings, documents, metadatas):
+        batches = 0
+        for first in range(0, len(ids), self.batch_size):
+            last = first + self.batch_size
+            collection.upsert(
+                ids=list(ids[first:last]),
+                embeddings=embeddings[first:last],
+                documents=list(documents[first:last]) if documents is not None else None,
+                metadatas=list(metadatas[first:last]) if metadatas is not None else None,
+            )
+            batches += 1
+        return batches
+
+    def load(self, ids, embeddings, documents=None, metadatas=None):
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if len(ids) != len(embeddings):
+            raise ValueError("ids and embeddings must have the same length")
+
+        start = time.perf_counter()
+        if not self.client.get_settings().is_persistent:
+            collection = self.client.get_or_create_collection(self.collection_name)
+            batches = self._upsert(collection, ids, embeddings, documents, metadatas)
+            seconds = time.perf_counter() - start
+            return self._stats(ids, batches, seconds, 0.0, None, None)
+
+        collection, old_threshold = self._open_for_loading(self._fresh_client())
+        try:
+            batches = self._upsert(collection, ids, embeddings, documents, metadatas)
+        finally:
+            if old_threshold is not None:
+                collection.modify(configuration={"hnsw": {"sync_threshold": old_threshold}})
+        seconds = time.perf_counter() - start
+
+        # opening the collection on a fresh client syncs the buffered vectors to the index files
+        start = time.perf_counter()
+        collection = self._fresh_client().get_collection(self.collection_name)
+        total = collection.count()
+        on_disk = self.index_file_count(collection)
+        return self._stats(ids, batches, seconds, time.perf_counter() - start, on_disk, on_disk >= total)
+
+    @staticmethod
+    def _stats(ids, batches, seconds, sync_seconds, on_disk, synced):
+        return {
+            "vectors": len(ids),
+            "batches": batches,
+            "seconds": seconds,
+            "vectors_per_sec": len(ids) / seconds if seconds else 0.0,
+            "sync_seconds": sync_seconds,
+            "index_file_vectors": on_disk,
+            "synced": synced,
+        }
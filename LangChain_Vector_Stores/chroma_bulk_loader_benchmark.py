@@ -0,0 +1,78 @@
+# Benchmark: per-document inserts vs Chroma.from_documents vs ChromaBulkLoader with a local fake embedder.
+import sys
+import tempfile
+import time
+
+import chromadb
+import numpy as np
+from langchain_community.vectorstores import Chroma
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from chroma_bulk_loader import ChromaBulkLoader
+
+DIM = 128
+# pass the number of vectors on the command line, e.g. python chroma_bulk_loader_benchmark.py 10000
+TOTAL = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+# one-by-one inserts are very slow, so they are timed on a sample and extrapolated
+PER_DOC_SAMPLE = 200
+
+teams = ["Mumbai Indians", "Chennai Super Kings", "Royal Challengers Bangalore", "Lucknow Super Giants"]
+texts = [f"Player {i} is a {'batsman' if i % 2 else 'fast bowler'} in the IPL." for i in range(TOTAL)]
+metadatas = [{"team": teams[i % len(teams)]} for i in range(TOTAL)]
+ids = [f"player-{i}" for i in range(TOTAL)]
+embed_model = DeterministicFakeEmbedding(size=DIM)
+
+
+def report(label, count, seconds, note=""):
+    print(f"{label:<22} {count:>8} vectors {seconds:>9.2f} sec {count / seconds:>9.0f} vectors/sec {note}")
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    client = chromadb.PersistentClient(path=tmp)
+
+    # 1. one add_documents call per document
+    store = Chroma(client=client, collection_name="per_document", embedding_function=embed_model)
+    start = time.perf_counter()
+    for i in range(PER_DOC_SAMPLE):
+        store.add_documents([Document(page_content=texts[i], metadata=metadatas[i])], ids=[ids[i]])
+    elapsed = time.perf_counter() - start
+    report("per-document insert", PER_DOC_SAMPLE, elapsed,
+           f"(~{elapsed / PER_DOC_SAMPLE * TOTAL:.0f} sec extrapolated for {TOTAL})")
+
+    # 2. default from_documents (embeds and writes)
+    docs = [Document(page_content=t, metadata=m) for t, m in zip(texts, metadatas)]
+    start = time.perf_counter()
+    Chroma.from_documents(docs, embed_model, ids=ids, client=client, collection_name="from_documents")
+    report("from_documents", TOTAL, time.perf_counter() - start, "(includes fake embedding)")
+
+    # 3. bulk path with precomputed embeddings
+    start = time.perf_counter()
+    vectors = embed_model.embed_documents(texts)
+    embed_time = time.perf_counter() - start
+
+    # the same batches with the default sync_threshold: the index files are written every 1000 inserts
+    loader = ChromaBulkLoader(client, "bulk_batches_only", sync_threshold=1000)
+    collection = client.create_collection("bulk_batches_only")
+    start = time.perf_counter()
+    batches = loader._upsert(collection, ids, np.asarray(vectors, dtype=np.float32), texts, metadatas)
+    report("batches only", TOTAL, time.perf_counter() - start, f"({batches} batches, sync_threshold 1000)")
+
+    stats = ChromaBulkLoader(client, "bulk_loader").load(ids, vectors, documents=texts, metadatas=metadatas)
+    report("ChromaBulkLoader", stats["vectors"], stats["seconds"],
+           f"({stats['batches']} batches, +{embed_time:.2f} sec precomputing embeddings)")
+    print(f"Index files synced at the end: {stats['synced']} ({stats['index_file_vectors']} vectors in header.bin, "
+          f"{stats['sync_seconds']:.2f} sec)")
+
+    # clients opened after load() see every vector
+    store = Chroma(client=chromadb.PersistentClient(path=tmp), collection_name="bulk_loader",
+                   embedding_function=embed_model)
+    print("Stored in bulk collection:", store._collection.count())
+    assert stats["synced"] and store._collection.count() == TOTAL
+
+    # HNSW search is approximate: recall@10 of 20 stored vectors, next to the from_documents collection
+    probes = list(range(0, TOTAL, max(1, TOTAL // 20)))[:20]
+    for name in ["from_documents", "bulk_loader"]:
+        collection = chromadb.PersistentClient(path=tmp).get_collection(name)
+        found = collection.query(query_embeddings=[vectors[i] for i in probes], n_results=10)["ids"]
+        print(f"recall@10 {name}: {sum(ids[i] in row for i, row in zip(probes, found)) / len(probes):.2f}")
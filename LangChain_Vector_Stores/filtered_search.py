@@ -0,0 +1,136 @@
+"""
+Metadata-filtered vector search with an inverted index.
+
+For every metadata field an inverted index maps each value to the (sorted) rows that have it:
+
+    {"team": {"Mumbai Indians": [1, 3], "Chennai Super Kings": [2], ...}}
+
+A query like "fast bowler where team = Mumbai Indians" first looks up the matching rows.
+If only a small part of the collection matches (selective filter) just those rows are scored
+(pre-filtering), so the cost is proportional to the filtered set. If most rows match, scoring the
+whole matrix and masking out the rest is cheaper (post-filtering).
+
+Filters: {"team": "Mumbai Indians"}, {"team": {"$eq": ...}}, {"team": {"$in": ["Mumbai Indians",
+"Chennai Super Kings"]}} use the inverted index; $ne, $nin, $gt, $gte, $lt, $lte (Chroma's other
+operators) are checked row by row on the metadata. Several fields, or several operators on one
+field, are combined with AND; {"$and": [filter, ...]} and {"$or": [filter, ...]} combine whole
+filters. Values are matched with their type, like Chroma: {"flag": True} does not match a row
+with flag = 1.
+"""
+import operator
+import os
+import sys
+from functools import reduce
+
+import numpy as np
+
+# Reuse the NumPy index from EmbeddingModels/
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "EmbeddingModels"))
+from similarity_search import VectorIndex, normalize, top_k
+
+
+def key(value):
+    # True == 1 and hash(True) == hash(1) in Python, so the type is part of the key
+    return type(value), value
+
+
+# operators without an inverted index: checked on the metadata of every row that has the field
+SCAN_OPERATORS = {
+    "$ne": lambda value, operand: key(value) != key(operand),
+    "$nin": lambda value, keys: key(value) not in keys,  # keys: the key() of every value
+    "$gt": operator.gt,
+    "$gte": operator.ge,
+    "$lt": operator.lt,
+    "$lte": operator.le,
+}
+
+
+class FilteredVectorIndex:
+
+    def __init__(self, vectors, metadatas, documents=None, prefilter_below=0.2):
+        self.index = VectorIndex(vectors)
+        self.metadatas = metadatas
+        self.documents = documents
+        # use pre-filtering when the filter keeps less than this fraction of rows
+        self.prefilter_below = prefilter_below
+
+        postings = {}
+        for row, metadata in enumerate(metadatas):
+            for field, value in (metadata or {}).items():
+                postings.setdefault(field, {}).setdefault(key(value), []).append(row)
+        self.postings = {
+            field: {value: np.array(rows, dtype=np.int64) for value, rows in values.items()}
+            for field, values in postings.items()
+        }
+
+    @classmethod
+    def from_chroma(cls, vector_store, **kwargs):
+        data = vector_store.get(include=["embeddings", "metadatas", "documents"])
+        return cls(data["embeddings"], data["metadatas"], data["documents"], **kwargs)
+
+    def candidates(self, filter):
+        rows = None
+        for field, condition in filter.items():
+            if field in ("$and", "$or"):
+                if not isinstance(condition, list) or not condition:
+                    raise ValueError(f"{field} takes a non-empty list of filters")
+                parts = [self.candidates(part) for part in condition]
+                if field == "$and":
+                    field_rows = reduce(lambda a, b: np.intersect1d(a, b, assume_unique=True), parts)
+                else:
+                    field_rows = np.unique(np.concatenate(parts))
+                rows = field_rows if rows is None else np.intersect1d(rows, field_rows, assume_unique=True)
+                continue
+            if field.startswith("$"):
+                raise ValueError(f"Unsupported logical operator {field!r}")
+            conditions = condition.items() if isinstance(condition, dict) else [("$eq", condition)]
+            for op, operand in conditions:
+                field_rows = self._matching_rows(field, op, operand)
+                rows = field_rows if rows is None else np.intersect1d(rows, field_rows, assume_unique=True)
+        return rows
+
+    def _matching_rows(self, field, op, operand):
+        if op in ("$eq", "$in"):
+            index = self.postings.get(field, {})
+            values = operand if op == "$in" else [operand]
+            matches = [index[key(value)] for value in values if key(value) in index]
+            return np.unique(np.concatenate(matches)) if matches else np.empty(0, dtype=np.int64)
+        if op not in SCAN_OPERATORS:
+            raise ValueError(f"Unsupported filter operator {op!r} for field {field!r}")
+        test = SCAN_OPERATORS[op]
+        if op == "$nin":
+            operand = {key(value) for value in operand}
+        rows = []
+        for row, metadata in enumerate(self.metadatas):
+            if metadata and field in metadata:
+                try:
+                    if test(metadata[field], operand):
+                        rows.append(row)
+                except TypeError:
+                    pass  # e.g. "$gt" between a number and a string: not a match
+        return np.array(rows, dtype=np.int64)
+
+    def search(self, query, k=1, filter=None, strategy="auto"):
+        # Returns (rows, scores) for a single query vector, best first.
+        if not filter:
+            return self.index.search(query, k)
+
+        rows = self.candidates(filter)
+        if len(rows) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        k = min(k, len(rows))
+
+        if strategy == "auto":
+            strategy = "pre" if len(rows) / len(self.index) < self.prefilter_below else "post"
+
+        if strategy == "pre":
+            # score only the matching rows
+            query = normalize(np.atleast_2d(query))
+            scores = query @ self.index.matrix[rows].T.astype(np.float32, copy=False)
+            idx, best = top_k(scores, k)
+            return rows[idx[0]], best[0]
+
+        # score everything with one contiguous matrix product, then keep the matching rows
+        scores = self.index.scores(np.atleast_2d(query))
+        idx, best = top_k(scores[:, rows], k)
+        return rows[idx[0]], best[0]
@@ -0,0 +1,57 @@
+# Benchmark for FilteredVectorIndex: pre-filter vs post-filter vs auto at different filter selectivities.
+import sys
+import time
+
+import numpy as np
+
+from filtered_search import FilteredVectorIndex
+
+DIM = 128
+# pass the number of vectors on the command line, e.g. python filtered_search_benchmark.py 100000
+TOTAL = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+QUERIES = 20
+K = 5
+
+rng = np.random.default_rng(0)
+vectors = rng.standard_normal((TOTAL, DIM), dtype=np.float32)
+
+# Each field splits the collection into groups of a different size -> different selectivity.
+cardinalities = {"shard_1000": 1000, "shard_100": 100, "shard_10": 10, "shard_2": 2}
+metadatas = [{field: i % n for field, n in cardinalities.items()} for i in range(TOTAL)]
+
+start = time.perf_counter()
+index = FilteredVectorIndex(vectors, metadatas)
+print(f"Built index over {TOTAL} vectors in {time.perf_counter() - start:.2f} sec")
+
+queries = rng.standard_normal((QUERIES, DIM), dtype=np.float32)
+
+
+def timed(**kwargs):
+    start = time.perf_counter()
+    for query in queries:
+        result = index.search(query, k=K, **kwargs)
+    return (time.perf_counter() - start) / QUERIES * 1000, result
+
+
+no_filter_ms, _ = timed()
+print(f"No filter: {no_filter_ms:.2f} ms/query\n")
+print(f"{'filter':<16} {'selectivity':>11} {'pre ms':>8} {'post ms':>8} {'auto ms':>8} {'same':>5}")
+for field, n in cardinalities.items():
+    filter = {field: 0}
+    pre_ms, (pre_rows, _) = timed(filter=filter, strategy="pre")
+    post_ms, (post_rows, _) = timed(filter=filter, strategy="post")
+    auto_ms, _ = timed(filter=filter)
+    assert all(metadatas[row][field] == 0 for row in pre_rows)
+    print(f"{field + '=0':<16} {1 / n:>11.1%} {pre_ms:>8.2f} {post_ms:>8.2f} {auto_ms:>8.2f} "
+          f"{str(sorted(pre_rows.tolist()) == sorted(post_rows.tolist())):>5}")
+
+# Chroma filter syntax on a small index: $and / $or, and booleans that are not the numbers 1 / 0
+small = FilteredVectorIndex(vectors[:8], [{"team": "MI" if i % 2 else "CSK", "flag": [True, 1, False, 0][i % 4],
+                                           "runs": i * 10} for i in range(8)])
+assert small.candidates({"flag": True}).tolist() == [0, 4]
+assert small.candidates({"flag": 1}).tolist() == [1, 5]
+assert small.candidates({"flag": {"$ne": True}}).tolist() == [1, 2, 3, 5, 6, 7]
+assert small.candidates({"$and": [{"team": "MI"}, {"runs": {"$gte": 30}}]}).tolist() == [3, 5, 7]
+assert small.candidates({"$or": [{"team": "CSK"}, {"runs": {"$lt": 20}}]}).tolist() == [0, 1, 2, 4, 6]
+assert small.candidates({"$or": [{"$and": [{"team": "MI"}, {"flag": 1}]}, {"runs": 0}]}).tolist() == [0, 1, 5]
+print("\n$and / $or and typed values: same rows as Chroma's where semantics")
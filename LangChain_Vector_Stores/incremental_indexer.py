@@ -0,0 +1,147 @@
+"""
+Incremental indexing for a Chroma (or any LangChain) vector store.
+
+Chroma.from_documents re-embeds and re-inserts every document on every run, so the collection
+fills with duplicates. IncrementalIndexer keeps a JSON manifest of what is already indexed:
+
+    {source: {"mtime": ..., "content_hash": ..., "chunks": [chunk ids]}}
+
+and on each run it
+    - skips sources whose fingerprint did not change (zero embedding calls),
+    - embeds and adds only new chunks of changed sources,
+    - deletes chunks that are gone, including all chunks of sources that disappeared.
+
+Chunk ids are deterministic (hash of source + chunk text + chunk metadata), so the same chunk always
+gets the same id, and a chunk whose metadata changed (a new start_index, an edited field) gets a new
+one and is rewritten.
+
+Rows already in the collection that the manifest doesn't know (e.g. from an earlier
+Chroma.from_documents run) would stay next to the indexed copies: drop_untracked() deletes them
+before the first sync.
+"""
+import hashlib
+import json
+import os
+
+from langchain_core.documents import Document
+
+
+def sha256(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def chunk_ids(source, chunks):
+    # Same source + same text + same metadata -> same id. Repeated chunks get a counter so ids stay unique.
+    seen = {}
+    ids = []
+    for chunk in chunks:
+        chunk_hash = sha256(chunk.page_content) + sha256(json.dumps(chunk.metadata, sort_keys=True, default=str))
+        n = seen.get(chunk_hash, 0)
+        seen[chunk_hash] = n + 1
+        ids.append(sha256(f"{source}\x00{chunk_hash}\x00{n}"))
+    return ids
+
+
+class IncrementalIndexer:
+
+    def __init__(self, vector_store, manifest_path, splitter=None):
+        self.vector_store = vector_store
+        self.manifest_path = manifest_path
+        self.splitter = splitter  # None -> every document is one chunk
+        self.manifest = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+
+    def save(self):
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+
+    def drop_untracked(self):
+        # Deletes the rows of the collection that no manifest entry lists (needs a store with get(), like
+        # Chroma). Returns how many were deleted.
+        tracked = {chunk_id for entry in self.manifest.values() for chunk_id in entry["chunks"]}
+        untracked = [chunk_id for chunk_id in self.vector_store.get(include=[])["ids"] if chunk_id not in tracked]
+        if untracked:
+            self.vector_store.delete(ids=untracked)
+        return len(untracked)
+
+    def _sync_source(self, source, docs, content_hash, mtime, stats):
+        entry = self.manifest.get(source)
+        if entry and entry["content_hash"] == content_hash:
+            entry["mtime"] = mtime
+            stats["unchanged"] += 1
+            return
+
+        chunks = self.splitter.split_documents(docs) if self.splitter else list(docs)
+        ids = chunk_ids(source, chunks)
+        old_ids = set(entry["chunks"]) if entry else set()
+
+        new = [(chunk_id, chunk) for chunk_id, chunk in zip(ids, chunks) if chunk_id not in old_ids]
+        removed = old_ids - set(ids)
+
+        if removed:
+            self.vector_store.delete(ids=sorted(removed))
+        if new:
+            self.vector_store.add_documents([chunk for _, chunk in new], ids=[chunk_id for chunk_id, _ in new])
+
+        self.manifest[source] = {"mtime": mtime, "content_hash": content_hash, "chunks": ids}
+        stats["changed"] += 1
+        stats["added_chunks"] += len(new)
+        stats["deleted_chunks"] += len(removed)
+
+    def _delete_missing(self, sources, stats):
+        for source in list(self.manifest):
+            if source not in sources:
+                self.vector_store.delete(ids=self.manifest.pop(source)["chunks"])
+                stats["deleted_sources"] += 1
+
+    def _new_stats(self):
+        return {"unchanged": 0, "changed": 0, "added_chunks": 0, "deleted_chunks": 0, "deleted_sources": 0}
+
+    def index_documents(self, documents, source_key="source", default_source="default"):
+        # Groups in-memory documents by metadata[source_key] and syncs each group.
+        groups = {}
+        for doc in documents:
+            groups.setdefault(str(doc.metadata.get(source_key, default_source)), []).append(doc)
+
+        stats = self._new_stats()
+        for source, docs in groups.items():
+            content_hash = sha256(json.dumps(
+                [[doc.page_content, doc.metadata] for doc in docs], sort_keys=True, default=str
+            ))
+            self._sync_source(source, docs, content_hash, None, stats)
+        self._delete_missing(groups, stats)
+        self.save()
+        return stats
+
+    def index_files(self, paths, loader_cls, loader_kwargs=None):
+        # A file whose mtime did not change is skipped without even reading it.
+        stats = self._new_stats()
+        sources = set()
+        for path in paths:
+            source = os.path.abspath(path)
+            sources.add(source)
+            mtime = os.path.getmtime(path)
+            entry = self.manifest.get(source)
+            if entry and entry["mtime"] == mtime:
+                stats["unchanged"] += 1
+                continue
+
+            with open(path, "rb") as f:
+                content_hash = hashlib.sha256(f.read()).hexdigest()
+            if entry and entry["content_hash"] == content_hash:
+                entry["mtime"] = mtime
+                stats["unchanged"] += 1
+                continue
+
+            docs = [
+                Document(page_content=doc.page_content, metadata={**doc.metadata, "source": source})
+                for doc in loader_cls(path, **(loader_kwargs or {})).load()
+            ]
+            self._sync_source(source, docs, content_hash, mtime, stats)
+        self._delete_missing(sources, stats)
+        self.save()
+        return stats
@@ -0,0 +1,70 @@
+# Shows that IncrementalIndexer only embeds what changed (a no-op re-run makes zero embedding calls).
+import os
+import tempfile
+
+from langchain_community.document_loaders import TextLoader
+from langchain_community.vectorstores import Chroma
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from incremental_indexer import IncrementalIndexer
+
+
+# Fake embedder that counts how many texts it was asked to embed.
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    calls: int = 0
+    texts: int = 0
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        self.texts += len(texts)
+        return super().embed_documents(texts)
+
+
+def run(label, indexer, embeddings, files):
+    embeddings.calls = embeddings.texts = 0
+    stats = indexer.index_files(files, TextLoader, {"encoding": "utf-8"})
+    count = len(indexer.vector_store.get()["ids"])
+    print(f"{label:<22} embed calls={embeddings.calls} texts={embeddings.texts} stored={count} {stats}")
+    return embeddings.calls
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    files = []
+    for name, text in [
+        ("kohli.txt", "Virat Kohli is one of the most successful batsmen in IPL history. " * 5),
+        ("rohit.txt", "Rohit Sharma led Mumbai Indians to five IPL titles. " * 5),
+        ("bumrah.txt", "Jasprit Bumrah is known for his deadly yorkers. " * 5),
+    ]:
+        path = os.path.join(tmp, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        files.append(path)
+
+    embeddings = CountingEmbeddings(size=64)
+    vector_store = Chroma(collection_name="ipl_players_demo", embedding_function=embeddings)
+    indexer = IncrementalIndexer(
+        vector_store,
+        manifest_path=os.path.join(tmp, "manifest.json"),
+        splitter=RecursiveCharacterTextSplitter(chunk_size=120, chunk_overlap=0),
+    )
+
+    run("First run", indexer, embeddings, files)
+
+    calls = run("No-op re-run", indexer, embeddings, files)
+    assert calls == 0, "a no-op re-run must not call the embedding model"
+
+    # Touch a file without changing it: mtime changes, content hash does not.
+    os.utime(files[0])
+    assert run("Touched file", indexer, embeddings, files) == 0
+
+    # Change one file: only its new chunks are embedded, its old chunks are deleted.
+    with open(files[1], "a", encoding="utf-8") as f:
+        f.write("He is also known for his elegant batting. ")
+    os.utime(files[1], (0, os.path.getmtime(files[1]) + 1))
+    run("Changed one file", indexer, embeddings, files)
+
+    # Remove a source: its chunks are deleted from the collection.
+    run("Removed one file", indexer, embeddings, files[:2])
+
+    vector_store.delete_collection()
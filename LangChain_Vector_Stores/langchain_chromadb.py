@@ -1,10 +1,19 @@
 import os
+import sys
 from dotenv import load_dotenv
 from langchain.schema import Document
 from langchain_community.vectorstores import Chroma
 
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 
+from incremental_indexer import IncrementalIndexer
+from filtered_search import FilteredVectorIndex
+
+# Reuse the embedding cache and batch embedder from EmbeddingModels/
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'EmbeddingModels'))
+from embedding_cache import CachedEmbeddings
+from batch_embedding import BatchEmbeddings
+
 load_dotenv()
 
 docs = [
@@ -32,18 +41,28 @@ docs = [
 
 
 model_name = os.environ.get('GOOGLE_EMBEDDING_MODEL')
-embed_model = GoogleGenerativeAIEmbeddings(model=model_name)
+embed_model = CachedEmbeddings(BatchEmbeddings(
+    GoogleGenerativeAIEmbeddings(model=model_name),
+    batch_size=100,
+    max_concurrency=4
+))
 
-# Create and Populate the Vector Store 
+# Create (or open) the Vector Store 
 
-vector_store = Chroma.from_documents(
-    documents=docs,
-    embedding=embed_model,
+vector_store = Chroma(
+    embedding_function=embed_model,
     persist_directory='chroma_db_new',  
     collection_name='ipl_players'
 )
 
-print("Vector Store created successfully!")
+# Populate it incrementally: only new or changed documents are embedded, so re-running
+# this script doesn't add duplicates (Chroma.from_documents inserted everything again).
+indexer = IncrementalIndexer(vector_store, manifest_path='chroma_db_new/index_manifest.json')
+# rows written by the earlier Chroma.from_documents version of this script are not in the manifest: drop them
+indexer.drop_untracked()
+stats = indexer.index_documents(docs, source_key='team')
+
+print("Vector Store created successfully!", stats)
 
 # Let's see our documents 
 retrieved_docs = vector_store.get(include=['documents', 'metadatas'])
@@ -57,3 +76,9 @@ search_results = vector_store.similarity_search(query, k=1)
 print(f"\n Similarity Search for '{query}' ")
 print(search_results[0].page_content)
 
+# Filtered search -> only players of one team are scored (inverted index over the metadata)
+filtered_index = FilteredVectorIndex.from_chroma(vector_store)
+query_embed = embed_model.embed_query(query)
+rows, scores = filtered_index.search(query_embed, k=1, filter={"team": "Mumbai Indians"})
+print(f"\n Filtered Search for '{query}' where team = Mumbai Indians ")
+print(filtered_index.documents[rows[0]], scores[0])